@@ -0,0 +1,90 @@
+"""Compares building features as one chained ``with_columns`` per feature against
+emitting them from a :class:`dfs.synthesis.plan.FeaturePlan`.
+
+Usage:
+    python -m benchmarks.bench_feature_plan --rows 100000 --features 2000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import polars as pl
+
+from dfs.primitives import AddNumeric, CumSum, MultiplyNumeric, Negate, SubtractNumeric
+from dfs.synthesis.plan import FeaturePlan
+
+PRIMITIVES = [AddNumeric, SubtractNumeric, MultiplyNumeric, Negate, CumSum]
+
+
+def make_frame(rows: int, cols: int, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {f"x{i}": rng.standard_normal(rows) for i in range(cols)}
+    data["group"] = rng.integers(0, 100, rows)
+    return pl.DataFrame(data)
+
+
+def draw_features(df: pl.DataFrame, features: int, seed: int):
+    """Draws the same random (primitive, columns) sequence for both approaches."""
+    random.seed(seed)
+    primitives = [p() for p in PRIMITIVES]
+    columns = [c for c in df.columns if c != "group"]
+    drawn, names = [], set(df.columns)
+    while len(drawn) < features:
+        primitive = random.choice(primitives)
+        inputs = random.sample(columns, primitive.get_num_inputs())
+        name = primitive.get_name(inputs)
+        if name in names:
+            continue
+        names.add(name)
+        columns.append(name)
+        drawn.append((primitive, inputs))
+    return drawn
+
+
+def bench_chained(df: pl.DataFrame, drawn: list):
+    """The previous approach: every feature adds one `with_columns` layer to the plan."""
+    start = time.perf_counter()
+    lf = df.lazy()
+    for primitive, inputs in drawn:
+        lf = primitive.apply(lf, inputs, ["group"])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = lf.collect()
+    return build_time, time.perf_counter() - start, result.width
+
+
+def bench_plan(df: pl.DataFrame, drawn: list):
+    start = time.perf_counter()
+    plan = FeaturePlan()
+    schema = pl.DataFrame(schema=df.schema)
+    for primitive, inputs in drawn:
+        expr = primitive.get_expr(schema, inputs, ["group"])
+        schema = schema.with_columns(expr)
+        plan.add(expr.meta.output_name(), expr, inputs)
+    lf = plan.apply(df.lazy())
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = lf.collect()
+    return build_time, time.perf_counter() - start, result.width
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--features", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.columns, args.seed)
+    drawn = draw_features(df, args.features, args.seed)
+    for name, bench in [("chained", bench_chained), ("plan", bench_plan)]:
+        build_time, collect_time, width = bench(df, drawn)
+        print(f"{name:>8}: build {build_time:8.3f}s  collect {collect_time:8.3f}s  ({width} columns)")
+
+
+if __name__ == "__main__":
+    main()
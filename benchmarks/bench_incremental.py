@@ -0,0 +1,74 @@
+"""Compares recomputing cumulative and exponentially weighted features over the full
+history against updating them incrementally for appended rows.
+
+Usage:
+    python -m benchmarks.bench_incremental --rows 1000000 --groups 10000 --append 1000
+"""
+import argparse
+import time
+
+import numpy as np
+import polars as pl
+
+from dfs.primitives import (
+    CumCount, CumMax, CumMean, CumMin, CumSum, ExponentialWeightedAverage, ExponentialWeightedSTD,
+)
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.incremental import IncrementalFeatureSet
+
+PRIMITIVES = [CumSum, CumCount, CumMax, CumMin, CumMean, ExponentialWeightedAverage, ExponentialWeightedSTD]
+
+
+def make_frame(rows: int, groups: int, offset: int = 0, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({
+        "t": np.arange(offset, offset + rows),
+        "x": rng.standard_normal(rows),
+        "y": rng.standard_normal(rows),
+        "group": rng.integers(0, groups, rows),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=10_000)
+    parser.add_argument("--append", type=int, default=1_000)
+    parser.add_argument("--updates", type=int, default=5)
+    args = parser.parse_args()
+
+    history = make_frame(args.rows, args.groups)
+    dfs = DeepFeatureSynthesis(
+        history, group_cols=["group"], trans_primitives=PRIMITIVES, max_features=-1, max_depth=1, sort_by="t",
+        ignore_columns=[],
+    )
+    dfs.build(method="exhaustive")
+    feature_set = dfs.feature_set()
+
+    incremental = IncrementalFeatureSet(feature_set)
+    start = time.perf_counter()
+    incremental.fit(history)
+    print(f"     fit: {time.perf_counter() - start:8.3f}s  ({len(feature_set)} features, {args.rows} rows)")
+
+    full_time = update_time = 0.0
+    for i in range(args.updates):
+        new_rows = make_frame(args.append, args.groups, offset=history.height, seed=i + 1)
+        history = pl.concat([history, new_rows])
+
+        start = time.perf_counter()
+        full = feature_set.transform(history, assume_sorted=True).tail(args.append)
+        full_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        updated = incremental.update(new_rows)
+        update_time += time.perf_counter() - start
+
+        for col in full.columns:
+            assert np.allclose(full[col].to_numpy(), updated[col].to_numpy(), equal_nan=True), col
+
+    print(f"    full: {full_time / args.updates:8.3f}s per append of {args.append} rows")
+    print(f"  update: {update_time / args.updates:8.3f}s per append of {args.append} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Measures the latency of computing the features of a few new rows of one entity with the
+NumPy online scorer, the incremental polars update and the batch polars path.
+
+Usage:
+    python -m benchmarks.bench_online --rows 100000 --groups 1000 --new-rows 5 --calls 1000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import polars as pl
+
+from dfs.primitives import (
+    AddNumeric, CumMax, CumMean, CumSum, DivideNumeric, ExponentialWeightedAverage, GreaterThan, MultiplyNumeric,
+    Negate,
+)
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.incremental import IncrementalFeatureSet
+from dfs.synthesis.online import OnlineScorer
+
+PRIMITIVES = [AddNumeric, CumMax, CumMean, CumSum, DivideNumeric, ExponentialWeightedAverage, GreaterThan,
+              MultiplyNumeric, Negate]
+
+
+def make_frame(rows: int, groups: int, offset: int = 0, seed: int = 0) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({
+        "t": np.arange(offset, offset + rows),
+        "x": rng.standard_normal(rows),
+        "y": rng.standard_normal(rows),
+        "group": rng.integers(0, groups, rows),
+    })
+
+
+def report(name: str, latencies: list[float]):
+    p50, p99 = np.percentile(np.array(latencies) * 1e6, [50, 99])
+    print(f"{name:>12}: p50 {p50:10.1f}us  p99 {p99:10.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--groups", type=int, default=1_000)
+    parser.add_argument("--new-rows", type=int, default=5)
+    parser.add_argument("--features", type=int, default=30)
+    parser.add_argument("--calls", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    history = make_frame(args.rows, args.groups, seed=args.seed)
+    random.seed(args.seed)
+    dfs = DeepFeatureSynthesis(
+        history, group_cols=["group"], trans_primitives=PRIMITIVES, max_features=args.features, max_depth=2,
+        sort_by="t", ignore_columns=[],
+    )
+    dfs.build()
+    feature_set = dfs.feature_set()
+    incremental = IncrementalFeatureSet(feature_set)
+    incremental.fit(history)
+    scorer = OnlineScorer(incremental)
+
+    # The same entity and rows for every call: latencies don't depend on the values
+    new_rows = make_frame(args.new_rows, 1, offset=args.rows, seed=args.seed + 1)
+    arrays = {col: new_rows[col].to_numpy() for col in new_rows.columns}
+    entity_history = history.filter(pl.col("group") == 0)
+    plan = dfs.plan
+
+    latencies = {"online": [], "incremental": [], "batch": []}
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        online = scorer.score(0, arrays)
+        latencies["online"].append(time.perf_counter() - start)
+
+    for _ in range(min(args.calls, 100)):
+        state = incremental.state
+        start = time.perf_counter()
+        updated = incremental.update(new_rows)
+        latencies["incremental"].append(time.perf_counter() - start)
+        incremental.state = state
+
+        start = time.perf_counter()
+        plan.apply(pl.concat([entity_history, new_rows]).lazy()).tail(args.new_rows).collect()
+        latencies["batch"].append(time.perf_counter() - start)
+
+    print(f"{len(feature_set)} features, {args.new_rows} new rows of one entity, "
+          f"{entity_history.height} rows of entity history")
+    for name, values in latencies.items():
+        report(name, values)
+
+    # Check the online scorer agrees with the incremental update, from the fitted state
+    scorer = OnlineScorer(incremental)
+    online = scorer.score(0, arrays)
+    for name in feature_set.names:
+        assert np.allclose(updated[name].cast(pl.Float64).to_numpy(), online[name], equal_nan=True), name
+
+
+if __name__ == "__main__":
+    main()
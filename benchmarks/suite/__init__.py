@@ -0,0 +1,2 @@
+"""Throughput and memory benchmarks of every transform primitive and of end-to-end
+synthesis on deterministic synthetic data, see ``python -m benchmarks.suite --help``."""
@@ -0,0 +1,126 @@
+"""Benchmark suite of cold imports, the transform primitives and end-to-end synthesis.
+
+Usage:
+    python -m benchmarks.suite run --rows 100000 1000000 --output results.json
+    python -m benchmarks.suite run --rows 100000000 --cardinalities 1000 --skip-synthesis
+    python -m benchmarks.suite compare baseline.json results.json --time-threshold 0.1
+
+``compare`` exits with status 1 if any case regressed.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+import polars as pl
+
+from benchmarks.suite.cases import import_cases, primitive_cases, synthesis_cases
+from benchmarks.suite.compare import compare, load
+from benchmarks.suite.data import CARDINALITIES, group_col, make_frame
+
+
+def write(path: str, output: dict):
+    # Written to a temporary file and renamed, so an interrupted run leaves the last results
+    with open(path + ".tmp", "w") as f:
+        json.dump(output, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def run(args):
+    group_cols = [None] + [group_col(c) for c in args.cardinalities]
+    results = []
+    output = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "args": {key: value for key, value in vars(args).items() if key != "func"},
+        },
+        "results": results,
+    }
+    # Results are saved after every case, so a crash or an interrupt loses at most one case
+    if not args.skip_imports:
+        for result in import_cases(repeat=max(args.repeat, 5)):
+            results.append(result)
+            write(args.output, output)
+            status = result.get("error") or f"{result['seconds'] * 1e3:10.2f}ms"
+            print(f"{result['case']:<45} {status}", flush=True)
+    for rows in args.rows:
+        df = make_frame(rows, tuple(args.cardinalities), seed=args.seed)
+        cases = [] if args.skip_primitives else [primitive_cases(df, group_cols, args.primitives, args.repeat)]
+        if not args.skip_synthesis:
+            dfs_groups = [None] + group_cols[1:2]  # ungrouped and the lowest cardinality
+            cases.append(synthesis_cases(df, args.features, dfs_groups, seed=args.seed))
+        for case in cases:
+            for result in case:
+                results.append(result)
+                write(args.output, output)
+                status = result.get("error") or (
+                    f"{result['seconds'] * 1e3:10.2f}ms  peak {result['peak_rss_bytes'] / 2 ** 20:8.0f}MiB"
+                )
+                print(f"{result['case']:<45} rows={rows:<10} group={str(result['group_col']):<14} {status}",
+                      flush=True)
+        del df
+
+    write(args.output, output)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+def compare_command(args):
+    rows = compare(load(args.baseline), load(args.current), args.time_threshold, args.memory_threshold,
+                   args.min_seconds, args.min_memory_bytes)
+    regressions = [row for row in rows if row["regressions"]]
+    for row in rows if args.all else regressions:
+        changes = "  ".join(
+            f"{name} {row[key]:+.1%}" for name, key in [("time", "time_change"), ("memory", "memory_change")]
+            if key in row
+        )
+        flag = "REGRESSION " + ", ".join(row["regressions"]) if row["regressions"] else ""
+        print(f"{row['case']:<45} rows={row['rows']:<10} group={str(row['group_col']):<14} {changes}  {flag}")
+    print(f"{len(regressions)} regressions in {len(rows)} cases")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write their results to JSON")
+    run_parser.add_argument("--rows", type=lambda value: int(float(value)), nargs="+", default=[100_000],
+                            help="row counts, e.g. 1e5 1e6 1e8")
+    run_parser.add_argument("--cardinalities", type=int, nargs="*", default=list(CARDINALITIES),
+                            help="group key cardinalities to time grouped primitives with")
+    run_parser.add_argument("--features", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    run_parser.add_argument("--primitives", nargs="*", help="names of the primitives to time (default: all)")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--skip-imports", action="store_true")
+    run_parser.add_argument("--skip-primitives", action="store_true")
+    run_parser.add_argument("--skip-synthesis", action="store_true")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--time-threshold", type=float, default=0.1)
+    compare_parser.add_argument("--memory-threshold", type=float, default=0.1)
+    compare_parser.add_argument("--min-seconds", type=float, default=1e-3,
+                                help="ignore time changes of cases faster than this")
+    compare_parser.add_argument("--min-memory-bytes", type=lambda value: int(float(value)), default=64 << 20,
+                                help="ignore memory changes smaller than this")
+    compare_parser.add_argument("--all", action="store_true", help="print every case, not only regressions")
+    compare_parser.set_defaults(func=compare_command)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark cases: cold imports, every transform primitive, and end-to-end synthesis."""
+import inspect
+import json
+import random
+import subprocess
+import sys
+from typing import Iterator, Optional
+
+import polars as pl
+
+from dfs import primitives
+from dfs.primitives import PrimitiveBase
+from dfs.synthesis.costs import is_windowed
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.schema import SchemaIndex
+
+from benchmarks.suite.measure import measure
+
+# Modules whose cold import is timed, as short-lived worker processes pay it on every start
+IMPORT_MODULES = ["dfs.primitives", "dfs.synthesis.deep_feature_synthesis"]
+
+# Run in a fresh interpreter: the import time and the memory the import added
+_IMPORT_SCRIPT = """
+import json, resource, sys, time
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps([seconds, before * 1024, after * 1024]))
+"""
+
+# Exceptions which stop the suite, rather than failing a case. polars panics are BaseExceptions
+_interrupts = (KeyboardInterrupt, SystemExit, GeneratorExit)
+
+
+def _error(error: BaseException) -> dict:
+    if isinstance(error, _interrupts):
+        raise error
+    return {"error": f"{type(error).__name__}: {error}"}
+
+
+# Arguments of primitives which can't be instantiated with their defaults
+PRIMITIVE_ARGS = {
+    "same_as_previous": {"value": 0},
+}
+
+
+def transform_primitives(names: list[str] = None) -> list[PrimitiveBase]:
+    """Instantiates every transform primitive (or those named), sorted by name."""
+    result = []
+    for name, cls in sorted(primitives.get_transform_primitives().items()):
+        if names and name not in names:
+            continue
+        required = [p for p in inspect.signature(cls).parameters.values() if p.default is p.empty]
+        args = PRIMITIVE_ARGS.get(name, {})
+        if any(p.name not in args for p in required):
+            continue
+        result.append(cls(**args))
+    return result
+
+
+def import_cases(modules: list[str] = None, repeat: int = 5) -> Iterator[dict]:
+    """Times the cold import of each of `modules` (default :data:`IMPORT_MODULES`), each
+    repetition in a new interpreter."""
+    for module in modules or IMPORT_MODULES:
+        result = {"case": f"import/{module}", "rows": 0, "group_col": None}
+        runs = []
+        try:
+            for _ in range(repeat):
+                output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT, module], capture_output=True,
+                                        text=True, check=True).stdout
+                runs.append(json.loads(output))
+        except subprocess.CalledProcessError as e:
+            yield {**result, "error": e.stderr.strip().splitlines()[-1]}
+            continue
+        times = [seconds for seconds, _, _ in runs]
+        yield {
+            **result,
+            "seconds": min(times),
+            "mean_seconds": sum(times) / len(times),
+            "peak_rss_bytes": max(after for _, _, after in runs),
+            "rss_growth_bytes": max(after - before for _, before, after in runs),
+        }
+
+
+def _inputs(primitive: PrimitiveBase, schema: SchemaIndex) -> Optional[list[str]]:
+    input_types = primitive.input_types
+    for input_type in (input_types if isinstance(input_types, list) else [input_types]):
+        inputs = []
+        for selector in (input_type if isinstance(input_type, tuple) else (input_type,)):
+            col = next((c for c in schema.candidates(selector) if c not in inputs), None)
+            if col is None:
+                break
+            inputs.append(col)
+        else:
+            return inputs
+    return None
+
+
+def primitive_cases(df: pl.DataFrame, group_cols: list[Optional[str]], names: list[str] = None,
+                    repeat: int = 3) -> Iterator[dict]:
+    """Times each transform primitive on the first base columns matching its inputs, once
+    per entry of `group_cols`: ungrouped for None, else grouped by that column, which
+    windows the primitives that depend on the other rows as synthesis does."""
+    group_keys = [col for col in group_cols if col is not None]
+    schema = SchemaIndex(df.schema, exclude=group_keys)
+    lf = df.lazy()
+    for primitive in transform_primitives(names):
+        inputs = _inputs(primitive, schema)
+        for group_col in group_cols:
+            result = {"case": f"primitive/{primitive.name}", "rows": df.height, "group_col": group_col}
+            if inputs is None:
+                yield {**result, "error": "no matching input columns"}
+                continue
+            try:
+                expr = primitive.get_expr(schema.frame(inputs), inputs, [])
+                if is_windowed(primitive, group_col is not None):
+                    expr = expr.over(group_col)
+                result.update(inputs=inputs, **measure(lambda: lf.select(expr).collect(), repeat))
+            except BaseException as e:  # a broken primitive must not stop the suite
+                result.update(_error(e))
+            yield result
+
+
+def synthesis_cases(df: pl.DataFrame, feature_counts: list[int], group_cols: list[Optional[str]],
+                    max_depth: int = 2, seed: int = 0, repeat: int = 1) -> Iterator[dict]:
+    """Times :meth:`.DeepFeatureSynthesis.build` and :meth:`~.DeepFeatureSynthesis.run`
+    with every transform primitive, for each feature count and entry of `group_cols`. A
+    failing case is reported with its error, and the run case is skipped if the build
+    failed."""
+    trans_primitives = transform_primitives()
+    for group_col in group_cols:
+        for features in feature_counts:
+            other_groups = [col for col in df.columns if col.startswith("group_") and col != group_col]
+            result = {"rows": df.height, "group_col": group_col, "features": features}
+            build_result = {"case": f"dfs/build/{features}", **result}
+            try:
+                dfs = DeepFeatureSynthesis(
+                    df.drop(other_groups), group_cols=[group_col] if group_col else None,
+                    trans_primitives=trans_primitives, max_depth=max_depth, max_features=features, sort_by="time",
+                    assume_sorted=True,
+                )
+
+                def build():
+                    random.seed(seed)
+                    dfs.build()
+
+                build_result.update(measure(build, repeat))
+            except BaseException as e:  # a failing case must not stop the suite
+                build_result.update(_error(e))
+            yield build_result
+            if "error" in build_result:
+                continue
+
+            run_result = {"case": f"dfs/run/{features}", **result, "generated": len(dfs.plan)}
+            try:
+                run_result.update(measure(dfs.run, repeat))
+            except BaseException as e:
+                run_result.update(_error(e))
+            yield run_result
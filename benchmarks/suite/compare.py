@@ -0,0 +1,44 @@
+"""Compares two result files of the suite and flags regressions."""
+import json
+
+
+def case_key(result: dict) -> tuple:
+    return result["case"], result["rows"], result.get("group_col")
+
+
+def load(path: str) -> dict[tuple, dict]:
+    with open(path) as f:
+        return {case_key(result): result for result in json.load(f)["results"]}
+
+
+def compare(baseline: dict[tuple, dict], current: dict[tuple, dict], time_threshold: float = 0.1,
+            memory_threshold: float = 0.1, min_seconds: float = 1e-3,
+            min_memory_bytes: int = 64 << 20) -> list[dict]:
+    """Returns one row per case present in both runs, with the relative change of its time
+    and peak memory growth. A case regresses if it got slower by more than `time_threshold`
+    (and took at least `min_seconds`, below which timings are mostly noise), if its memory
+    growth increased by more than `memory_threshold` and `min_memory_bytes` (the allocator
+    reuses memory freed by earlier cases, which makes small growths noise), or if it now
+    fails."""
+    rows = []
+    for key in baseline.keys() & current.keys():
+        before, after = baseline[key], current[key]
+        row = {"case": key[0], "rows": key[1], "group_col": key[2], "regressions": []}
+        if "error" in after:
+            if "error" not in before:
+                row["regressions"].append(f"fails: {after['error']}")
+            rows.append(row)
+            continue
+        if "error" in before:
+            rows.append(row)
+            continue
+
+        row["time_change"] = after["seconds"] / before["seconds"] - 1 if before["seconds"] else 0.0
+        if row["time_change"] > time_threshold and max(before["seconds"], after["seconds"]) >= min_seconds:
+            row["regressions"].append(f"time {row['time_change']:+.0%}")
+        growth_before, growth_after = before["rss_growth_bytes"], after["rss_growth_bytes"]
+        row["memory_change"] = growth_after / growth_before - 1 if growth_before > 0 else 0.0
+        if row["memory_change"] > memory_threshold and growth_after - growth_before > min_memory_bytes:
+            row["regressions"].append(f"memory {row['memory_change']:+.0%}")
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row["case"], row["rows"], row["group_col"] or ""))
@@ -0,0 +1,40 @@
+"""Deterministic synthetic feature-synthesis inputs."""
+import numpy as np
+import polars as pl
+
+CARDINALITIES = (10, 1_000, 100_000)
+
+
+def group_col(cardinality: int) -> str:
+    return f"group_{cardinality}"
+
+
+def make_frame(rows: int, cardinalities: tuple[int, ...] = CARDINALITIES, numeric: int = 4, boolean: int = 2,
+               null_fraction: float = 0.01, seed: int = 0, chunk_size: int = 10_000_000) -> pl.DataFrame:
+    """Returns `rows` rows, identical for the same arguments on every platform:
+
+    * ``time``: a sorted datetime, one second apart,
+    * ``x0..``: `numeric` standard normal floats, with `null_fraction` nulls,
+    * ``n``: non-negative integers,
+    * ``b0..``: `boolean` booleans, true for 30% of the rows,
+    * ``group_<cardinality>``: uniform group keys for each of `cardinalities`.
+
+    Large frames are generated `chunk_size` rows at a time, each chunk from its own seed,
+    to bound the temporary NumPy memory.
+    """
+    chunks = []
+    for index, start in enumerate(range(0, rows, chunk_size)):
+        size = min(chunk_size, rows - start)
+        rng = np.random.default_rng([seed, index])
+        data = {"time": np.arange(start, start + size, dtype=np.int64) * 1_000_000}
+        for i in range(numeric):
+            data[f"x{i}"] = pl.Series(rng.standard_normal(size)).scatter(
+                np.flatnonzero(rng.random(size) < null_fraction), None
+            )
+        data["n"] = rng.integers(0, 1_000, size)
+        for i in range(boolean):
+            data[f"b{i}"] = rng.random(size) < 0.3
+        for cardinality in cardinalities:
+            data[group_col(cardinality)] = rng.integers(0, cardinality, size)
+        chunks.append(pl.DataFrame(data).with_columns(pl.col("time").cast(pl.Datetime("us"))))
+    return pl.concat(chunks, rechunk=True) if len(chunks) > 1 else chunks[0]
@@ -0,0 +1,68 @@
+"""Wall time and peak resident memory of a benchmark case."""
+import gc
+import os
+import resource
+import threading
+import time
+from typing import Callable, Optional
+
+_page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _page_size
+    except OSError:
+        return None
+
+
+class PeakRSS:
+    """Samples the resident set size from a background thread while the block runs. polars
+    releases the GIL while it computes, so the thread keeps sampling. Without /proc, falls
+    back to the peak of the whole process so far."""
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        rss = current_rss()
+        if rss is not None:
+            self.start = self.peak = rss
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, current_rss())
+        else:  # ru_maxrss is in kilobytes on Linux, bytes on macOS
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(fn: Callable[[], object], repeat: int = 3) -> dict:
+    """Runs `fn` `repeat` times. Reports the fastest and mean seconds, the peak resident
+    memory and how much it grew over the memory before the run."""
+    times = []
+    with PeakRSS() as rss:
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return {
+        "seconds": min(times),
+        "mean_seconds": sum(times) / len(times),
+        "peak_rss_bytes": rss.peak,
+        "rss_growth_bytes": rss.peak - rss.start,
+    }
@@ -1,4 +1,14 @@
-from dfs.primitives.standard import *
+from dfs.primitives.base import *
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
 from dfs.primitives.utils import (
     get_aggregation_primitives, get_transform_primitives, get_all_primitives, list_primitives
 )
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, _primitive_names = _lazy_attributes(__name__, globals())
+
+__all__ = [
+    "AggregationPrimitive", "PrimitiveBase", "TransformPrimitive", "TDataType", "TFrame", "TInputType",
+    "get_aggregation_primitives", "get_transform_primitives", "get_all_primitives", "list_primitives",
+    *_primitive_names,
+]
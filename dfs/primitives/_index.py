@@ -0,0 +1,64 @@
+# Generated by `python -m dfs.primitives.registry`, do not edit.
+# Primitive class name -> (module, primitive name, kind)
+PRIMITIVES = {
+    'Absolute': ('dfs.primitives.standard.transform.numeric.absolute', 'absolute', 'transform'),
+    'AddNumeric': ('dfs.primitives.standard.transform.binary.add_numeric', 'add_numeric', 'transform'),
+    'AddNumericScalar': ('dfs.primitives.standard.transform.binary.add_numeric_scalar', 'add_numeric_scalar', 'transform'),
+    'And': ('dfs.primitives.standard.transform.binary.and_primitive', 'and', 'transform'),
+    'Cosine': ('dfs.primitives.standard.transform.numeric.cosine', 'cosine', 'transform'),
+    'Count': ('dfs.primitives.standard.aggregation.count', 'count', 'aggregation'),
+    'CumCount': ('dfs.primitives.standard.transform.cumulative.cum_count', 'cum_count', 'transform'),
+    'CumMax': ('dfs.primitives.standard.transform.cumulative.cum_max', 'cum_max', 'transform'),
+    'CumMean': ('dfs.primitives.standard.transform.cumulative.cum_mean', 'cum_mean', 'transform'),
+    'CumMin': ('dfs.primitives.standard.transform.cumulative.cum_min', 'cum_min', 'transform'),
+    'CumSum': ('dfs.primitives.standard.transform.cumulative.cum_sum', 'cum_sum', 'transform'),
+    'CumulativeTimeSinceLastFalse': ('dfs.primitives.standard.transform.cumulative.cumulative_time_since_last_false', 'cumulative_time_since_last_false', 'transform'),
+    'CumulativeTimeSinceLastTrue': ('dfs.primitives.standard.transform.cumulative.cumulative_time_since_last_true', 'cumulative_time_since_last_true', 'transform'),
+    'Diff': ('dfs.primitives.standard.transform.numeric.diff', 'diff', 'transform'),
+    'DivideByFeature': ('dfs.primitives.standard.transform.binary.divide_by_feature', 'divide_by_feature', 'transform'),
+    'DivideNumeric': ('dfs.primitives.standard.transform.binary.divide_numeric', 'divide_numeric', 'transform'),
+    'DivideNumericScalar': ('dfs.primitives.standard.transform.binary.divide_numeric_scalar', 'divide_numeric_scalar', 'transform'),
+    'Equal': ('dfs.primitives.standard.transform.binary.equal', 'equal', 'transform'),
+    'EqualScalar': ('dfs.primitives.standard.transform.binary.equal_scalar', 'equal_scalar', 'transform'),
+    'ExponentialWeightedAverage': ('dfs.primitives.standard.transform.exponential.exponential_weighted_average', 'exponential_weighted_average', 'transform'),
+    'ExponentialWeightedSTD': ('dfs.primitives.standard.transform.exponential.exponential_weighted_std', 'exponential_weighted_std', 'transform'),
+    'ExponentialWeightedVariance': ('dfs.primitives.standard.transform.exponential.exponential_weighted_variance', 'exponential_weighted_variance', 'transform'),
+    'GreaterThan': ('dfs.primitives.standard.transform.binary.greater_than', 'greater_than', 'transform'),
+    'GreaterThanEqualTo': ('dfs.primitives.standard.transform.binary.greater_than_equal_to', 'greater_than_equal_to', 'transform'),
+    'GreaterThanEqualToScalar': ('dfs.primitives.standard.transform.binary.greater_than_equal_to_scalar', 'greater_than_equal_to_scalar', 'transform'),
+    'GreaterThanScalar': ('dfs.primitives.standard.transform.binary.greater_than_scalar', 'greater_than_scalar', 'transform'),
+    'LessThan': ('dfs.primitives.standard.transform.binary.less_than', 'less_than', 'transform'),
+    'LessThanEqualTo': ('dfs.primitives.standard.transform.binary.less_than_equal_to', 'less_than_equal_to', 'transform'),
+    'LessThanEqualToScalar': ('dfs.primitives.standard.transform.binary.less_than_equal_to_scalar', 'less_than_equal_to_scalar', 'transform'),
+    'LessThanScalar': ('dfs.primitives.standard.transform.binary.less_than_scalar', 'less_than_scalar', 'transform'),
+    'Max': ('dfs.primitives.standard.aggregation.max_primitive', 'max', 'aggregation'),
+    'Mean': ('dfs.primitives.standard.aggregation.mean', 'mean', 'aggregation'),
+    'Min': ('dfs.primitives.standard.aggregation.min_primitive', 'min', 'aggregation'),
+    'Mode': ('dfs.primitives.standard.aggregation.mode', 'mode', 'aggregation'),
+    'ModuloByFeature': ('dfs.primitives.standard.transform.binary.modulo_by_feature', 'modulo_by_feature', 'transform'),
+    'ModuloNumeric': ('dfs.primitives.standard.transform.binary.modulo_numeric', 'modulo_numeric', 'transform'),
+    'ModuloNumericScalar': ('dfs.primitives.standard.transform.binary.modulo_numeric_scalar', 'modulo_numeric_scalar', 'transform'),
+    'MultiplyBoolean': ('dfs.primitives.standard.transform.binary.multiply_boolean', 'multiply_boolean', 'transform'),
+    'MultiplyNumeric': ('dfs.primitives.standard.transform.binary.multiply_numeric', 'multiply_numeric', 'transform'),
+    'MultiplyNumericBoolean': ('dfs.primitives.standard.transform.binary.multiply_numeric_boolean', 'multiply_numeric_boolean', 'transform'),
+    'MultiplyNumericScalar': ('dfs.primitives.standard.transform.binary.multiply_numeric_scalar', 'multiply_numeric_scalar', 'transform'),
+    'NaturalLogarithm': ('dfs.primitives.standard.transform.numeric.natural_logarithm', 'natural_logarithm', 'transform'),
+    'Negate': ('dfs.primitives.standard.transform.numeric.negate', 'negate', 'transform'),
+    'NotEqual': ('dfs.primitives.standard.transform.binary.not_equal', 'not_equal', 'transform'),
+    'NotEqualScalar': ('dfs.primitives.standard.transform.binary.not_equal_scalar', 'not_equal_scalar', 'transform'),
+    'NumUnique': ('dfs.primitives.standard.aggregation.num_unique', 'num_unique', 'aggregation'),
+    'Or': ('dfs.primitives.standard.transform.binary.or_primitive', 'or', 'transform'),
+    'PercentTrue': ('dfs.primitives.standard.aggregation.percent_true', 'percent_true', 'aggregation'),
+    'Percentile': ('dfs.primitives.standard.transform.numeric.percentile', 'percentile', 'transform'),
+    'RateOfChange': ('dfs.primitives.standard.transform.numeric.rate_of_change', 'rate_of_change', 'transform'),
+    'SameAsPrevious': ('dfs.primitives.standard.transform.numeric.same_as_previous', 'same_as_previous', 'transform'),
+    'ScalarSubtractNumericFeature': ('dfs.primitives.standard.transform.binary.scalar_subtract_numeric_feature', 'scalar_subtract_numeric_feature', 'transform'),
+    'Sine': ('dfs.primitives.standard.transform.numeric.sine', 'sine', 'transform'),
+    'Skew': ('dfs.primitives.standard.aggregation.skew', 'skew', 'aggregation'),
+    'SquareRoot': ('dfs.primitives.standard.transform.numeric.square_root', 'square_root', 'transform'),
+    'Std': ('dfs.primitives.standard.aggregation.std', 'std', 'aggregation'),
+    'SubtractNumeric': ('dfs.primitives.standard.transform.binary.subtract_numeric', 'subtract_numeric', 'transform'),
+    'SubtractNumericScalar': ('dfs.primitives.standard.transform.binary.subtract_numeric_scalar', 'subtract_numeric_scalar', 'transform'),
+    'Sum': ('dfs.primitives.standard.aggregation.sum_primitive', 'sum', 'aggregation'),
+    'Tangent': ('dfs.primitives.standard.transform.numeric.tangent', 'tangent', 'transform'),
+}
@@ -4,12 +4,18 @@ from dfs.primitives.base.primitive_base import PrimitiveBase
 
 
 class AggregationPrimitive(PrimitiveBase, ABC):
+    """Feature reducing the values of its input within each group of rows to one value.
+
+    ``_apply`` returns an aggregating expression (e.g. ``pl.col(x).sum()``), which is
+    evaluated per group in a ``group_by(...).agg`` and joined back to the rows of the group.
+    """
+
     def _get_name(self, base_feature_names: list[str],
-                  relationship_path_name: str, parent_dataframe_name: str,
-                  where_str: str, use_prev_str: bool):
-        name = "%s(%s.%s%s%s%s)" % (
+                  relationship_path_name: str = "", parent_dataframe_name: str = "",
+                  where_str: str = "", use_prev_str: str = ""):
+        name = "%s(%s%s%s%s%s)" % (
             self.name.upper(),
-            relationship_path_name,
+            f"{relationship_path_name}." if relationship_path_name else "",
             ", ".join(base_feature_names),
             where_str,
             use_prev_str,
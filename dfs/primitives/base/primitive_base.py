@@ -1,12 +1,13 @@
 import typing
 from abc import ABCMeta, abstractmethod
-from functools import partial
+from functools import lru_cache, partial
 from inspect import signature
 from typing import Union, Optional
 
 import polars as pl
 import polars.selectors as cs
-from num2words import num2words
+
+from dfs.utils import instrumentation
 
 TDataType = Union[pl.PolarsDataType, frozenset[pl.PolarsDataType]]
 TFrame = Union[pl.DataFrame, pl.LazyFrame]
@@ -14,6 +15,20 @@ TFrame = Union[pl.DataFrame, pl.LazyFrame]
 TInputType = Union[cs._selector_proxy_, tuple[cs._selector_proxy_]]
 
 
+@lru_cache(maxsize=None)
+def _parameters(cls: type) -> dict[str, typing.Any]:
+    """Default value of each constructor parameter of a primitive class, resolved once."""
+    return {name: param.default for name, param in signature(cls).parameters.items()}
+
+
+@lru_cache(maxsize=None)
+def _num_inputs(cls: type) -> int:
+    assert len(cls.input_types) > 0, "Primitive must have at least one input type"
+    if isinstance(cls.input_types[0], tuple):
+        return len(cls.input_types[0])
+    return 1
+
+
 class PrimitiveBase(metaclass=ABCMeta):
     """Base class for all primitives.
 
@@ -23,6 +38,7 @@ class PrimitiveBase(metaclass=ABCMeta):
     default_value - Default value this feature returns if no standard found. Defaults to np.nan
     max_stack_depth: int - Maximum number of features in the largest chain proceeding downward from this feature's base features.
     num_output_features: int - Number of columns in feature matrix associated with this feature
+    cost: float - Relative time per row to compute this feature, where an element-wise arithmetic operation costs 1. Used to budget feature generation, see CostModel.
 
     base_of - whitelist of primitives that can have this primitive in input_types
     base_of_exclude - blacklist of primitives that can have this primitive in input_types
@@ -44,6 +60,7 @@ class PrimitiveBase(metaclass=ABCMeta):
     default_value = float("nan")
     max_stack_depth: int = None
     num_output_features: int = 1
+    cost: float = 1.0
 
     base_of: Optional[list] = None
     base_of_exclude: Optional[list] = None
@@ -68,6 +85,11 @@ class PrimitiveBase(metaclass=ABCMeta):
                 if len(input_type) != num_inputs:
                     raise ValueError(f"Primitive {cls.name} must have the same number of inputs for each input type")
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in _parameters(type(self)):  # the cached arguments are stale
+            self.__dict__.pop("_args", None)
+
     def __lt__(self, other: "PrimitiveBase"):
         return (self.name + self.get_args()) < (other.name + other.get_args())
 
@@ -76,41 +98,49 @@ class PrimitiveBase(metaclass=ABCMeta):
         ...
 
     @typing.final
-    def get_name(self, *args, **kwargs):
-        self.check_col_count(self.input_types, self.get_num_inputs())
-        return self._get_name(*args, **kwargs)
+    def get_name(self, base_feature_names: list[str], *args, **kwargs):
+        with instrumentation.span("primitive", "get_name", primitive=self.name):
+            self.check_col_count(base_feature_names, self.get_num_inputs())
+            return self._get_name(base_feature_names, *args, **kwargs)
 
     @classmethod
     def get_num_inputs(cls) -> int:
-        assert len(cls.input_types) > 0, "Primitive must have at least one input type"
-        if isinstance(cls.input_types[0], tuple):
-            return len(cls.input_types[0])
-        return 1
+        return _num_inputs(cls)
 
     @abstractmethod
     def _apply(self, df: TFrame) -> pl.Expr:
         ...
 
     @typing.final
-    def apply(self, df: TFrame, columns: list[str], group_cols: list[str]):
-        for col in (group_cols or []):
-            if col not in df.columns:
-                raise ValueError(f"Group column {col} not found in DataFrame")
-            if col in columns:
-                raise ValueError(f"Group column {col} cannot be used as input")
+    def get_expr(self, df: TFrame, columns: list[str], group_cols: list[str]) -> pl.Expr:
+        """Returns the aliased expression for this primitive applied to `columns` of `df`.
 
-        self.check_col_count(columns, self.get_num_inputs())
+        `df` only needs to carry the schema of the inputs, so an empty frame is enough.
+        """
+        with instrumentation.span("primitive", "get_expr", primitive=self.name):
+            for col in (group_cols or []):
+                if col not in df.columns:
+                    raise ValueError(f"Group column {col} not found in DataFrame")
+                if col in columns:
+                    raise ValueError(f"Group column {col} cannot be used as input")
 
-        expr = self._apply(df.select(columns))
-        output_name = self.get_name(columns)
+            self.check_col_count(columns, self.get_num_inputs())
 
-        if output_name in df.columns:  # Since we are doing DFS, old features shouldn't be overwritten
-            raise ValueError(f"Column {output_name} already exists in DataFrame")
+            with instrumentation.span("primitive", "_apply", primitive=self.name):
+                expr = self._apply(df.select(columns))
+            output_name = self.get_name(columns)
 
-        if group_cols:
-            expr = expr.over(group_cols)
+            if output_name in df.columns:  # Since we are doing DFS, old features shouldn't be overwritten
+                raise ValueError(f"Column {output_name} already exists in DataFrame")
 
-        return df.with_columns(expr.alias(output_name))
+            if group_cols:
+                expr = expr.over(group_cols)
+
+            return expr.alias(output_name)
+
+    @typing.final
+    def apply(self, df: TFrame, columns: list[str], group_cols: list[str]):
+        return df.with_columns(self.get_expr(df, columns, group_cols))
 
     @staticmethod
     def check_col_count(inputs: list, count: int):
@@ -118,35 +148,45 @@ class PrimitiveBase(metaclass=ABCMeta):
             raise ValueError(f"Expected {count} inputs, got {len(inputs)}")
 
     def get_args(self, format_to_string: bool = True):
+        """Returns the constructor arguments which differ from their defaults, formatted as
+        ``", name=value, ..."`` or as a list of (name, value) pairs.
+
+        Both are computed once per instance, and again only after an argument is set.
+        """
+        args = self.__dict__.get("_args")
+        if args is None:
+            with instrumentation.span("primitive", "get_args", primitive=self.name):
+                args = self.__dict__["_args"] = self._compute_args()
+        return args[1] if format_to_string else list(args[0])
+
+    def _compute_args(self) -> tuple[tuple, str]:
         values = []
 
-        args = signature(self.__class__).parameters.items()
-        for name, arg in args:
+        for name, default in _parameters(type(self)).items():
             # assert that arg is attribute of primitive
             error = '"{}" must be attribute of {}'
             assert hasattr(self, name), error.format(name, self.__class__.__name__)
 
             value = getattr(self, name)  # check if args are the same type
-            if isinstance(value, type(arg.default)):
-                if arg.default == value:  # skip if default value
+            if isinstance(value, type(default)):
+                if default == value:  # skip if default value
                     continue
             values.append((name, value))
 
-        if not format_to_string:
-            return values
-
         strings = []
         for name, value in values:
             string = f"{name}={value}"  # format arg to string
             strings.append(string)
 
         if len(strings) == 0:
-            return ""
+            return tuple(values), ""
 
-        return ", " + ", ".join(strings)
+        return tuple(values), ", " + ", ".join(strings)
 
     def get_description(self, input_column_descriptions,
                         slice_num=None, template_override=None):
+        from num2words import num2words  # slow to import, and only needed for descriptions
+
         template = template_override or self.description_template
         if template:
             if isinstance(template, list):
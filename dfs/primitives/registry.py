@@ -0,0 +1,123 @@
+"""Lazily-loaded registry of the built-in primitives.
+
+The generated index (:mod:`dfs.primitives._index`) maps every primitive class to its module,
+so importing :mod:`dfs.primitives` imports no primitive module: a class is imported when it
+is first accessed, e.g. ``dfs.primitives.CumSum``, and :func:`primitives` imports only the
+modules of the requested kind, once.
+
+Regenerate the index after adding, renaming or moving a primitive::
+
+    python -m dfs.primitives.registry
+"""
+import importlib
+import os
+import pkgutil
+from collections.abc import Mapping
+from typing import Callable
+
+from dfs.primitives._index import PRIMITIVES
+
+_classes: dict[str, type] = {}
+_by_kind: dict[str, dict[str, type]] = {}
+
+
+def load(class_name: str) -> type:
+    """Returns the primitive class `class_name`, importing its module on first use."""
+    cls = _classes.get(class_name)
+    if cls is None:
+        module, _, _ = PRIMITIVES[class_name]
+        cls = _classes[class_name] = getattr(importlib.import_module(module), class_name)
+    return cls
+
+
+def primitives(kind: str = None) -> dict[str, type]:
+    """Returns the primitive classes of `kind` (``"transform"`` or ``"aggregation"``, or
+    all if None) by primitive name. Do not mutate the result."""
+    result = _by_kind.get(kind)
+    if result is None:
+        result = _by_kind[kind] = {
+            name: load(class_name) for class_name, (_, name, primitive_kind) in PRIMITIVES.items()
+            if kind is None or primitive_kind == kind
+        }
+    return result
+
+
+class LazyPrimitives(Mapping):
+    """Read-only mapping of primitive name to primitive class, importing the module of a
+    class only when it is looked up. See :func:`primitives` for an imported ``dict``."""
+
+    def __init__(self, kind: str = None):
+        self._classes = {
+            name: class_name for class_name, (_, name, primitive_kind) in PRIMITIVES.items()
+            if kind is None or primitive_kind == kind
+        }
+
+    def __getitem__(self, name: str) -> type:
+        return load(self._classes[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._classes
+
+    def __iter__(self):
+        return iter(self._classes)
+
+    def __len__(self):
+        return len(self._classes)
+
+
+def lazy_attributes(package: str, namespace: dict) -> tuple[Callable, Callable, list[str]]:
+    """Returns the module ``__getattr__`` and ``__dir__`` (PEP 562) of `package`, resolving the
+    primitive classes defined in its modules on first access, and their names for
+    ``__all__``. `namespace` is the ``globals()`` of the package, where resolved classes are
+    stored so later accesses are plain lookups."""
+    names = {class_name for class_name, (module, _, _) in PRIMITIVES.items() if module.startswith(package + ".")}
+
+    def __getattr__(name: str):
+        if name not in names:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        cls = namespace[name] = load(name)
+        return cls
+
+    def __dir__():
+        return sorted(set(namespace) | names)
+
+    return __getattr__, __dir__, sorted(names)
+
+
+def build_index(root: str = "dfs.primitives.standard") -> dict[str, tuple[str, str, str]]:
+    """Imports every module under `root` and returns the index of the primitives they
+    define: class name -> (module, primitive name, kind)."""
+    from dfs.primitives.base import AggregationPrimitive, PrimitiveBase, TransformPrimitive
+
+    package = importlib.import_module(root)
+    index = {}
+    for info in pkgutil.walk_packages(package.__path__, root + "."):
+        module = importlib.import_module(info.name)
+        for cls in vars(module).values():
+            if (isinstance(cls, type) and issubclass(cls, PrimitiveBase) and cls.__module__ == module.__name__
+                    and hasattr(cls, "name")):
+                kind = "aggregation" if issubclass(cls, AggregationPrimitive) else (
+                    "transform" if issubclass(cls, TransformPrimitive) else "other"
+                )
+                if cls.__name__ in index:
+                    raise ValueError(f"Primitive class {cls.__name__} is defined twice")
+                index[cls.__name__] = (module.__name__, cls.name.lower(), kind)
+    return dict(sorted(index.items()))
+
+
+def write_index(path: str = None):
+    path = path or os.path.join(os.path.dirname(__file__), "_index.py")
+    lines = [
+        "# Generated by `python -m dfs.primitives.registry`, do not edit.",
+        "# Primitive class name -> (module, primitive name, kind)",
+        "PRIMITIVES = {",
+        *(f"    {name!r}: {entry!r}," for name, entry in build_index().items()),
+        "}",
+        "",
+    ]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+if __name__ == "__main__":
+    write_index()
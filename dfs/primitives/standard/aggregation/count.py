@@ -0,0 +1,17 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Count(AggregationPrimitive):
+    """Determines the total number of values, excluding nulls."""
+
+    name = "count"
+    input_types = [cs.all()]
+    return_type = pl.UInt32
+    default_value = 0
+    description_template = "the number of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).count()
@@ -0,0 +1,16 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Mean(AggregationPrimitive):
+    """Computes the average for a list of values, ignoring nulls. `NaN` values make it `NaN`."""
+
+    name = "mean"
+    input_types = [cs.numeric()]
+    return_type = pl.FLOAT_DTYPES
+    description_template = "the average of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).mean()
@@ -0,0 +1,16 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Min(AggregationPrimitive):
+    """Calculates the smallest value, ignoring null and `NaN` values."""
+
+    name = "min"
+    input_types = [cs.numeric()]
+    return_type = pl.NUMERIC_DTYPES
+    description_template = "the minimum of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).min()
@@ -0,0 +1,24 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Mode(AggregationPrimitive):
+    """Determines the most commonly repeated value.
+
+    Description:
+        Given a list of values, return the value with the
+        highest number of occurrences. If several values are
+        equally common, return the smallest one. Null values
+        are ignored.
+    """
+
+    name = "mode"
+    input_types = [cs.string() | cs.categorical() | cs.integer() | cs.boolean()]
+    return_type = pl.INTEGER_DTYPES | {pl.String, pl.Categorical, pl.Boolean}
+    cost = 2
+    description_template = "the most frequently occurring value of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).drop_nulls().mode().sort().first()
@@ -0,0 +1,17 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class NumUnique(AggregationPrimitive):
+    """Determines the number of distinct values, ignoring null values."""
+
+    name = "num_unique"
+    input_types = [cs.string() | cs.categorical() | cs.integer() | cs.boolean()]
+    return_type = pl.UInt32
+    cost = 2
+    description_template = "the number of unique elements in {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).drop_nulls().n_unique()
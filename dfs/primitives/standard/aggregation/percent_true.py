@@ -0,0 +1,23 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class PercentTrue(AggregationPrimitive):
+    """Determines the percent of `True` values.
+
+    Description:
+        Given a list of booleans, return the percent
+        of values which are `True` as a decimal.
+        Null values are treated as `False`,
+        adding to the denominator.
+    """
+
+    name = "percent_true"
+    input_types = [cs.boolean()]
+    return_type = pl.Float64
+    description_template = "the percentage of true values in {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).fill_null(False).mean()
@@ -0,0 +1,24 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Skew(AggregationPrimitive):
+    """Computes the extent to which a distribution differs from a normal distribution.
+
+    Description:
+        For normally distributed data, the skewness should be about 0.
+        A skewness value > 0 means there is more weight in the right tail
+        of the distribution. The sample skewness is corrected for
+        statistical bias, and null values are ignored.
+    """
+
+    name = "skew"
+    input_types = [cs.numeric()]
+    return_type = pl.FLOAT_DTYPES
+    cost = 2
+    description_template = "the skewness of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).skew(bias=False)
@@ -0,0 +1,22 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Std(AggregationPrimitive):
+    """Computes the dispersion relative to the mean value, ignoring nulls.
+
+    Description:
+        Given a list of values, return the sample standard deviation
+        (with one delta degree of freedom).
+    """
+
+    name = "std"
+    input_types = [cs.numeric()]
+    return_type = pl.FLOAT_DTYPES
+    cost = 2
+    description_template = "the standard deviation of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).std()
@@ -0,0 +1,17 @@
+import polars as pl
+import polars.selectors as cs
+
+from dfs.primitives.base import AggregationPrimitive, TFrame
+
+
+class Sum(AggregationPrimitive):
+    """Calculates the total addition, ignoring nulls. `NaN` values make it `NaN`."""
+
+    name = "sum"
+    input_types = [cs.numeric()]
+    return_type = pl.NUMERIC_DTYPES
+    default_value = 0
+    description_template = "the sum of {}"
+
+    def _apply(self, df: TFrame) -> pl.Expr:
+        return pl.col(df.columns[0]).sum()
@@ -1,4 +1,4 @@
-from dfs.primitives.standard.transform.binary import *
-from dfs.primitives.standard.transform.cumulative import *
-from dfs.primitives.standard.transform.exponential import *
-from dfs.primitives.standard.transform.numeric import *
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, __all__ = _lazy_attributes(__name__, globals())
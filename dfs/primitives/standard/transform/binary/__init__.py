@@ -1,29 +1,4 @@
-from dfs.primitives.standard.transform.binary.add_numeric import AddNumeric
-from dfs.primitives.standard.transform.binary.add_numeric_scalar import AddNumericScalar
-from dfs.primitives.standard.transform.binary.and_primitive import And
-from dfs.primitives.standard.transform.binary.divide_by_feature import DivideByFeature
-from dfs.primitives.standard.transform.binary.divide_numeric import DivideNumeric
-from dfs.primitives.standard.transform.binary.divide_numeric_scalar import DivideNumericScalar
-from dfs.primitives.standard.transform.binary.equal import Equal
-from dfs.primitives.standard.transform.binary.equal_scalar import EqualScalar
-from dfs.primitives.standard.transform.binary.greater_than import GreaterThan
-from dfs.primitives.standard.transform.binary.greater_than_equal_to import GreaterThanEqualTo
-from dfs.primitives.standard.transform.binary.greater_than_equal_to_scalar import GreaterThanEqualToScalar
-from dfs.primitives.standard.transform.binary.greater_than_scalar import GreaterThanScalar
-from dfs.primitives.standard.transform.binary.less_than import LessThan
-from dfs.primitives.standard.transform.binary.less_than_equal_to import LessThanEqualTo
-from dfs.primitives.standard.transform.binary.less_than_equal_to_scalar import LessThanEqualToScalar
-from dfs.primitives.standard.transform.binary.less_than_scalar import LessThanScalar
-from dfs.primitives.standard.transform.binary.modulo_by_feature import ModuloByFeature
-from dfs.primitives.standard.transform.binary.modulo_numeric import ModuloNumeric
-from dfs.primitives.standard.transform.binary.modulo_numeric_scalar import ModuloNumericScalar
-from dfs.primitives.standard.transform.binary.multiply_boolean import MultiplyBoolean
-from dfs.primitives.standard.transform.binary.multiply_numeric import MultiplyNumeric
-from dfs.primitives.standard.transform.binary.multiply_numeric_boolean import MultiplyNumericBoolean
-from dfs.primitives.standard.transform.binary.multiply_numeric_scalar import MultiplyNumericScalar
-from dfs.primitives.standard.transform.binary.not_equal import NotEqual
-from dfs.primitives.standard.transform.binary.not_equal_scalar import NotEqualScalar
-from dfs.primitives.standard.transform.binary.or_primitive import Or
-from dfs.primitives.standard.transform.binary.scalar_subtract_numeric_feature import ScalarSubtractNumericFeature
-from dfs.primitives.standard.transform.binary.subtract_numeric import SubtractNumeric
-from dfs.primitives.standard.transform.binary.subtract_numeric_scalar import SubtractNumericScalar
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, __all__ = _lazy_attributes(__name__, globals())
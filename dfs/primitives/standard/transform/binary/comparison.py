@@ -0,0 +1,27 @@
+"""Checks shared by the comparison primitives."""
+import polars as pl
+
+from dfs.primitives.base import TFrame
+
+_temporal = (pl.Date, pl.Datetime, pl.Duration)
+# Dtypes without a supertype with dates, datetimes and durations
+_not_temporal = (pl.Boolean, pl.Int8, pl.Int16, pl.UInt8, pl.UInt16, pl.Time)
+# The only dtypes with a supertype with times
+_time = (pl.Time, pl.Int32, pl.Int64, pl.Float32, pl.Float64)
+
+
+def _comparable(dtype: pl.DataType, other: pl.DataType) -> bool:
+    if dtype == pl.Time:
+        return other in _time
+    if dtype == pl.Datetime and other == pl.Datetime:
+        return dtype.time_zone == other.time_zone
+    return dtype not in _temporal or other not in _not_temporal
+
+
+def check_comparable(df: TFrame):
+    """Raises an InvalidOperationError if the two columns of `df` can't be compared: polars
+    panics instead of raising when a temporal column has no supertype with the other one,
+    e.g. a date and a boolean, or datetimes in different time zones."""
+    left, right = df.dtypes
+    if not (_comparable(left, right) and _comparable(right, left)):
+        raise pl.exceptions.InvalidOperationError(f"Can't compare {left} with {right}")
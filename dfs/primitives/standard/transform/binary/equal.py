@@ -2,6 +2,7 @@ import polars as pl
 import polars.selectors as cs
 
 from dfs.primitives.base import TransformPrimitive, TFrame
+from dfs.primitives.standard.transform.binary.comparison import check_comparable
 
 
 class Equal(TransformPrimitive):
@@ -21,6 +22,7 @@ class Equal(TransformPrimitive):
     description_template = "whether {} equals {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
+        check_comparable(df)
         return pl.col(df.columns[0]).eq(pl.col(df.columns[1]))
 
     def _get_name(self, cols: list[str]):
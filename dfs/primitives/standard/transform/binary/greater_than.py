@@ -2,6 +2,7 @@ import polars as pl
 import polars.selectors as cs
 
 from dfs.primitives.base import TransformPrimitive, TFrame
+from dfs.primitives.standard.transform.binary.comparison import check_comparable
 
 
 class GreaterThan(TransformPrimitive):
@@ -22,6 +23,7 @@ class GreaterThan(TransformPrimitive):
     description_template = "whether {} is greater than {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
+        check_comparable(df)
         return pl.col(df.columns[0]).gt(pl.col(df.columns[1]))
 
     def _get_name(self, cols: list[str]):
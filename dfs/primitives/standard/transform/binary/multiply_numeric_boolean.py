@@ -17,6 +17,7 @@ class MultiplyNumericBoolean(TransformPrimitive):
     input_types = [(cs.numeric(), cs.boolean()),
                    (cs.boolean(), cs.numeric())]
     return_type = pl.NUMERIC_DTYPES
+    cost = 2
 
     commutative = True
     description_template = "the product of {} and {}"
@@ -2,6 +2,7 @@ import polars as pl
 import polars.selectors as cs
 
 from dfs.primitives.base import TransformPrimitive, TFrame
+from dfs.primitives.standard.transform.binary.comparison import check_comparable
 
 
 class NotEqual(TransformPrimitive):
@@ -21,6 +22,7 @@ class NotEqual(TransformPrimitive):
     description_template = "whether {} does not equal {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
+        check_comparable(df)
         return pl.col(df.columns[0]).ne(pl.col(df.columns[1]))
 
     def _get_name(self, cols: list[str]):
@@ -15,11 +15,8 @@ class SubtractNumeric(TransformPrimitive):
     Args:
         commutative (bool): determines if Deep Feature Synthesis should
             generate both x - y and y - x, or just one. If True, there is no
-            guarantee which of the two will be generated. Defaults to True.
-
-    Notes:
-        commutative is True by default since False would result in 2 perfectly
-        correlated series.
+            guarantee which of the two will be generated. Defaults to False,
+            as subtraction is not commutative: y - x is the negation of x - y.
     """
 
     name = "subtract_numeric"
@@ -27,9 +24,9 @@ class SubtractNumeric(TransformPrimitive):
     return_type = pl.NUMERIC_DTYPES
 
     description_template = "the result of {} minus {}"
-    commutative = True
+    commutative = False
 
-    def __init__(self, commutative=True):
+    def __init__(self, commutative=False):
         super().__init__()
         self.commutative = commutative
 
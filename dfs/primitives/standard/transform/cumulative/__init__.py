@@ -1,7 +1,4 @@
-from dfs.primitives.standard.transform.cumulative.cum_count import CumCount
-from dfs.primitives.standard.transform.cumulative.cum_max import CumMax
-from dfs.primitives.standard.transform.cumulative.cum_mean import CumMean
-from dfs.primitives.standard.transform.cumulative.cum_min import CumMin
-from dfs.primitives.standard.transform.cumulative.cum_sum import CumSum
-from dfs.primitives.standard.transform.cumulative.cumulative_time_since_last_false import CumulativeTimeSinceLastFalse
-from dfs.primitives.standard.transform.cumulative.cumulative_time_since_last_true import CumulativeTimeSinceLastTrue
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, __all__ = _lazy_attributes(__name__, globals())
@@ -21,4 +21,5 @@ class CumCount(TransformPrimitive):
     description_template = "the cumulative count of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
-        return pl.cum_count(pl.col(df.columns[0]))
+        # `is_null` has no nulls itself, so every row is counted
+        return pl.col(df.columns[0]).is_null().cum_count()
@@ -19,6 +19,7 @@ class CumMean(TransformPrimitive):
     input_types = [cs.numeric()]
     return_type = pl.NUMERIC_DTYPES
     use_full_dataframe = True
+    cost = 3
     description_template = "the cumulative mean of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
@@ -19,6 +19,7 @@ class CumMin(TransformPrimitive):
     input_types = [cs.numeric()]
     return_type = pl.NUMERIC_DTYPES
     use_full_dataframe = True
+    cost = 2
     description_template = "the cumulative minimum of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
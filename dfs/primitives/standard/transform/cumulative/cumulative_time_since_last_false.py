@@ -17,6 +17,8 @@ class CumulativeTimeSinceLastFalse(TransformPrimitive):
     name = "cumulative_time_since_last_false"
     input_types = [(cs.datetime() | cs.date(), cs.boolean())]
     return_type = pl.DURATION_DTYPES
+    use_full_dataframe = True
+    cost = 3
 
     def _apply(self, df: TFrame) -> pl.Expr:
         return (
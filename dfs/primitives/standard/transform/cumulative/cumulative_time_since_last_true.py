@@ -12,6 +12,8 @@ class CumulativeTimeSinceLastTrue(TransformPrimitive):
     name = "cumulative_time_since_last_true"
     input_types = [(cs.datetime() | cs.date(), cs.boolean())]
     return_type = pl.DURATION_DTYPES
+    use_full_dataframe = True
+    cost = 3
 
     def _apply(self, df: TFrame) -> pl.Expr:
         return (
@@ -1,9 +1,4 @@
-from dfs.primitives.standard.transform.exponential.exponential_weighted_average import (
-    ExponentialWeightedAverage,
-)
-from dfs.primitives.standard.transform.exponential.exponential_weighted_std import (
-    ExponentialWeightedSTD,
-)
-from dfs.primitives.standard.transform.exponential.exponential_weighted_variance import (
-    ExponentialWeightedVariance,
-)
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, __all__ = _lazy_attributes(__name__, globals())
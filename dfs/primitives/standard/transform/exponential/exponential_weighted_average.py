@@ -34,6 +34,7 @@ class ExponentialWeightedAverage(TransformPrimitive):
     input_types = [cs.numeric()]
     return_type = pl.FLOAT_DTYPES
     use_full_dataframe = True
+    cost = 3
 
     def __init__(self, com: float = None, span: float = None, half_life: float = None,
                  alpha: float = None, adjust: bool = True, bias: bool = False,
@@ -56,7 +57,6 @@ class ExponentialWeightedAverage(TransformPrimitive):
             half_life=self.half_life,
             alpha=self.alpha,
             adjust=self.adjust,
-            bias=self.bias,
             min_periods=self.min_periods,
             ignore_nulls=self.ignore_nulls,
         )
@@ -35,6 +35,7 @@ class ExponentialWeightedSTD(TransformPrimitive):
     input_types = [cs.numeric()]
     return_type = pl.FLOAT_DTYPES
     use_full_dataframe = True
+    cost = 7
 
     def __init__(self, com: float = None, span: float = None, half_life: float = None,
                  alpha: float = None, adjust: bool = True, bias: bool = False,
@@ -1,11 +1,4 @@
-from dfs.primitives.standard.transform.numeric.absolute import Absolute
-from dfs.primitives.standard.transform.numeric.cosine import Cosine
-from dfs.primitives.standard.transform.numeric.diff import Diff
-from dfs.primitives.standard.transform.numeric.natural_logarithm import NaturalLogarithm
-from dfs.primitives.standard.transform.numeric.negate import Negate
-from dfs.primitives.standard.transform.numeric.percentile import Percentile
-from dfs.primitives.standard.transform.numeric.rate_of_change import RateOfChange
-from dfs.primitives.standard.transform.numeric.same_as_previous import SameAsPrevious
-from dfs.primitives.standard.transform.numeric.sine import Sine
-from dfs.primitives.standard.transform.numeric.square_root import SquareRoot
-from dfs.primitives.standard.transform.numeric.tangent import Tangent
+from dfs.primitives.registry import lazy_attributes as _lazy_attributes
+
+# Primitive classes are imported on first access, see dfs.primitives.registry
+__getattr__, __dir__, __all__ = _lazy_attributes(__name__, globals())
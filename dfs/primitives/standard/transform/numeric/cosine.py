@@ -10,6 +10,7 @@ class Cosine(TransformPrimitive):
     name = "cosine"
     input_types = [cs.numeric()]
     return_type = pl.FLOAT_DTYPES
+    cost = 4
     description_template = "the cosine of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
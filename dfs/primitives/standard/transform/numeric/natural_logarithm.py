@@ -13,4 +13,4 @@ class NaturalLogarithm(TransformPrimitive):
     description_template = "the natural logarithm of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
-        return pl.col(df.columns[0]).ln()
+        return pl.col(df.columns[0]).log()
@@ -11,6 +11,7 @@ class Percentile(TransformPrimitive):
     use_full_dataframe = True
     input_types = [cs.numeric()]
     return_type = pl.NUMERIC_DTYPES
+    cost = 30
     description_template = "the percentile rank of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
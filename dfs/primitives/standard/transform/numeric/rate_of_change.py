@@ -11,6 +11,7 @@ class RateOfChange(TransformPrimitive):
     input_types = [(cs.numeric(), cs.datetime() | cs.date())]
     return_type = pl.FLOAT_DTYPES
     use_full_dataframe = True
+    cost = 4
     description_template = "the rate of change of {} per second"
 
     def _apply(self, df: TFrame) -> pl.Expr:
@@ -33,6 +33,7 @@ class SameAsPrevious(TransformPrimitive):
     name = "same_as_previous"
     input_types = [cs.numeric()]
     return_type = pl.Boolean
+    use_full_dataframe = True
 
     def __init__(self, value, strategy=None, limit=None):
         if strategy not in {None, 'forward', 'backward', 'min', 'max', 'mean', 'zero', 'one'}:
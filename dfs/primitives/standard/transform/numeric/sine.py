@@ -10,6 +10,7 @@ class Sine(TransformPrimitive):
     name = "sine"
     input_types = [cs.numeric()]
     return_type = pl.FLOAT_DTYPES
+    cost = 4
     description_template = "the sine of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
@@ -10,6 +10,7 @@ class Tangent(TransformPrimitive):
     name = "tangent"
     input_types = [cs.numeric()]
     return_type = pl.FLOAT_DTYPES
+    cost = 4
     description_template = "the tangent of {}"
 
     def _apply(self, df: TFrame) -> pl.Expr:
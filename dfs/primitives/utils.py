@@ -6,8 +6,7 @@ import os
 from inspect import getfullargspec, getsource, isclass
 from typing import Dict, List, Type, Union
 
-import dfs
-
+from dfs.primitives import registry
 from dfs.primitives.base import AggregationPrimitive, TransformPrimitive, PrimitiveBase, TInputType
 
 _return_type_name_mapping = {
@@ -21,42 +20,23 @@ _return_type_name_mapping = {
 }
 
 
-def _get_primitives(primitive_kind: Type[PrimitiveBase]) -> dict:
-    """Helper function that selects all primitives
-    that are instances of `primitive_kind`
-    """
-    primitives = set()
-    for attribute_string in dir(dfs.primitives):
-        attribute = getattr(dfs.primitives, attribute_string)
-        if isclass(attribute):
-            if issubclass(attribute, primitive_kind) and hasattr(attribute, "name"):
-                primitives.add(attribute)
-    return {prim.name.lower(): prim for prim in primitives}
-
-
 def get_aggregation_primitives() -> dict:
     """Returns all aggregation primitives, regardless
     of compatibility
     """
-    return _get_primitives(dfs.primitives.AggregationPrimitive)
+    return dict(registry.primitives("aggregation"))
 
 
 def get_transform_primitives() -> dict:
     """Returns all transform primitives, regardless
     of compatibility
     """
-    return _get_primitives(dfs.primitives.TransformPrimitive)
+    return dict(registry.primitives("transform"))
 
 
 def get_all_primitives() -> dict:
     """Helper function to return all primitives"""
-    primitives = set()
-    for attribute_string in dir(dfs.primitives):
-        attribute = getattr(dfs.primitives, attribute_string)
-        if isclass(attribute):
-            if issubclass(attribute, PrimitiveBase) and attribute.name:
-                primitives.add(attribute)
-    return {prim.__name__: prim for prim in primitives}
+    return {prim.__name__: prim for prim in registry.primitives().values()}
 
 
 def _get_return_type_name(dtype: Union[pl.PolarsDataType, frozenset[pl.PolarsDataType]]):
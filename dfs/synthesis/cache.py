@@ -1,20 +1,130 @@
+from typing import Optional
+
 import polars as pl
-from anytree import Node, RenderTree
+
+from dfs.primitives import PrimitiveBase
+
+
+class Feature:
+    """A node of the feature graph.
+
+    Base columns have no primitive and a depth of 0. A generated feature has a depth of one
+    more than its deepest input, and two identifiers:
+
+    * its key, used to refuse duplicates: the primitive, its non-default arguments and the
+      names of its inputs, sorted if the primitive is commutative, so ``a + b`` and ``b + a``
+      are the same feature,
+    * its id, used to cache computed columns: the primitive, its arguments and the ids of its
+      inputs in order, so it identifies the computation exactly, regardless of the feature
+      names and of whether the primitive is marked commutative.
+    """
+
+    def __init__(self, name: str, primitive: Optional[PrimitiveBase] = None,
+                 inputs: list["Feature"] = None, expr: Optional[pl.Expr] = None):
+        self.name = name
+        self.primitive = primitive
+        self.inputs = inputs or []
+        self.expr = expr
+        self.depth = 1 + max(f.depth for f in self.inputs) if self.inputs else 0
+        self.key = self.make_key(primitive, [f.name for f in self.inputs]) if primitive else (name,)
+        self.id = self.make_id(primitive, [f.id for f in self.inputs]) if primitive else (name,)
+
+    @staticmethod
+    def make_key(primitive: PrimitiveBase, input_names: list[str]) -> tuple:
+        """Returns the dedup key of `primitive` applied to `input_names`."""
+        if primitive.commutative:
+            input_names = sorted(input_names)
+        return Feature.make_id(primitive, input_names)
+
+    @staticmethod
+    def make_id(primitive: PrimitiveBase, inputs: list) -> tuple:
+        """Returns the id of `primitive` applied to `inputs` (ids or names), in order."""
+        args = tuple(primitive.get_args(format_to_string=False))
+        return primitive.name, args, tuple(inputs)
+
+    @property
+    def is_base(self) -> bool:
+        return self.primitive is None
+
+    def __repr__(self):
+        return f"<Feature {self.name!r} depth={self.depth}>"
 
 
 class FeatureCache:
-    def __init__(self, df: pl.LazyFrame):
-        self.root = Node("root")
-        self.cache = {}
+    """Graph of the base columns and the features generated from them. It holds no values:
+    computed columns are cached by :mod:`.column_cache`.
+
+    Args:
+        columns (list[str]): Base columns of the dataframe.
+        max_depth (int, optional): Maximum depth of generated features. If -1, no limit.
+    """
+
+    def __init__(self, columns: list[str], max_depth: int = -1):
+        self.max_depth = max_depth
+        self.base_columns = list(columns)
+        self.cache: dict[str, Feature] = {}
+        self.keys: dict[tuple, Feature] = {}
         self.finalized = False
+        self.clear()
+
+    def __contains__(self, name: str):
+        return name in self.cache
+
+    def __getitem__(self, name: str) -> Feature:
+        return self.cache[name]
+
+    def __len__(self):
+        return len(self.cache) - len(self.base_columns)
+
+    @property
+    def features(self) -> list[Feature]:
+        """Generated features, in the order they were added."""
+        return [f for f in self.cache.values() if not f.is_base]
 
-        for col in df.columns:
-            self.cache[col] = Node(col, parent=self.root)
+    def get(self, primitive: PrimitiveBase, input_names: list[str]) -> Optional[Feature]:
+        """Returns the existing feature for `primitive` applied to `input_names`, if any."""
+        return self.keys.get(Feature.make_key(primitive, input_names))
+
+    def can_stack(self, name: str) -> bool:
+        """Whether a feature can use `name` as an input without exceeding max_depth."""
+        return self.max_depth < 0 or self.cache[name].depth < self.max_depth
+
+    def add(self, name: str, primitive: PrimitiveBase, input_names: list[str], expr: pl.Expr) -> Feature:
+        feature = Feature(name, primitive, [self.cache[col] for col in input_names], expr)
+        if feature.key in self.keys:
+            raise ValueError(f"Feature {name} is a duplicate of {self.keys[feature.key].name}")
+        if name in self.cache:
+            raise ValueError(f"Feature {name} already exists")
+        if 0 <= self.max_depth < feature.depth:
+            raise ValueError(f"Feature {name} exceeds max_depth of {self.max_depth}")
+
+        self.cache[name] = feature
+        self.keys[feature.key] = feature
+        return feature
+
+    def remove(self, names: list[str]):
+        """Removes generated features, which no remaining feature may use as input."""
+        names = set(names)
+        for feature in self.cache.values():
+            if feature.is_base and feature.name in names:
+                raise ValueError(f"Base column {feature.name} can't be removed")
+            if feature.name not in names and any(f.name in names for f in feature.inputs):
+                raise ValueError(f"Feature {feature.name} is stacked on removed features")
+        for name in names:
+            del self.keys[self.cache.pop(name).key]
 
     def clear(self):
-        self.cache = {}
-        self.root = Node("root")
+        self.cache = {col: Feature(col) for col in self.base_columns}
+        self.keys = {f.key: f for f in self.cache.values()}
         self.finalized = False
 
     def render(self):
-        print(RenderTree(self.root))
+        from anytree import Node, RenderTree  # optional, only needed to render
+
+        # anytree nodes have a single parent, so each feature is shown under its deepest input
+        root = Node("root")
+        nodes = {}
+        for feature in self.cache.values():
+            parent = max(feature.inputs, key=lambda f: f.depth) if feature.inputs else None
+            nodes[feature.name] = Node(feature.name, parent=nodes[parent.name] if parent else root)
+        print(RenderTree(root))
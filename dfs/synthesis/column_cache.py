@@ -0,0 +1,230 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import polars as pl
+
+from dfs.utils import instrumentation
+
+_suffix = ".arrow"
+_shared: Optional["MemoryColumnCache"] = None
+_shared_lock = threading.Lock()
+
+
+def fingerprint(df: pl.DataFrame) -> str:
+    """Returns a hash of the content, schema and row order of `df`. Row hashes of polars are
+    only stable within a polars version, which is part of the fingerprint."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{pl.__version__}|{df.height}|{list(df.schema.items())!r}".encode())
+    if df.width:
+        digest.update(memoryview(df.hash_rows().to_numpy()))
+    return digest.hexdigest()
+
+
+def column_key(data_fingerprint: str, feature_id: tuple) -> str:
+    """Returns the key of the column computed by the feature `feature_id` (see
+    :attr:`.Feature.id`) from the data of `data_fingerprint`."""
+    return hashlib.blake2b(f"{data_fingerprint}|{feature_id!r}".encode(), digest_size=16).hexdigest()
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _count(self, event: str):
+        setattr(self, event, getattr(self, event) + 1)
+        instrumentation.count(f"column_cache_{event}")
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+class ColumnCache(_Counters):
+    """Content-addressed cache of feature columns on disk, shared by every run and process
+    using the same `directory`.
+
+    Each column is stored in an uncompressed Arrow IPC file named after its key (see
+    :func:`column_key`), so it is read back by memory-mapping the file, without copying.
+    Files are written to a temporary name and renamed, so concurrent writers never expose a
+    partial file. Reading a column marks its file as recently used, and :meth:`evict` removes
+    the least recently used files until the cache fits in `max_bytes`.
+
+    Args:
+        directory (str): Directory of the cache, created if needed.
+        max_bytes (int, optional): Size of the cache. If None, nothing is evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        super().__init__()
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _suffix)
+
+    def __contains__(self, key: str):
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[pl.Series]:
+        """Returns the column stored under `key`, memory-mapped, or None."""
+        path = self._path(key)
+        try:
+            series = pl.read_ipc(path, memory_map=True, rechunk=False).to_series()
+            os.utime(path)
+        except (OSError, pl.exceptions.ComputeError):  # missing, evicted meanwhile or corrupt
+            self._count("misses")
+            return None
+        self._count("hits")
+        return series
+
+    def put(self, key: str, series: pl.Series):
+        """Stores `series` under `key`. Call :meth:`evict` after storing a batch of columns."""
+        fd, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                series.to_frame().write_ipc(f, compression="uncompressed")
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self._count("writes")
+
+    def size(self) -> int:
+        """Returns the total size of the stored columns in bytes."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(_suffix)]
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Removes the least recently used columns until the cache fits in `max_bytes`
+        (default: the `max_bytes` of the cache) and returns how many were removed."""
+        max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+        if max_bytes is None:
+            return 0
+        files = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:  # removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)  # a memory-mapped column stays readable until it is released
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def clear(self):
+        self.evict(0)
+
+
+class MemoryColumnCache(_Counters):
+    """Content-addressed cache of feature columns in memory, with the interface of
+    :class:`ColumnCache`, to reuse the features computed by every feature synthesis of the
+    process over the same data, e.g. in a notebook or a hyperparameter sweep. See
+    :func:`shared_memory_cache` for the cache of the process.
+
+    Columns are kept as they were computed: polars copies a column before modifying it, so
+    the cached columns are shared with the results, which use no more memory while they are
+    alive. Storing a column evicts the least recently used ones until the cache fits in
+    `max_bytes` (from ``Series.estimated_size``).
+
+    Args:
+        max_bytes (int, optional): Size of the cache. If None, nothing is evicted.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = 1 << 30):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.columns: OrderedDict[str, pl.Series] = OrderedDict()
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str):
+        return key in self.columns
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, key: str) -> Optional[pl.Series]:
+        with self._lock:
+            series = self.columns.get(key)
+            if series is None:
+                self._count("misses")
+                return None
+            self.columns.move_to_end(key)
+            self._count("hits")
+            return series
+
+    def put(self, key: str, series: pl.Series):
+        with self._lock:
+            previous = self.columns.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.estimated_size()
+            self.columns[key] = series
+            self.bytes += series.estimated_size()
+            self._count("writes")
+            self._evict(self.max_bytes)
+
+    def size(self) -> int:
+        return self.bytes
+
+    def _evict(self, max_bytes: Optional[int]) -> int:
+        removed = 0
+        while max_bytes is not None and self.bytes > max_bytes and self.columns:
+            _, series = self.columns.popitem(last=False)
+            self.bytes -= series.estimated_size()
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Removes the least recently used columns until the cache fits in `max_bytes`
+        (default: the `max_bytes` of the cache) and returns how many were removed."""
+        with self._lock:
+            return self._evict(max_bytes if max_bytes is not None else self.max_bytes)
+
+    def clear(self):
+        self.evict(0)
+
+
+def shared_memory_cache(max_bytes: Optional[int] = None) -> MemoryColumnCache:
+    """Returns the :class:`MemoryColumnCache` of the process, created on first use (with a
+    size of 1 GiB unless `max_bytes` is given), so that every feature synthesis can reuse
+    the features of the others::
+
+        dfs.run(column_cache=shared_memory_cache())
+
+    If `max_bytes` is given, the cache is resized to it."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MemoryColumnCache() if max_bytes is None else MemoryColumnCache(max_bytes)
+        elif max_bytes is not None:
+            _shared.max_bytes = max_bytes
+            _shared.evict()
+    return _shared
@@ -0,0 +1,151 @@
+from typing import Optional
+
+import polars as pl
+
+from dfs.primitives import AggregationPrimitive, PrimitiveBase, TransformPrimitive
+from dfs.synthesis.schema import SchemaIndex
+
+_probe = "__dfs_cost_probe"
+
+_dtype_bytes = {
+    pl.Boolean: 1 / 8,
+    pl.Int8: 1, pl.UInt8: 1, pl.Int16: 2, pl.UInt16: 2,
+    pl.Int32: 4, pl.UInt32: 4, pl.Float32: 4, pl.Date: 4, pl.Categorical: 4,
+}
+
+
+def dtype_bytes(dtype: pl.PolarsDataType) -> float:
+    """Estimated bytes per row of a column of `dtype`, including its validity bitmap.
+    Variable-width types are counted as 8 bytes (an offset and a few bytes of data)."""
+    return _dtype_bytes.get(dtype.base_type(), 8) + 1 / 8
+
+
+def is_windowed(primitive: PrimitiveBase, grouped: bool) -> bool:
+    """True if the feature of `primitive` is evaluated per group with a window, which
+    shuffles the rows of every group and dominates the cost of cheap primitives."""
+    return grouped and isinstance(primitive, TransformPrimitive) and primitive.use_full_dataframe
+
+
+def _profile(lf: pl.LazyFrame, repeat: int) -> float:
+    """Fastest time, in seconds, of the nodes of `lf` over `repeat` runs, excluding the
+    query optimization."""
+    best = float("inf")
+    for _ in range(repeat):
+        _, timings = lf.profile()
+        timings = timings.filter(pl.col("node") != "optimization")
+        best = min(best, (timings["end"] - timings["start"]).sum() / 1e6)
+    return best
+
+
+class CostModel:
+    """Estimates the time and memory of computing features, to fit feature generation in a
+    budget.
+
+    The time of a feature is its primitive's relative cost, times `seconds_per_row`, times
+    the number of rows. Windowed features (see :func:`is_windowed`) cost `window_cost` more.
+    Costs default to the :attr:`.PrimitiveBase.cost` declared by each primitive, and
+    :meth:`calibrate` learns them for a dataframe from ``LazyFrame.profile()`` timings.
+
+    Args:
+        costs (dict[type, float], optional): Relative cost by primitive class, overriding
+            the declared costs, e.g. from a previous :meth:`calibrate`.
+        seconds_per_row (float): Time per row of an element-wise operation of cost 1.
+        window_cost (float): Extra relative cost of a windowed feature.
+    """
+
+    def __init__(self, costs: dict[type, float] = None, seconds_per_row: float = 5e-9, window_cost: float = 12.0):
+        self.costs: dict[type, float] = dict(costs or {})
+        self.seconds_per_row = seconds_per_row
+        self.window_cost = window_cost
+
+    def cost(self, primitive: PrimitiveBase, grouped: bool = False) -> float:
+        """Relative cost of a feature of `primitive`. Learned costs already include the
+        window, if any."""
+        if type(primitive) in self.costs:
+            return self.costs[type(primitive)]
+        return primitive.cost + (self.window_cost if is_windowed(primitive, grouped) else 0)
+
+    def seconds(self, primitive: PrimitiveBase, rows: int, grouped: bool = False) -> float:
+        return self.cost(primitive, grouped) * self.seconds_per_row * rows
+
+    @staticmethod
+    def bytes(dtype: pl.PolarsDataType, rows: int) -> float:
+        return dtype_bytes(dtype) * rows
+
+    def calibrate(self, df: pl.DataFrame, primitives: list[PrimitiveBase], group_cols: list[str] = None,
+                  repeat: int = 3) -> "CostModel":
+        """Learns the cost of every primitive in `primitives` on (a sample of) `df`.
+
+        Each primitive is profiled on the first base columns matching its input types,
+        windowed over `group_cols` if it would be, and aggregations in a ``group_by``. Its
+        cost is its time relative to materializing an integer column, which also gives
+        `seconds_per_row`. Primitives without matching columns keep their declared cost.
+        """
+        group_cols = group_cols or []
+        baseline = _profile(df.lazy().with_columns(pl.int_range(0, pl.len()).alias(_probe)), repeat)
+        if not df.height or baseline <= 0:
+            return self
+        self.seconds_per_row = baseline / df.height
+
+        schema = SchemaIndex(df.schema, exclude=group_cols)
+        for primitive in primitives:
+            inputs = self._first_inputs(primitive, schema)
+            if inputs is None:
+                continue
+            expr = primitive.get_expr(schema.frame(inputs), inputs, []).alias(_probe)
+            if isinstance(primitive, AggregationPrimitive):
+                if not group_cols:
+                    continue
+                lf = df.lazy().group_by(group_cols).agg(expr)
+            else:
+                lf = df.lazy().with_columns(expr.over(group_cols) if is_windowed(primitive, bool(group_cols)) else expr)
+            try:
+                self.costs[type(primitive)] = _profile(lf, repeat) / baseline
+            except pl.exceptions.PolarsError:  # e.g. negating an unsigned integer
+                continue
+        return self
+
+    @staticmethod
+    def _first_inputs(primitive: PrimitiveBase, schema: SchemaIndex) -> Optional[list[str]]:
+        input_types = primitive.input_types
+        for input_type in (input_types if isinstance(input_types, list) else [input_types]):
+            inputs = []
+            for selector in (input_type if isinstance(input_type, tuple) else (input_type,)):
+                col = next((c for c in schema.candidates(selector) if c not in inputs), None)
+                if col is None:
+                    break
+                inputs.append(col)
+            else:
+                return inputs
+        return None
+
+
+class Budget:
+    """Time and memory left to generate features, charged with the estimates of a
+    :class:`CostModel` as features are added. A limit of None is unlimited."""
+
+    def __init__(self, cost_model: CostModel, rows: int, grouped: bool, seconds: float = None,
+                 memory_bytes: float = None):
+        self.cost_model = cost_model
+        self.rows = rows
+        self.grouped = grouped
+        self.seconds = seconds
+        self.memory_bytes = memory_bytes
+        self.spent_seconds = 0.0
+        self.spent_bytes = 0.0
+
+    def fits(self, seconds: float, memory_bytes: float = 0) -> bool:
+        return ((self.seconds is None or self.spent_seconds + seconds <= self.seconds)
+                and (self.memory_bytes is None or self.spent_bytes + memory_bytes <= self.memory_bytes))
+
+    def feature_seconds(self, primitive: PrimitiveBase) -> float:
+        return self.cost_model.seconds(primitive, self.rows, self.grouped)
+
+    def charge(self, primitive: PrimitiveBase, dtype: pl.PolarsDataType) -> bool:
+        """Spends the estimated time and memory of a feature, if they fit."""
+        seconds, memory_bytes = self.feature_seconds(primitive), self.cost_model.bytes(dtype, self.rows)
+        if not self.fits(seconds, memory_bytes):
+            return False
+        self.spent_seconds += seconds
+        self.spent_bytes += memory_bytes
+        return True
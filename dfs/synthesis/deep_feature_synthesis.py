@@ -1,12 +1,32 @@
+import concurrent.futures
+import itertools
+import json
+import math
+import os
 import random
 import re
-from typing import Union, Optional
+import time
+import warnings
+from typing import TYPE_CHECKING, Iterator, Union, Optional
 
 import polars as pl
 
 from dfs import primitives
-from dfs.primitives import TransformPrimitive
+from dfs.primitives import AggregationPrimitive, PrimitiveBase, TransformPrimitive, registry
 from dfs.synthesis.cache import FeatureCache
+from dfs.synthesis import parallel
+from dfs.synthesis.column_cache import ColumnCache, MemoryColumnCache, column_key, fingerprint
+from dfs.synthesis.costs import Budget, CostModel
+from dfs.synthesis.entityset import EntitySet
+from dfs.synthesis.feature_set import FeatureSet
+from dfs.synthesis.plan import FeaturePlan
+from dfs.synthesis.schema import SchemaIndex
+from dfs.utils import instrumentation
+
+if TYPE_CHECKING:  # pruning and sketches import NumPy, which is slow to import
+    from dfs.synthesis.sketches import FeatureProfile
+
+_sink_formats = {"parquet", "ipc"}
 
 camel_case_pattern = re.compile(r'(?<!^)(?=[A-Z])')
 
@@ -36,20 +56,56 @@ def check_transform_primitive(primitive, is_group: bool, transform_primitive_dic
     return primitive
 
 
+def check_aggregation_primitive(primitive, aggregation_primitive_dict):
+    if isinstance(primitive, str):
+        prim_string = _to_snake_case(primitive)
+        if prim_string not in aggregation_primitive_dict:
+            raise ValueError(
+                f"Unknown aggregation primitive {prim_string}. "
+                "Call ft.primitives.list_primitives() to get a list of available primitives"
+            )
+        primitive = aggregation_primitive_dict[prim_string]
+    if isinstance(primitive, type):
+        primitive = primitive()
+    if not isinstance(primitive, AggregationPrimitive):
+        raise ValueError(f"Primitive {type(primitive)} in agg_primitives is not an aggregation primitive")
+    return primitive
+
+
 class DeepFeatureSynthesis:
     """Automatically produce features for a dataframe.
 
     Args:
-        dataframe (Union[pl.DataFrame, pl.LazyFrame]): Dataframe for which to build features.
+        dataframe (Union[pl.DataFrame, pl.LazyFrame, EntitySet]): Dataframe for which to build
+            features. If an :class:`.EntitySet`, features are built for its
+            `target_dataframe_name` dataframe, extended with the relationship features of
+            :meth:`.EntitySet.features` (aggregations of its children with `agg_primitives`
+            and columns of its parents, up to `relationship_depth` relationships away). They
+            are treated as base columns, so transform features stack on them. The index and
+            relationship keys of the target are kept in the output but never used as inputs.
 
         trans_primitives (list[str or :class:`.primitives.TransformPrimitive`], optional):
             list of Transform primitives to use.
 
             Default: ["day", "year", "month", "weekday"]
 
+        agg_primitives (list[str or :class:`.primitives.AggregationPrimitive`], optional):
+            list of Aggregation primitives to apply to the base columns per group of
+            `group_cols`, which are required unless `dataframe` is an entity set. Every row
+            gets the value of its group. All aggregations are computed in a single
+            ``group_by(...).agg`` joined back once, and other features can stack on them.
+
+        target_dataframe_name (str, optional): Dataframe of the entity set to build
+            features for. Required if `dataframe` is an :class:`.EntitySet`.
+
         max_depth (int, optional) : maximum allowed depth of features.
             Default: 2. If -1, no limit.
 
+        relationship_depth (int, optional): Maximum number of relationships crossed by the
+            relationship features of an entity set, independently of `max_depth`, which
+            limits the transforms stacked on them. If -1, no limit.
+            Default: `max_depth`.
+
         max_features (int, optional) : Cap the number of generated features to
             this number. If -1, no limit.
 
@@ -76,26 +132,89 @@ class DeepFeatureSynthesis:
             ``"ignore_group_by_columns"``
                 List of specific columns within each dataframe to blacklist
                 as group_bys (list[str]).
+
+        group_execution (str, optional): How features are evaluated per group of
+            `group_cols`. ``"over"`` windows every feature with ``expr.over(group_cols)``.
+            ``"group_by"`` sorts the frame by `group_cols` once and evaluates all grouped
+            features of a depth in a single ``group_by(...).agg``.
+
+            Default: "over"
+
+        sort_by (str or list[str], optional): Column(s) giving the order of the rows, e.g. a
+            time index. Cumulative, exponential and shifting primitives (``CumSum``,
+            ``Diff``, ``RateOfChange``, ``CumulativeTimeSinceLastTrue``, ...) depend on row
+            order, so the dataframe is sorted by these columns once. Grouped features are
+            evaluated within each group in this order, and are only re-sorted by
+            `group_cols` with ``group_execution="group_by"``, which sorts stably.
+
+        assume_sorted (bool, optional): If True, the dataframe is already sorted by
+            `sort_by`. It is not sorted again, and the first `sort_by` column is flagged as
+            sorted so polars can use its sorted fast paths. The order is not verified.
+
+            Default: False
     """
 
     def __init__(
             self, dataframe: Union[pl.DataFrame, pl.LazyFrame], group_cols: list[str] = None,
             trans_primitives: list = None, max_depth: Optional[int] = 2,
             max_features: Optional[int] = None, ignore_columns: list = None,
-            primitive_options: dict = None
+            primitive_options: dict = None, group_execution: str = "over",
+            sort_by: Union[str, list[str]] = None, assume_sorted: bool = False,
+            agg_primitives: list = None, target_dataframe_name: str = None,
+            relationship_depth: Optional[int] = None,
     ):
-        self.max_depth = max_depth or 0
+        self.max_depth = max_depth if max_depth is not None else -1
         self.max_features = max_features or 10
+
+        aggregation_primitive_dict = registry.LazyPrimitives("aggregation")
+        agg_primitives = sorted([
+            check_aggregation_primitive(p, aggregation_primitive_dict) for p in (agg_primitives or [])
+        ])
+        self._key_columns = []
+        if isinstance(dataframe, EntitySet):
+            if target_dataframe_name is None:
+                raise ValueError("target_dataframe_name is required with an entity set")
+            relationship_depth = self.max_depth if relationship_depth is None else relationship_depth
+            self._key_columns = sorted(dataframe.key_columns(target_dataframe_name))
+            dataframe = dataframe.features(target_dataframe_name, agg_primitives, relationship_depth)
+        elif agg_primitives and not group_cols:
+            raise ValueError("agg_primitives require group_cols")
+        self.agg_primitives = agg_primitives if group_cols else []
+
+        ignore_columns = ignore_columns or []
         for col in ignore_columns:
             if col not in dataframe.columns:
                 raise ValueError(f"Column {col} not found in dataframe")
 
         self.group_cols = group_cols or []
 
-        self.dataframe: pl.LazyFrame = dataframe.lazy().drop(pl.col(col) for col in (ignore_columns or []))
-        self.cache = FeatureCache(self.dataframe)
-
-        transform_primitive_dict = primitives.get_transform_primitives()
+        self.sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+        for col in self.sort_by:
+            if col not in dataframe.columns or col in ignore_columns:
+                raise ValueError(f"Sort column {col} not found in dataframe")
+        if assume_sorted and not self.sort_by:
+            raise ValueError("assume_sorted requires sort_by")
+
+        self.dataframe: pl.LazyFrame = dataframe.lazy().drop(pl.col(col) for col in ignore_columns)
+        self._pending_sort = bool(self.sort_by) and not assume_sorted
+        if assume_sorted:
+            self.dataframe = self.dataframe.with_columns(pl.col(self.sort_by[0]).set_sorted())
+        elif self.sort_by:
+            self.dataframe = self.dataframe.sort(self.sort_by, maintain_order=True)
+        self._base_schema = dict(self.dataframe.schema)
+        self.cache = FeatureCache(list(self._base_schema), self.max_depth)
+
+        # Features are collected into the plan and only applied to `self.dataframe` in `run`.
+        # The schema index tracks the dtypes of base and generated columns, used to draw inputs.
+        self.plan = FeaturePlan(self.group_cols, group_execution)
+        self.schema = self._new_schema_index()
+        self.duplicate_draws = 0
+        self.batch_recomputations_avoided = 0
+        # Estimates the time and memory of features, to fit `build` in a budget
+        self.cost_model = CostModel()
+        self.budget: Optional[Budget] = None
+
+        transform_primitive_dict = registry.LazyPrimitives("transform")
 
         if trans_primitives is None:
             trans_primitives = primitives.get_default_transform_primitives()
@@ -104,49 +223,547 @@ class DeepFeatureSynthesis:
             check_transform_primitive(p, False, transform_primitive_dict) for p in trans_primitives
         ])
 
-    def _select_columns(self, input_type, df: pl.LazyFrame) -> list[str]:
+        # Aggregations only take base columns, whose candidates never change
+        self._base_index = self._new_schema_index()
+
+    def _new_schema_index(self) -> SchemaIndex:
+        exclude = self.group_cols + self._key_columns + [col for col in self._base_schema if not self.cache.can_stack(col)]
+        return SchemaIndex(self._base_schema, exclude=exclude)
+
+    @instrumentation.timed("synthesis")
+    def _select_columns(self, input_type, schema: SchemaIndex = None) -> list[str]:
+        schema = schema or self.schema
         if isinstance(input_type, list):
-            return self._select_columns(random.choice(input_type), df)
-
-        if isinstance(input_type, tuple):
-            cols = []
-            for param_type in input_type:
-                choices = df.select(param_type).columns
-                if not choices:
-                    raise ValueError(f"No columns of type {param_type} found in DataFrame")
-                col = random.choice(choices)
-                cols.append(col)
-                df = df.drop(col)
-            return cols
+            return self._select_columns(random.choice(input_type), schema)
+
+        if not isinstance(input_type, tuple):
+            input_type = (input_type,)
+
+        cols = []
+        for param_type in input_type:
+            choices = schema.candidates(param_type)
+            col = random.choice(choices) if choices else None
+            if col in cols:  # Inputs must be distinct, only filter when the draw collides
+                remaining = [c for c in choices if c not in cols]
+                col = random.choice(remaining) if remaining else None
+            if col is None:
+                raise ValueError(f"No columns of type {param_type} found in DataFrame")
+            cols.append(col)
+        return cols
+
+    @instrumentation.timed("synthesis", "draw")
+    def _build_features(self) -> bool:
+        """Draws a random feature and adds it to the plan.
+
+        Returns False, without building any expression, if the draw has no valid inputs
+        or duplicates an existing feature.
+        """
+        primitives = self.trans_primitives + self.agg_primitives
+        if self.budget is None:
+            primitive: PrimitiveBase = random.choice(primitives)
         else:
-            return random.choice(df.select(input_type).columns)
+            # Favor cheap primitives, to fit more features in the budget
+            seconds = [self.budget.feature_seconds(p) for p in primitives]
+            primitives = [p for p, t in zip(primitives, seconds) if self.budget.fits(t)]
+            if not primitives:
+                return False
+            weights = [1 / max(self.cost_model.cost(p, bool(self.group_cols)), 1e-3) for p in primitives]
+            primitive = random.choices(primitives, weights)[0]
+        input_types = primitive.input_types
+        is_aggregation = isinstance(primitive, AggregationPrimitive)
 
-    def _build_features(self):
-        # Get random feature
+        assert len(input_types) > 0, "Primitive must have at least one input type"
+        try:
+            subset = self._select_columns(input_types, self._base_index if is_aggregation else None)
+        except ValueError:
+            instrumentation.count("draws_without_inputs")
+            return False
+
+        return self._add_feature(primitive, subset)
+
+    @instrumentation.timed("synthesis")
+    def _add_feature(self, trans_primitive: PrimitiveBase, subset: list[str]) -> bool:
+        if self.cache.get(trans_primitive, subset) is not None:
+            self.duplicate_draws += 1
+            instrumentation.count("duplicate_draws")
+            return False
+
+        # The plan applies the window over `group_cols` itself, see FeaturePlan
+        try:
+            expr = trans_primitive.get_expr(self.schema.frame(subset), subset, [])
+        except pl.exceptions.PolarsError:  # inputs the primitive refuses, e.g. comparing bool and datetime
+            return False
+        name = expr.meta.output_name()
+        if name in self.schema:  # Since we are doing DFS, old features shouldn't be overwritten
+            self.duplicate_draws += 1
+            instrumentation.count("duplicate_draws")
+            return False
+
+        try:
+            with instrumentation.span("schema", "resolve_dtype"):
+                dtype = self.schema.frame(subset).select(expr).schema[name]
+        except pl.exceptions.PolarsError:  # e.g. negating an unsigned integer
+            return False
+        if self.budget is not None and not self.budget.charge(trans_primitive, dtype):
+            return False
+
+        self.cache.add(name, trans_primitive, subset, expr)
+        self.schema.add(name, dtype, candidate=self.cache.can_stack(name))
+        if isinstance(trans_primitive, AggregationPrimitive):
+            self.plan.add(name, expr, subset, aggregation=True)
+        else:
+            self.plan.add(name, expr, subset, row_local=not trans_primitive.use_full_dataframe)
+        return True
+
+    def enumerate_candidates(self, depth: int) -> Iterator[tuple[PrimitiveBase, tuple[str, ...]]]:
+        """Yields every valid (primitive, inputs) pair producing a feature of exactly `depth`,
+        given the features generated so far, without building any expression. Aggregations
+        are only candidates at depth 1, as they only take base columns.
+
+        Candidates are yielded in a deterministic order. Commutative primitives whose inputs
+        share a selector only yield each unordered set of inputs once, and candidates which
+        are already in the cache are skipped.
+        """
+        # Snapshot the candidate columns, as adding features extends the index's lists
+        columns = {}
+
+        def candidates(selector):
+            key = id(selector)
+            if key not in columns:
+                columns[key] = [c for c in self.schema.candidates(selector) if self.cache[c].depth < depth]
+            return columns[key]
+
+        seen = set()
+        for trans_primitive in self.trans_primitives + (self.agg_primitives if depth == 1 else []):
+            input_types = trans_primitive.input_types
+            for input_type in (input_types if isinstance(input_types, list) else [input_types]):
+                if not isinstance(input_type, tuple):
+                    input_type = (input_type,)
+
+                choices = [candidates(selector) for selector in input_type]
+                if trans_primitive.commutative and len({repr(selector) for selector in input_type}) == 1:
+                    combos = itertools.combinations(choices[0], len(input_type))
+                else:
+                    combos = itertools.product(*choices)
+
+                for inputs in combos:
+                    if len(set(inputs)) != len(inputs):
+                        continue
+                    if max(self.cache[c].depth for c in inputs) != depth - 1:
+                        continue
+                    if self.cache.get(trans_primitive, list(inputs)) is not None:
+                        continue
+                    if trans_primitive.commutative:  # e.g. (numeric, boolean) input types
+                        key = (id(trans_primitive), frozenset(inputs))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    yield trans_primitive, inputs
+
+    def calibrate_costs(self, sample_size: int = 100_000, repeat: int = 3) -> CostModel:
+        """Learns the relative cost of every primitive on the first `sample_size` rows of the
+        dataframe, see :meth:`.CostModel.calibrate`, for later budgeted builds."""
+        sample = self.dataframe.head(sample_size).collect()
+        return self.cost_model.calibrate(sample, self.trans_primitives + self.agg_primitives, self.group_cols, repeat)
+
+    @instrumentation.timed("synthesis")
+    def build(self, max_attempts: int = 1000, method: str = "random", time_budget_s: float = None,
+              memory_budget_bytes: int = None):
+        """Generates up to `max_features` distinct features.
+
+        Args:
+            max_attempts (int): Number of consecutive draws that may fail (duplicates, or no
+                valid inputs) before giving up on reaching `max_features`. Only used by the
+                ``"random"`` method.
+
+            method (str): ``"random"`` draws primitives and inputs at random. ``"exhaustive"``
+                walks every candidate of :meth:`enumerate_candidates` breadth-first by depth.
+
+            time_budget_s (float, optional): Estimated time to compute the features may not
+                exceed this, see :attr:`cost_model`. Random draws favor cheap primitives
+                (with probability inversely proportional to their cost) and exhaustive
+                builds add the cheapest candidates of each depth first, to fit the most
+                features in the budget.
+
+            memory_budget_bytes (int, optional): Estimated size of the generated feature
+                columns may not exceed this.
+        """
+        if method not in ("random", "exhaustive"):
+            raise ValueError(f"Unknown build method {method}")
+        max_features = self.max_features if self.max_features >= 0 else float("inf")
+        budgeted = time_budget_s is not None or memory_budget_bytes is not None
+        if max_features == float("inf") and self.max_depth < 0 and not budgeted:
+            raise ValueError("One of max_features, max_depth or a budget must be limited")
 
-        trans_primitive: TransformPrimitive = random.choice(self.trans_primitives)
-        input_types = trans_primitive.input_types
+        self.cache.clear()
+        self.plan.clear()
+        self.schema = self._new_schema_index()
+        self.duplicate_draws = 0
+        self.budget = None
+        if budgeted:
+            rows = self.dataframe.select(pl.len()).collect().item()
+            self.budget = Budget(self.cost_model, rows, bool(self.group_cols), time_budget_s, memory_budget_bytes)
+
+        if method == "random":
+            attempts = 0
+            while len(self.plan) < max_features and attempts < max_attempts:
+                attempts = 0 if self._build_features() else attempts + 1
+        else:
+            depth = 1
+            while len(self.plan) < max_features and (self.max_depth < 0 or depth <= self.max_depth):
+                candidates = list(self.enumerate_candidates(depth))
+                if not candidates:
+                    break
+                if self.budget is not None:  # stable, so ties keep the enumeration order
+                    candidates.sort(key=lambda candidate: self.budget.feature_seconds(candidate[0]))
+                for trans_primitive, inputs in candidates:
+                    if len(self.plan) >= max_features:
+                        break
+                    if self.budget is not None and not self.budget.fits(self.budget.feature_seconds(trans_primitive)):
+                        break  # and so are the remaining, costlier candidates
+                    self._add_feature(trans_primitive, list(inputs))
+                depth += 1
+
+        if len(self.plan) < max_features and method == "random" and not budgeted:
+            warnings.warn(f"Only {len(self.plan)} of {self.max_features} features could be generated")
+        self.cache.finalized = True
 
-        assert len(input_types) > 0, "Primitive must have at least one input type"
-        subset = self._select_columns(input_types, self.dataframe.drop(self.group_cols))
+        profiler = instrumentation.active()
+        if profiler is not None:
+            profiler.gauge("features", len(self.plan))
+            profiler.gauge("plan_depth", max(self.plan.depths.values(), default=0))
+
+    def _sample(self, sample_size: int, seed: int) -> pl.LazyFrame:
+        height = self.dataframe.select(pl.len()).collect().item()
+        if height <= sample_size:
+            return self.dataframe
+        if self.plan.is_row_local:
+            key = pl.int_range(pl.len(), dtype=pl.UInt32).hash(seed)
+            return self.dataframe.filter(key % math.ceil(height / sample_size) == 0)
+        if self.group_cols:  # whole groups, so grouped features are exact
+            groups = self.dataframe.select(self.group_cols).unique().collect()
+            groups = groups.sample(max(1, groups.height * sample_size // height), seed=seed)
+            return self.dataframe.join(groups.lazy(), on=self.group_cols, how="semi", join_nulls=True)
+        return self.dataframe.head(sample_size)  # order dependent features are exact on a prefix
+
+    @instrumentation.timed("synthesis")
+    def prune(self, sample_size: int = 10_000, threshold: float = 0.99, seed: int = 0) -> dict[str, str]:
+        """Removes redundant features, found on a sample of rows, before any feature is
+        computed on the full data.
+
+        The features are computed on a sample of about `sample_size` rows, and features
+        which are all null, constant, or correlated with a base column or an earlier
+        feature above `threshold` are removed, see :func:`.find_redundant`. Features which
+        remaining features are stacked on are kept. The sample is a hashed selection of rows
+        if every feature is row-local, of whole groups of `group_cols` otherwise, or the
+        first rows if there are no `group_cols`.
+
+        Returns:
+            dict[str, str]: The reason each removed feature was found redundant.
+        """
+        if not self.cache.finalized:
+            raise ValueError("Features have not been built yet. Call `build` to build features")
 
-        self.dataframe = trans_primitive.apply(self.dataframe, subset, self.group_cols)
+        sample = self.plan.apply(self._sample(sample_size, seed)).collect()
+        references = [col for col in self._base_schema if col not in self.group_cols]
+        from dfs.synthesis.pruning import find_redundant
 
-    def build(self):
-        self.cache.clear()
+        redundant = find_redundant(sample, list(self.plan.exprs), references, threshold)
 
-        # Doesn't take into account of max_depth yet
-        for _ in range(self.max_features):
-            self._build_features()
-        self.cache.finalized = True
+        plan = self.plan.subset([name for name in self.plan.exprs if name not in redundant])
+        redundant = {name: reason for name, reason in redundant.items() if name not in plan}
+        self.cache.remove(list(redundant))
+        self.plan = plan
+        return redundant
+
+    def feature_set(self) -> FeatureSet:
+        """Returns the definitions of the built features, which can be saved and replayed on
+        new data with :meth:`.FeatureSet.transform`."""
+        if not self.cache.finalized:
+            raise ValueError("Features have not been built yet. Call `build` to build features")
+        return FeatureSet.from_cache(
+            self.cache, group_cols=self.group_cols, group_execution=self.plan.group_execution, sort_by=self.sort_by,
+            dtypes=self.schema.dtypes,
+        )
+
+    def reuse_stats(self) -> dict:
+        """Reports the work saved by computing each feature once and referencing it by column.
+
+        Includes the features of :meth:`.FeaturePlan.reuse_stats`, the number of duplicate
+        draws refused by the feature cache, and the number of shared intermediates reused
+        across batches by the last :meth:`iter_column_batches`.
+        """
+        return {
+            **self.plan.reuse_stats(),
+            "duplicates_refused": self.duplicate_draws,
+            "batch_recomputations_avoided": self.batch_recomputations_avoided,
+        }
 
     def render(self):
         if not self.cache.finalized:
             raise ValueError("Features have not been built yet. Call `build` to build features")
         self.cache.render()
 
-    def run(self) -> pl.DataFrame:
+    def run(self, streaming: bool = False, column_cache: Union[ColumnCache, MemoryColumnCache] = None,
+            executor: Union[str, concurrent.futures.Executor] = None, n_workers: int = None) -> pl.DataFrame:
+        """Computes the built features. Within a :class:`.Profiler`, the query is profiled and
+        the time of its nodes recorded.
+
+        Args:
+            streaming (bool): Execute the plan with polars' streaming engine, which processes
+                the input in batches. Operations the engine does not support, such as the
+                window functions used by ``use_full_dataframe`` primitives and ``group_cols``,
+                are executed in memory by polars.
+            column_cache (ColumnCache or MemoryColumnCache, optional): Cache of feature columns
+                on disk or in memory, e.g. :func:`.shared_memory_cache`. The input is collected
+                and fingerprinted, the features computed before from the same data (by any
+                feature synthesis, under any name) are read from the cache, memory-mapped from
+                disk, and only the others are computed, then stored.
+            executor (str or concurrent.futures.Executor, optional): With ``"process"`` or a
+                pool of processes (see :func:`.parallel.process_pool`), the rows are
+                partitioned by a hash of `group_cols` and the partitions evaluated by the
+                processes in parallel, see :func:`.parallel.evaluate`. Without `group_cols`,
+                only plans of row-local features can be partitioned: features of the whole
+                dataframe (``use_full_dataframe``) are evaluated in this process, with a
+                warning.
+            n_workers (int, optional): Number of processes started for ``"process"``, and of
+                partitions. Default: one per CPU.
+        """
         if not self.cache.finalized:
             raise ValueError("Features have not been built yet. Call `build` to build features")
+        if executor is not None and executor != "process" and not isinstance(executor, concurrent.futures.Executor):
+            raise ValueError(f"Unknown executor {executor}, expected 'process' or a concurrent.futures.Executor")
+        if executor is not None and not parallel.can_partition(self.plan):
+            warnings.warn("Features using the whole dataframe can't be partitioned without group_cols, "
+                          "running in a single process")
+            executor = None
+
+        if column_cache is not None:
+            return self._run_cached(column_cache, streaming, executor, n_workers)
+        if executor is not None:
+            return self._evaluate(self.plan, self.dataframe.collect(streaming=streaming), streaming, executor, n_workers)
+        return self._collect(self.plan.apply(self.dataframe), list(self.plan.exprs), streaming)
+
+    def _evaluate(self, plan: FeaturePlan, df: pl.DataFrame, streaming: bool,
+                  executor: Union[str, concurrent.futures.Executor, None], n_workers: Optional[int]) -> pl.DataFrame:
+        if executor is None:
+            return self._collect(plan.apply(df.lazy()), list(plan.exprs), streaming)
+        with instrumentation.span("synthesis", "run", executor="process"):
+            return parallel.evaluate(plan, df, None if executor == "process" else executor, n_workers, streaming)
+
+    @staticmethod
+    def _collect(lf: pl.LazyFrame, features: list[str], streaming: bool) -> pl.DataFrame:
+        profiler = instrumentation.active()
+        if profiler is None or not profiler.profile_queries:
+            return lf.collect(streaming=streaming)
+
+        # Profile the query, to attribute its time to the features, see Profiler
+        with profiler.span("synthesis", "run"):
+            start = time.perf_counter_ns()
+            df, timings = lf.profile(streaming=streaming)
+        profiler.add_query_profile(timings, features, start)
+        return df
+
+    def _feature_id(self, name: str) -> tuple:
+        # Features which are not row-local depend on the groups of the rows
+        feature_id = self.cache[name].id
+        return feature_id if self.plan.row_local[name] else (feature_id, tuple(self.group_cols))
+
+    def _run_cached(self, column_cache: Union[ColumnCache, MemoryColumnCache], streaming: bool,
+                    executor: Union[str, concurrent.futures.Executor, None], n_workers: Optional[int]) -> pl.DataFrame:
+        base = self.dataframe.collect(streaming=streaming)
+        data_fingerprint = fingerprint(base)
+        keys = {name: column_key(data_fingerprint, self._feature_id(name)) for name in self.plan.exprs}
+        columns = {col: base[col] for col in base.columns}
+        for name, key in keys.items():
+            series = column_cache.get(key)
+            if series is not None:
+                columns[name] = series.alias(name)
+
+        missing = [name for name in self.plan.exprs if name not in columns]
+        if missing:
+            plan = self.plan.subset(missing, materialized=set(columns))
+            # Cached features the missing ones are stacked on are read as columns
+            cached_inputs = dict.fromkeys(
+                col for name in plan.exprs for col in plan.inputs[name] if col in keys and col not in plan.exprs
+            )
+            df = base.hstack([columns[col] for col in cached_inputs])
+            computed = self._evaluate(plan, df, streaming, executor, n_workers)
+            for name in missing:
+                columns[name] = computed[name]
+                column_cache.put(keys[name], computed[name])
+            column_cache.evict()
+        return pl.DataFrame([columns[col] for col in base.columns + list(self.plan.exprs)])
+
+    def iter_batches(self, batch_size: int = 100_000, streaming: bool = False) -> Iterator[pl.DataFrame]:
+        """Computes the built features in batches of `batch_size` rows, e.g. to write them to
+        a sink without holding the whole feature matrix in memory::
+
+            for batch in dfs.iter_batches(batch_size=1_000_000):
+                writer.write_table(batch.to_arrow())
+
+        If every feature is row-local (see :class:`.FeaturePlan`), each batch is computed from
+        the matching slice of the input only. Otherwise, as cumulative, exponential, ranking
+        and shifting primitives (``use_full_dataframe = True``) need the whole column, the
+        feature matrix is computed at once, as in :meth:`run`, and then yielded in slices.
+        If `sort_by` is set without `assume_sorted`, the sorted input is collected once.
+        """
+        if not self.cache.finalized:
+            raise ValueError("Features have not been built yet. Call `build` to build features")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        if not self.plan.is_row_local:
+            yield from self.run(streaming=streaming).iter_slices(batch_size)
+            return
+
+        # Slicing a lazy sort would sort the whole input again for every batch
+        df = self.dataframe.collect(streaming=streaming).lazy() if self._pending_sort else self.dataframe
+
+        offset = 0
+        while True:
+            batch = self.plan.apply(df.slice(offset, batch_size)).collect(streaming=streaming)
+            if batch.height:
+                yield batch
+            if batch.height < batch_size:
+                return
+            offset += batch_size
+
+    def profile_features(self, batch_size: int = 100_000, streaming: bool = False,
+                         profile: "FeatureProfile" = None) -> "FeatureProfile":
+        """Computes the null fraction, min/max, mean/variance, approximate distinct count and
+        approximate quantiles of every column of the feature matrix in a single pass over
+        :meth:`iter_batches`, with mergeable sketches (see :class:`.FeatureProfile`).
+
+        Args:
+            batch_size (int): Rows per batch, see :meth:`iter_batches`.
+            streaming (bool): Execute with polars' streaming engine.
+            profile (FeatureProfile, optional): Profile to update, e.g. with custom
+                quantiles or sketch sizes, or with the statistics of other partitions.
+        """
+        from dfs.synthesis.sketches import FeatureProfile
+
+        profile = profile if profile is not None else FeatureProfile()
+        for batch in self.iter_batches(batch_size, streaming=streaming):
+            profile.update(batch)
+        return profile
+
+    def iter_column_batches(self, batch_size: int = 100, streaming: bool = False) -> Iterator[pl.DataFrame]:
+        """Computes the built features in batches of `batch_size` columns, so peak memory
+        scales with the batch width rather than the total number of features.
+
+        The base columns are collected once and kept resident. Each batch computes its
+        features, and the features they are stacked on, from the resident base, and only
+        yields the features of the batch (rows are in the order of the base columns).
+        """
+        if not self.cache.finalized:
+            raise ValueError("Features have not been built yet. Call `build` to build features")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        # Features computed for a batch which later batches stack on are kept resident with
+        # the base columns, so that shared intermediates are computed only once.
+        names = list(self.plan.exprs)
+        batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+        later_inputs: list[set[str]] = [set() for _ in batches]
+        for i in range(len(batches) - 2, -1, -1):
+            later_inputs[i] = later_inputs[i + 1] | set(self.plan.subset(batches[i + 1]).exprs)
+
+        base = self.dataframe.collect(streaming=streaming)
+        materialized: set[str] = set()
+        self.batch_recomputations_avoided = 0
+        for batch, later in zip(batches, later_inputs):
+            plan = self.plan.subset(batch, materialized)
+            self.batch_recomputations_avoided += len(self.plan.subset(batch).exprs) - len(plan.exprs)
+
+            keep = [name for name in plan.exprs if name in later]
+            result = plan.apply(base.lazy()).select(batch + [name for name in keep if name not in batch])
+            result = result.collect(streaming=streaming)
+            if keep:
+                base = base.hstack(result.select(keep))
+                materialized.update(keep)
+            yield result.select(batch)
+
+    @staticmethod
+    def _write(df: pl.DataFrame, path: str, format: str):
+        if format == "parquet":
+            df.write_parquet(path)
+        else:
+            df.write_ipc(path)
+
+    @staticmethod
+    def _sink(lf: pl.LazyFrame, path: str, format: str):
+        try:
+            if format == "parquet":
+                lf.sink_parquet(path)
+            else:
+                lf.sink_ipc(path)
+        except pl.exceptions.InvalidOperationError:
+            # The streaming engine can't sink window functions (group_cols, use_full_dataframe)
+            DeepFeatureSynthesis._write(lf.collect(streaming=True), path, format)
+
+    def _feature_group(self, name: str, split_by: str) -> str:
+        feature = self.cache[name]
+        if split_by == "primitive":
+            return feature.primitive.name
+        return f"depth_{feature.depth}"
+
+    def run_to(self, path: str, format: str = "parquet", split_by: Optional[str] = None,
+               column_batch_size: int = 100) -> Optional[dict]:
+        """Writes the built features straight from the lazy plan to disk, without
+        materializing the feature matrix in memory when polars can stream the plan.
+
+        Args:
+            path (str): Output file or, if `split_by` is set, output directory.
+
+            format (str): ``"parquet"`` or ``"ipc"`` (Arrow IPC).
+
+            split_by (str, optional): Split very wide outputs into several files. With
+                ``"primitive"`` or ``"depth"``, the base columns are written to
+                ``base.<format>`` and the features of each group to ``<group>.<format>``.
+                Every file has the rows in the same order. A ``manifest.json`` listing the
+                files and their columns is written alongside. With ``"batch"``, the features
+                are written in files of `column_batch_size` columns computed by
+                :meth:`iter_column_batches`.
+
+            column_batch_size (int): Number of features per file if `split_by` is ``"batch"``.
+
+        Returns:
+            dict: The manifest, if `split_by` is set.
+        """
+        if not self.cache.finalized:
+            raise ValueError("Features have not been built yet. Call `build` to build features")
+        if format not in _sink_formats:
+            raise ValueError(f"Unknown format {format}, expected one of {sorted(_sink_formats)}")
+        if split_by not in (None, "primitive", "depth", "batch"):
+            raise ValueError(f"Unknown split_by {split_by}, expected 'primitive', 'depth' or 'batch'")
+
+        if split_by is None:
+            self._sink(self.plan.apply(self.dataframe), path, format)
+            return None
+
+        os.makedirs(path, exist_ok=True)
+        manifest = {"format": format, "split_by": split_by, "files": []}
 
-        return self.dataframe.collect()
+        def add_file(group: str, columns: list[str]) -> str:
+            file_name = f"{group}.{format}"
+            manifest["files"].append({"path": file_name, "group": group, "columns": columns})
+            return os.path.join(path, file_name)
+
+        base_columns = list(self._base_schema)
+        self._sink(self.dataframe, add_file("base", base_columns), format)
+
+        if split_by == "batch":
+            for i, batch in enumerate(self.iter_column_batches(column_batch_size, streaming=True)):
+                self._write(batch, add_file(f"batch_{i:04d}", batch.columns), format)
+        else:
+            groups: dict[str, list[str]] = {}
+            for name in self.plan.exprs:
+                groups.setdefault(self._feature_group(name, split_by), []).append(name)
+            for group, columns in groups.items():
+                lf = self.plan.subset(columns).apply(self.dataframe).select(columns)
+                self._sink(lf, add_file(group, columns), format)
+
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
@@ -0,0 +1,242 @@
+import polars as pl
+
+from dfs.primitives import AggregationPrimitive, TFrame
+
+_key = "__dfs_key"
+_parent_row = "__dfs_parent_row"
+
+
+class Relationship:
+    """Declares that every row of `child` belongs to the row of `parent` whose `parent_key`
+    equals its `child_key`. Values of `parent_key` must be unique."""
+
+    def __init__(self, parent: str, parent_key: str, child: str, child_key: str):
+        self.parent = parent
+        self.parent_key = parent_key
+        self.child = child
+        self.child_key = child_key
+
+    def __repr__(self):
+        return f"<Relationship {self.child}.{self.child_key} -> {self.parent}.{self.parent_key}>"
+
+    @property
+    def key(self) -> tuple[str, str, str, str]:
+        return self.parent, self.parent_key, self.child, self.child_key
+
+
+class JoinIndex:
+    """Row mapping between the child and parent dataframes of a relationship, built with a
+    single join and reused by every feature crossing the relationship.
+
+    Keys are joined on their physical codes if both are categoricals under the global string
+    cache, and flagged as sorted when they are, so polars can merge them instead of hashing.
+
+    Args:
+        parent (pl.DataFrame): Parent dataframe.
+        parent_key (str): Unique key of the parent.
+        child (pl.DataFrame): Child dataframe.
+        child_key (str): Column of the child referencing `parent_key`.
+    """
+
+    def __init__(self, parent: pl.DataFrame, parent_key: str, child: pl.DataFrame, child_key: str):
+        parent_keys, child_keys = parent.get_column(parent_key), child.get_column(child_key)
+        if parent_keys.null_count() or parent_keys.n_unique() != parent.height:
+            raise ValueError(f"Parent key {parent_key} must be unique and not null")
+
+        if parent_keys.dtype == child_keys.dtype == pl.Categorical and pl.using_string_cache():
+            parent_keys, child_keys = parent_keys.to_physical(), child_keys.to_physical()
+        elif child_keys.dtype != parent_keys.dtype:
+            child_keys = child_keys.cast(parent_keys.dtype)
+        if parent_keys.is_sorted():
+            parent_keys = parent_keys.set_sorted()
+            if child_keys.is_sorted():
+                child_keys = child_keys.set_sorted()
+
+        keys = pl.DataFrame({_key: parent_keys}).with_row_index(_parent_row)
+        # Parent row of each child row, null for orphans (a left join keeps the child order)
+        self.parent_rows: pl.Series = (
+            pl.DataFrame({_key: child_keys}).join(keys, on=_key, how="left", coalesce=True).get_column(_parent_row)
+        )
+        # Child rows with a parent, grouped by parent row, and the row of each parent in the
+        # result of a group_by over them (null for parents without children)
+        self.order: pl.Series = self.parent_rows.arg_sort().slice(self.parent_rows.null_count())
+        groups = self.parent_rows.gather(self.order).unique(maintain_order=True)
+        self.slots: pl.Series = pl.repeat(None, parent.height, dtype=pl.UInt32, eager=True).scatter(
+            groups, pl.int_range(0, len(groups), dtype=pl.UInt32, eager=True)
+        )
+
+    def gather(self, parent_columns: pl.DataFrame) -> pl.DataFrame:
+        """Returns the values of the parent's columns for every child row."""
+        return parent_columns.select(pl.all().gather(self.parent_rows))
+
+    def aggregate(self, child_columns: pl.DataFrame, exprs: list[pl.Expr]) -> pl.DataFrame:
+        """Evaluates the aggregations `exprs` of the children of every parent row in a
+        single group_by, and returns them aligned to the parent rows."""
+        grouped = (
+            child_columns.select(pl.all().gather(self.order))
+            .with_columns(self.parent_rows.gather(self.order).alias(_parent_row))
+            .group_by(_parent_row, maintain_order=True)
+            .agg(exprs)
+            .drop(_parent_row)
+        )
+        return grouped.select(pl.all().gather(self.slots))
+
+
+class EntitySet:
+    """Collection of dataframes and the parent/child relationships between them.
+
+    :meth:`features` extends a target dataframe with relationship features, which
+    :class:`.DeepFeatureSynthesis` then treats as base columns to stack transforms on:
+
+    * aggregations of the columns of its children, e.g. ``SUM(orders.amount)``, and
+    * columns of its parents, e.g. ``customers.age``.
+
+    Both recurse along relationships up to a depth, so that a customer can get
+    ``MEAN(orders.SUM(items.price))`` or an item ``orders.customers.age``. Every relationship
+    is joined once into a :class:`JoinIndex`, and the features of every dataframe along a path
+    are computed once, so multi-hop features never join the same dataframes again.
+
+    Args:
+        dataframes (dict[str, Union[pl.DataFrame, pl.LazyFrame, tuple]], optional):
+            Dataframes by name, or ``(dataframe, index)`` tuples, see :meth:`add_dataframe`.
+        relationships (list[Relationship or tuple], optional): Relationships, or
+            ``(parent, parent_key, child, child_key)`` tuples.
+    """
+
+    def __init__(self, dataframes: dict[str, TFrame] = None, relationships: list = None):
+        self.dataframes: dict[str, pl.DataFrame] = {}
+        self.index: dict[str, str] = {}
+        self.relationships: list[Relationship] = []
+        self._indexes: dict[tuple, JoinIndex] = {}
+        for name, df in (dataframes or {}).items():
+            self.add_dataframe(name, *(df if isinstance(df, tuple) else (df,)))
+        for relationship in relationships or []:
+            if isinstance(relationship, Relationship):
+                relationship = relationship.key
+            self.add_relationship(*relationship)
+
+    def __getitem__(self, name: str) -> pl.DataFrame:
+        return self.dataframes[name]
+
+    def add_dataframe(self, name: str, df: TFrame, index: str = None) -> "EntitySet":
+        """Adds a dataframe. Lazy frames are collected. The `index` column, if given,
+        identifies the rows and, like relationship keys, is never used in features."""
+        if name in self.dataframes:
+            raise ValueError(f"Dataframe {name} already exists in entity set")
+        if index is not None and index not in df.columns:
+            raise ValueError(f"Column {index} not found in dataframe {name}")
+        self.dataframes[name] = df.collect() if isinstance(df, pl.LazyFrame) else df
+        if index is not None:
+            self.index[name] = index
+        return self
+
+    def add_relationship(self, parent: str, parent_key: str, child: str, child_key: str) -> "EntitySet":
+        for name, key in [(parent, parent_key), (child, child_key)]:
+            if name not in self.dataframes:
+                raise ValueError(f"Dataframe {name} not found in entity set")
+            if key not in self.dataframes[name].columns:
+                raise ValueError(f"Column {key} not found in dataframe {name}")
+        self.relationships.append(Relationship(parent, parent_key, child, child_key))
+        return self
+
+    def children(self, name: str) -> list[Relationship]:
+        return [r for r in self.relationships if r.parent == name]
+
+    def parents(self, name: str) -> list[Relationship]:
+        return [r for r in self.relationships if r.child == name]
+
+    def key_columns(self, name: str) -> set[str]:
+        """Returns the index and relationship key columns of dataframe `name`, which
+        identify rows and are never used in features."""
+        keys = {r.parent_key for r in self.children(name)} | {r.child_key for r in self.parents(name)}
+        return keys | {self.index[name]} if name in self.index else keys
+
+    def join_index(self, relationship: Relationship) -> JoinIndex:
+        """Returns the join index of `relationship`, built on first use."""
+        index = self._indexes.get(relationship.key)
+        if index is None:
+            index = self._indexes[relationship.key] = JoinIndex(
+                self.dataframes[relationship.parent], relationship.parent_key,
+                self.dataframes[relationship.child], relationship.child_key,
+            )
+        return index
+
+    def _path_name(self, relationship: Relationship, name: str) -> str:
+        # Disambiguate several relationships between the same dataframes by the child key
+        pairs = [(r.parent, r.child) for r in self.relationships]
+        if pairs.count((relationship.parent, relationship.child)) > 1:
+            return f"{name}[{relationship.child_key}]"
+        return name
+
+    def features(self, target: str, agg_primitives: list[AggregationPrimitive], max_depth: int = 2) -> pl.DataFrame:
+        """Returns the `target` dataframe with its relationship features.
+
+        Args:
+            target (str): Name of the dataframe to build features for.
+            agg_primitives (list[AggregationPrimitive]): Aggregations applied to the columns
+                of child dataframes. Key columns of relationships are never aggregated.
+            max_depth (int): Maximum number of relationships crossed. If -1, no limit, but
+                a path never visits the same dataframe twice.
+        """
+        if target not in self.dataframes:
+            raise ValueError(f"Dataframe {target} not found in entity set")
+        memo: dict[tuple, pl.DataFrame] = {}
+        return self._features(target, agg_primitives, max_depth, frozenset([target]), memo)
+
+    def _features(self, name: str, agg_primitives: list[AggregationPrimitive], depth: int,
+                  visited: frozenset, memo: dict) -> pl.DataFrame:
+        memo_key = (name, depth, visited)
+        if memo_key in memo:
+            return memo[memo_key]
+
+        df = self.dataframes[name]
+        if depth != 0:
+            new_columns = []
+            for relationship in self.children(name):
+                if relationship.child in visited:
+                    continue
+                child = self._features(relationship.child, agg_primitives, depth - 1,
+                                       visited | {relationship.child}, memo)
+                new_columns.append(self._aggregate(relationship, child, agg_primitives))
+
+            for relationship in self.parents(name):
+                if relationship.parent in visited:
+                    continue
+                parent = self._features(relationship.parent, agg_primitives, depth - 1,
+                                        visited | {relationship.parent}, memo)
+                columns = parent.drop(self.key_columns(relationship.parent))
+                path = self._path_name(relationship, relationship.parent)
+                new_columns.append(self.join_index(relationship).gather(columns).rename(
+                    {col: f"{path}.{col}" for col in columns.columns}
+                ))
+
+            for columns in new_columns:
+                duplicates = set(columns.columns) & set(df.columns)
+                if duplicates:
+                    raise ValueError(f"Relationship features {sorted(duplicates)} of {name} already exist")
+                df = df.hstack(columns.get_columns())
+
+        memo[memo_key] = df
+        return df
+
+    def _aggregate(self, relationship: Relationship, child: pl.DataFrame,
+                   agg_primitives: list[AggregationPrimitive]) -> pl.DataFrame:
+        columns = child.drop(self.key_columns(relationship.child))
+        path = self._path_name(relationship, relationship.child)
+        exprs, defaults = {}, {}
+        for primitive in agg_primitives:
+            if primitive.get_num_inputs() != 1:
+                continue
+            for input_type in primitive.input_types:
+                for col in columns.select(input_type).columns:
+                    name = primitive.get_name([col], path)
+                    if name in exprs:
+                        continue
+                    exprs[name] = primitive.get_expr(columns, [col], []).alias(name)
+                    if primitive.default_value == primitive.default_value:  # not NaN
+                        defaults[name] = primitive.default_value
+
+        if not exprs:
+            return pl.DataFrame()
+        aggregated = self.join_index(relationship).aggregate(columns, list(exprs.values()))
+        return aggregated.with_columns(pl.col(name).fill_null(value) for name, value in defaults.items())
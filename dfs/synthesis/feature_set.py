@@ -0,0 +1,179 @@
+import importlib
+import json
+from typing import Union, Optional
+
+import polars as pl
+
+from dfs.primitives import AggregationPrimitive, PrimitiveBase, TFrame
+from dfs.synthesis.cache import FeatureCache
+from dfs.synthesis.plan import FeaturePlan
+
+
+def _dtype_to_json(dtype: pl.PolarsDataType) -> Union[str, dict]:
+    """Returns the name of `dtype`, or a dict of its name and parameters if it has any, with
+    nested dtypes serialized the same way."""
+    name = dtype.base_type().__name__
+    if isinstance(dtype, type):  # a dtype class has no parameters
+        return name
+    if isinstance(dtype, (pl.List, pl.Array)):
+        data = {"name": name, "inner": _dtype_to_json(dtype.inner)}
+        return {**data, "shape": dtype.size} if isinstance(dtype, pl.Array) else data
+    if isinstance(dtype, pl.Struct):
+        return {"name": name, "fields": [[field.name, _dtype_to_json(field.dtype)] for field in dtype.fields]}
+    if isinstance(dtype, pl.Decimal):
+        return {"name": name, "precision": dtype.precision, "scale": dtype.scale}
+    if isinstance(dtype, pl.Datetime):
+        return {"name": name, "time_unit": dtype.time_unit, "time_zone": dtype.time_zone}
+    if isinstance(dtype, pl.Duration):
+        return {"name": name, "time_unit": dtype.time_unit}
+    if isinstance(dtype, pl.Enum):
+        return {"name": name, "categories": dtype.categories.to_list()}
+    if isinstance(dtype, pl.Categorical):
+        return {"name": name, "ordering": dtype.ordering}
+    return name
+
+
+def _dtype_class(name: str) -> type:
+    dtype = getattr(pl, name, None)
+    if not (isinstance(dtype, type) and issubclass(dtype, pl.DataType)):
+        raise ValueError(f"Unsupported dtype {name}")
+    return dtype
+
+
+def _dtype_from_json(value: Union[str, dict]) -> pl.PolarsDataType:
+    """Inverse of :func:`_dtype_to_json`."""
+    if isinstance(value, str):
+        return _dtype_class(value)
+
+    params = {key: param for key, param in value.items() if key != "name"}
+    if "inner" in params:
+        params["inner"] = _dtype_from_json(params["inner"])
+    if "fields" in params:
+        params["fields"] = [pl.Field(name, _dtype_from_json(dtype)) for name, dtype in params["fields"]]
+    return _dtype_class(value["name"])(**params)
+
+
+class FeatureSet:
+    """Serializable definitions of synthesized features, which can be replayed on new data
+    without searching for features or resolving the schema of the data.
+
+    Each definition is a dict with the feature ``name``, the ``primitive`` class name and its
+    ``module``, the non-default constructor ``args`` of the primitive (see
+    :meth:`.PrimitiveBase.get_args`) and the names of its ``inputs``, which are base columns
+    or features defined earlier in the list.
+
+    Args:
+        features (list[dict]): Feature definitions, in the order they were generated.
+        base_columns (list[str]): Columns of the input dataframe.
+        group_cols (list[str], optional): Columns grouping the rows, see
+            :class:`.DeepFeatureSynthesis`.
+        group_execution (str, optional): How grouped features are evaluated, see
+            :class:`.FeaturePlan`.
+        sort_by (list[str], optional): Columns the input is sorted by before computing
+            features.
+        dtypes (dict[str, Union[str, dict]], optional): Dtype of every base column and
+            feature, as written by :meth:`to_dict`: the name of the dtype, or a dict of its
+            name and parameters, e.g. ``{"name": "List", "inner": "Int64"}``. Some
+            primitives pick their expression from the dtypes of their inputs, e.g.
+            ``MultiplyNumericBoolean``, so feature sets built by
+            :class:`.DeepFeatureSynthesis` always record them.
+    """
+
+    def __init__(self, features: list[dict], base_columns: list[str], group_cols: list[str] = None,
+                 group_execution: str = "over", sort_by: list[str] = None, dtypes: dict = None):
+        self.features = features
+        self.base_columns = base_columns
+        self.group_cols = group_cols or []
+        self.group_execution = group_execution
+        self.sort_by = sort_by or []
+        self.dtypes: dict[str, pl.PolarsDataType] = {
+            col: _dtype_from_json(dtype) if isinstance(dtype, (str, dict)) else dtype
+            for col, dtype in (dtypes or {}).items()
+        }
+        self._primitives: Optional[list[PrimitiveBase]] = None
+
+    def __len__(self):
+        return len(self.features)
+
+    @property
+    def names(self) -> list[str]:
+        return [f["name"] for f in self.features]
+
+    @classmethod
+    def from_cache(cls, cache: FeatureCache, **kwargs) -> "FeatureSet":
+        features = []
+        for feature in cache.features:
+            primitive = feature.primitive
+            features.append({
+                "name": feature.name,
+                "primitive": type(primitive).__name__,
+                "module": type(primitive).__module__,
+                "args": dict(primitive.get_args(format_to_string=False)),
+                "inputs": [f.name for f in feature.inputs],
+            })
+        return cls(features, cache.base_columns, **kwargs)
+
+    def to_dict(self) -> dict:
+        return {
+            "features": self.features,
+            "base_columns": self.base_columns,
+            "group_cols": self.group_cols,
+            "group_execution": self.group_execution,
+            "sort_by": self.sort_by,
+            "dtypes": {col: _dtype_to_json(dtype) for col, dtype in self.dtypes.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureSet":
+        return cls(**data)
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSet":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def primitives(self) -> list[PrimitiveBase]:
+        """The primitive instance of each feature, created on first use."""
+        if self._primitives is None:
+            primitives = []
+            for definition in self.features:
+                primitive_class = getattr(importlib.import_module(definition["module"]), definition["primitive"])
+                primitives.append(primitive_class(**definition["args"]))
+            self._primitives = primitives
+        return self._primitives
+
+    def compile(self) -> FeaturePlan:
+        """Builds the feature plan from the recorded input names and dtypes, without
+        resolving the schema of any data."""
+        plan = FeaturePlan(self.group_cols, self.group_execution)
+        for definition, primitive in zip(self.features, self.primitives):
+            inputs = definition["inputs"]
+            frame = pl.DataFrame(schema={col: self.dtypes.get(col, pl.Null) for col in inputs})
+            expr = primitive.get_expr(frame, inputs, []).alias(definition["name"])
+            if isinstance(primitive, AggregationPrimitive):
+                plan.add(definition["name"], expr, inputs, aggregation=True)
+            else:
+                plan.add(definition["name"], expr, inputs, row_local=not primitive.use_full_dataframe)
+        return plan
+
+    def transform_lazy(self, df: Union[TFrame, pl.LazyFrame], assume_sorted: bool = False) -> pl.LazyFrame:
+        df = df.lazy()
+        if self.sort_by and not assume_sorted:
+            df = df.sort(self.sort_by, maintain_order=True)
+        return self.compile().apply(df)
+
+    def transform(self, df: Union[TFrame, pl.LazyFrame], assume_sorted: bool = False,
+                  streaming: bool = False) -> pl.DataFrame:
+        """Computes the features on `df`, which must have the base columns.
+
+        Args:
+            df (Union[pl.DataFrame, pl.LazyFrame]): Data to compute the features on.
+            assume_sorted (bool): If True, `df` is already sorted by `sort_by`.
+            streaming (bool): Execute with polars' streaming engine.
+        """
+        return self.transform_lazy(df, assume_sorted).collect(streaming=streaming)
@@ -0,0 +1,364 @@
+import math
+from typing import Callable, Optional
+
+import numpy as np
+import polars as pl
+
+from dfs.primitives import (
+    CumCount, CumMax, CumMean, CumMin, CumSum, CumulativeTimeSinceLastFalse, CumulativeTimeSinceLastTrue,
+    ExponentialWeightedAverage, ExponentialWeightedSTD, ExponentialWeightedVariance, TransformPrimitive,
+)
+from dfs.synthesis.feature_set import FeatureSet
+
+_key = "__dfs_key"
+
+# Cumulative handlers take the input expressions, the state before the batch (one expression
+# per field) and a function applying the group window. They return the feature expression
+# and the running state after each row, of which the last row of each group is kept.
+TStateHandler = Callable[[list[pl.Expr], dict[str, pl.Expr], Callable], tuple[pl.Expr, dict[str, pl.Expr]]]
+
+
+def _cum_sum(inputs, prev, over):
+    x, total = inputs[0], prev["sum"].fill_null(0)
+    return total + over(x.cum_sum()), {"sum": total + over(x.fill_null(0).cum_sum())}
+
+
+def _cum_count(inputs, prev, over):
+    count = prev["count"].fill_null(0) + over(inputs[0].is_null().cum_count())
+    return count, {"count": count}
+
+
+def _cum_extreme(name: str):
+    def handler(inputs, prev, over):
+        x = inputs[0]
+        horizontal = pl.max_horizontal if name == "max" else pl.min_horizontal
+        cumulative = x.cum_max() if name == "max" else x.cum_min()
+        value = pl.when(x.is_null()).then(None).otherwise(horizontal(prev[name], over(cumulative)))
+        return value, {name: horizontal(prev[name], over(cumulative.forward_fill()))}
+    return handler
+
+
+def _cum_mean(inputs, prev, over):
+    x, total, count = inputs[0], prev["sum"].fill_null(0), prev["count"].fill_null(0)
+    value = (total + over(x.cum_sum())) / (count + over(x.cum_count()))
+    return value, {"sum": total + over(x.fill_null(0).cum_sum()), "count": count + over(x.cum_count())}
+
+
+def _time_since_last(flag: bool):
+    def handler(inputs, prev, over):
+        time, boolean = inputs
+        last = over(pl.when(boolean.eq(pl.lit(flag))).then(time).otherwise(None).forward_fill())
+        last = last.fill_null(prev["last"])
+        return time.sub(last), {"last": last}
+    return handler
+
+
+_cumulative_handlers: dict[type, tuple[list[str], TStateHandler]] = {
+    CumSum: (["sum"], _cum_sum),
+    CumCount: (["count"], _cum_count),
+    CumMax: (["max"], _cum_extreme("max")),
+    CumMin: (["min"], _cum_extreme("min")),
+    CumMean: (["sum", "count"], _cum_mean),
+    CumulativeTimeSinceLastTrue: (["last"], _time_since_last(True)),
+    CumulativeTimeSinceLastFalse: (["last"], _time_since_last(False)),
+}
+
+_ewm_fields = ["mean", "cov", "sum_wt", "sum_wt2", "old_wt", "count"]
+
+
+def _ewm_alpha(primitive) -> float:
+    if primitive.com is not None:
+        return 1 / (1 + primitive.com)
+    if primitive.span is not None:
+        return 2 / (primitive.span + 1)
+    if primitive.half_life is not None:
+        return 1 - math.exp(-math.log(2) / primitive.half_life)
+    return primitive.alpha
+
+
+def _decayed_sum(value: pl.Expr, decays: pl.Expr, steps: pl.Expr, decay: float, initial: pl.Expr,
+                 over: Callable) -> pl.Expr:
+    """Running ``s = decay * s + value`` per group over the rows where `decays` is set, starting
+    from `initial`. Other rows keep the previous sum, and `steps` counts the decaying rows so
+    far. The sum is computed in closed form from a polars ``ewm_mean``, whose weights are the
+    same powers of `decay`."""
+    factor = pl.lit(decay, dtype=pl.Float64).pow(steps)
+    mean = over(pl.when(decays).then(value).ewm_mean(alpha=1 - decay, adjust=True, ignore_nulls=True))
+    return initial.fill_null(0) * factor + mean.fill_null(0) * (1 - factor) / (1 - decay)
+
+
+class EWMState:
+    """Running state of an exponentially weighted mean and variance, following the
+    recurrences polars uses for ``ewm_mean`` and ``ewm_var``. The arithmetic is done in NumPy
+    float64 like polars, so large values overflow to inf instead of raising."""
+
+    def __init__(self, primitive, mean=None, cov=None, sum_wt=None, sum_wt2=None, old_wt=None, count=None):
+        alpha = _ewm_alpha(primitive)
+        self.adjust = primitive.adjust
+        self.ignore_nulls = True if primitive.ignore_nulls is None else primitive.ignore_nulls
+        self.min_periods = primitive.min_periods
+        self.old_wt_factor = np.float64(1 - alpha)
+        self.new_wt = np.float64(1 if self.adjust else alpha)
+
+        self.mean = None if mean is None else np.float64(mean)
+        self.cov = np.float64(0.0 if cov is None else cov)
+        self.sum_wt = np.float64(1.0 if sum_wt is None else sum_wt)
+        self.sum_wt2 = np.float64(1.0 if sum_wt2 is None else sum_wt2)
+        self.old_wt = np.float64(1.0 if old_wt is None else old_wt)
+        self.count = count or 0
+
+    def fields(self) -> tuple:
+        return self.mean, self.cov, self.sum_wt, self.sum_wt2, self.old_wt, self.count
+
+    def update(self, x: Optional[float]):
+        with np.errstate(over="ignore", invalid="ignore"):
+            self._update(x)
+
+    def _update(self, x: Optional[float]):
+        if x is not None:
+            x = np.float64(x)
+            self.count += 1
+        if self.mean is None:
+            self.mean = x
+            return
+        if x is None and self.ignore_nulls:
+            return
+
+        self.sum_wt *= self.old_wt_factor
+        self.sum_wt2 *= self.old_wt_factor * self.old_wt_factor
+        self.old_wt *= self.old_wt_factor
+        if x is None:
+            return
+
+        old_mean = self.mean
+        if self.mean != x:
+            self.mean = (self.old_wt * old_mean + self.new_wt * x) / (self.old_wt + self.new_wt)
+        self.cov = (
+            self.old_wt * (self.cov + (old_mean - self.mean) ** 2) + self.new_wt * (x - self.mean) ** 2
+        ) / (self.old_wt + self.new_wt)
+        self.sum_wt += self.new_wt
+        self.sum_wt2 += self.new_wt * self.new_wt
+        self.old_wt += self.new_wt
+        if not self.adjust:
+            self.sum_wt /= self.old_wt
+            self.sum_wt2 /= self.old_wt * self.old_wt
+            self.old_wt = np.float64(1.0)
+
+    def value_mean(self) -> Optional[float]:
+        return self.mean if self.count >= self.min_periods else None
+
+    def value_var(self, bias: bool) -> Optional[float]:
+        if self.count < self.min_periods or self.mean is None:
+            return None
+        if bias:
+            return self.cov
+        with np.errstate(over="ignore", invalid="ignore"):
+            numerator = self.sum_wt * self.sum_wt
+            denominator = numerator - self.sum_wt2
+            return numerator / denominator * self.cov if denominator > 0 else 0.0
+
+
+class IncrementalFeatureSet:
+    """Computes the features of a :class:`.FeatureSet` on appended rows only, carrying the
+    state of cumulative and exponentially weighted features per group between calls.
+
+    Row-local features are computed on the new rows directly. ``CumSum``, ``CumCount``,
+    ``CumMax``, ``CumMin``, ``CumMean``, ``CumulativeTimeSinceLastTrue/False`` and the
+    ``ExponentialWeighted*`` features continue from the state left by the previous rows of
+    their group. The cost of :meth:`update` depends on the number of new rows and of groups,
+    not on the length of the history, and the results match a full recompute.
+
+    The state is a DataFrame with one row per group of the ``key`` columns, and one column
+    per field of each stateful feature, listed in ``state_columns`` as ``"<feature>::<field>"``.
+
+    Other ``use_full_dataframe`` primitives, such as ``Percentile`` or ``Diff``, and
+    aggregation primitives need more than a running state and are not supported.
+
+    Args:
+        feature_set (FeatureSet): Features to compute.
+    """
+
+    def __init__(self, feature_set: FeatureSet):
+        for definition, primitive in zip(feature_set.features, feature_set.primitives):
+            if not isinstance(primitive, TransformPrimitive) or (
+                    primitive.use_full_dataframe and not self._is_stateful(primitive)):
+                raise ValueError(f"Feature {definition['name']} can't be updated incrementally")
+
+        self.feature_set = feature_set
+        self.key = feature_set.group_cols or [_key]
+        self.state: Optional[pl.DataFrame] = None
+        self.state_columns = self._state_columns()
+        self._exprs = list(feature_set.compile().exprs.values())
+        self._dtypes: Optional[dict] = None
+
+    @staticmethod
+    def _is_stateful(primitive: TransformPrimitive) -> bool:
+        return type(primitive) in _cumulative_handlers or isinstance(
+            primitive, (ExponentialWeightedAverage, ExponentialWeightedVariance, ExponentialWeightedSTD)
+        )
+
+    def _state_columns(self) -> list[str]:
+        columns = []
+        for definition, primitive in zip(self.feature_set.features, self.feature_set.primitives):
+            if type(primitive) in _cumulative_handlers:
+                fields = _cumulative_handlers[type(primitive)][0]
+            elif self._is_stateful(primitive):
+                fields = _ewm_fields
+            else:
+                continue
+            columns.extend(f"{definition['name']}::{field}" for field in fields)
+        return columns
+
+    def reset(self):
+        self.state = None
+
+    def fit(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Computes the features of the full history `df` and initializes the state."""
+        self.reset()
+        return self.update(df)
+
+    def _update_ewm(self, df: pl.DataFrame, name: str, primitive, column: str) -> pl.DataFrame:
+        alpha = _ewm_alpha(primitive)
+        ignore_nulls = True if primitive.ignore_nulls is None else primitive.ignore_nulls
+        if not primitive.adjust and not ignore_nulls:
+            return self._update_ewm_rows(df, name, primitive, column)
+
+        def over(expr: pl.Expr) -> pl.Expr:
+            return expr.over(self.key)
+
+        # The weights and the weighted sums of values and squared deviations all decay by
+        # the same factor, so they are running sums from which polars' mean and covariance
+        # are ratios. The first observation has weight 1, as in polars.
+        decay = 1 - alpha
+        prev = {field: pl.col(f"{name}::{field}") for field in _ewm_fields}
+        tmp = {field: f"{name}::_{field}" for field in ["observed", "first", "decays", "steps", "weight", "count",
+                                                        "wt", "wt2", "sum", "mean", "spread", "cov_sum"]}
+        observed, first, decays, steps, weight, count, wt, wt2, mean = (pl.col(tmp[field]) for field in [
+            "observed", "first", "decays", "steps", "weight", "count", "wt", "wt2", "mean"])
+        x = pl.col(column).cast(pl.Float64)
+        seen = prev["mean"].is_not_null()
+        old_wt = pl.when(seen).then(prev["old_wt"])
+
+        df = df.with_columns(over(x.cum_count()).alias(tmp["observed"]))
+        df = df.with_columns(
+            (x.is_not_null() & ~seen & observed.eq(1)).alias(tmp["first"]),
+            (x.is_not_null() if ignore_nulls else seen | observed.gt(0)).alias(tmp["decays"]),
+            (prev["count"].fill_null(0) + observed).alias(tmp["count"]),
+        )
+        df = df.with_columns(
+            (observed if ignore_nulls else over(decays.cum_sum())).cast(pl.Float64).alias(tmp["steps"]),
+            pl.when(x.is_null()).then(0.0).when(first).then(1.0).otherwise(1.0 if primitive.adjust else alpha)
+            .alias(tmp["weight"]),
+        )
+        df = df.with_columns(
+            _decayed_sum(weight, decays, steps, decay, old_wt, over).alias(tmp["wt"]),
+            _decayed_sum(weight * weight, decays, steps, decay * decay, pl.when(seen).then(prev["sum_wt2"]), over)
+            .alias(tmp["wt2"]),
+            _decayed_sum(weight * x.fill_null(0), decays, steps, decay, old_wt * prev["mean"], over)
+            .alias(tmp["sum"]),
+        )
+        df = df.with_columns(pl.when(count > 0).then(pl.col(tmp["sum"]) / wt).alias(tmp["mean"]))
+        prev_mean = over(mean.shift(1)).fill_null(prev["mean"])
+        spread = pl.when(x.is_null() | first).then(0.0).otherwise(
+            (wt - weight) * (prev_mean - mean) ** 2 + weight * (x - mean) ** 2)
+        df = df.with_columns(spread.alias(tmp["spread"]))
+        df = df.with_columns(
+            _decayed_sum(pl.col(tmp["spread"]), decays, steps, decay, old_wt * prev["cov"], over)
+            .alias(tmp["cov_sum"]))
+
+        cov = pl.when(mean.is_not_null()).then(pl.col(tmp["cov_sum"]) / wt)
+        if isinstance(primitive, ExponentialWeightedAverage):
+            value = mean
+        else:
+            value = cov
+            if not primitive.bias:
+                denominator = wt * wt - wt2
+                value = pl.when(denominator > 0).then(wt * wt / denominator * cov).otherwise(0.0)
+                value = pl.when(mean.is_not_null()).then(value)
+            if isinstance(primitive, ExponentialWeightedSTD):
+                value = value.sqrt()
+
+        df = df.with_columns(
+            pl.when(count >= primitive.min_periods).then(value).alias(name),
+            mean.alias(f"{name}::mean"),
+            cov.alias(f"{name}::cov"),
+            pl.when(mean.is_not_null()).then(wt).alias(f"{name}::sum_wt"),
+            pl.when(mean.is_not_null()).then(wt2).alias(f"{name}::sum_wt2"),
+            pl.when(mean.is_not_null()).then(wt).alias(f"{name}::old_wt"),
+            count.cast(pl.Float64).alias(f"{name}::count"),
+        )
+        return df.drop(list(tmp.values()))
+
+    def _update_ewm_rows(self, df: pl.DataFrame, name: str, primitive, column: str) -> pl.DataFrame:
+        # Without adjustment, polars renormalizes the weights after every observation, so
+        # the decay between two observations depends on the nulls in between when they
+        # aren't ignored. That recurrence has no closed form and is run row by row.
+        prefix = f"{name}::"
+        keys = df.select(self.key).rows()
+        values = df.get_column(column).to_list()
+        prev = df.select(prefix + field for field in _ewm_fields).rows()
+
+        states: dict[tuple, EWMState] = {}
+        output, running = [], []
+        for key, x, fields in zip(keys, values, prev):
+            state = states.get(key)
+            if state is None:
+                state = states[key] = EWMState(primitive, *fields)
+            state.update(x)
+            if isinstance(primitive, ExponentialWeightedAverage):
+                output.append(state.value_mean())
+            else:
+                var = state.value_var(primitive.bias)
+                output.append(math.sqrt(var) if var is not None and isinstance(primitive, ExponentialWeightedSTD)
+                              else var)
+            running.append(state.fields())
+
+        running = pl.DataFrame(running, schema={prefix + f: pl.Float64 for f in _ewm_fields}, orient="row")
+        return df.with_columns(pl.Series(name, output, dtype=pl.Float64), *running.get_columns())
+
+    def update(self, new_rows: pl.DataFrame) -> pl.DataFrame:
+        """Computes the features of `new_rows`, which follow all rows seen so far, and
+        advances the state.
+
+        Returns:
+            pl.DataFrame: The base columns and features of the new rows, sorted by the
+            feature set's `sort_by`.
+        """
+        feature_set = self.feature_set
+        df = new_rows
+        if feature_set.sort_by:
+            df = df.sort(feature_set.sort_by, maintain_order=True)
+        if self._dtypes is None:
+            self._dtypes = feature_set.transform_lazy(df.clear(), assume_sorted=True).schema
+        if self.key == [_key]:
+            df = df.with_columns(pl.lit(0).alias(_key))
+
+        if self.state is None:
+            df = df.with_columns(pl.lit(None).alias(col) for col in self.state_columns)
+        else:
+            df = df.join(self.state, on=self.key, how="left", join_nulls=True)
+
+        def over(expr: pl.Expr) -> pl.Expr:
+            return expr.over(self.key)
+
+        for definition, primitive, expr in zip(feature_set.features, feature_set.primitives, self._exprs):
+            name, inputs = definition["name"], definition["inputs"]
+            if type(primitive) in _cumulative_handlers:
+                fields, handler = _cumulative_handlers[type(primitive)]
+                prev = {field: pl.col(f"{name}::{field}") for field in fields}
+                value, running = handler([pl.col(col) for col in inputs], prev, over)
+                df = df.with_columns(value.alias(name), *(e.alias(f"{name}::{f}") for f, e in running.items()))
+            elif self._is_stateful(primitive):
+                df = self._update_ewm(df, name, primitive, inputs[0])
+            else:
+                df = df.with_columns(expr)
+            df = df.with_columns(pl.col(name).cast(self._dtypes[name]))
+
+        new_state = df.group_by(self.key).agg(pl.col(self.state_columns).last())
+        if self.state is None:
+            self.state = new_state
+        else:
+            kept = self.state.join(new_state.select(self.key), on=self.key, how="anti", join_nulls=True)
+            self.state = pl.concat([kept, new_state.select(kept.columns)], how="vertical_relaxed")
+
+        return df.select(list(self._dtypes))
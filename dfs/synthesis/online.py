@@ -0,0 +1,271 @@
+import math
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+import polars.selectors as cs
+
+from dfs.primitives import (
+    Absolute, AddNumeric, AddNumericScalar, And, Cosine, CumCount, CumMax, CumMean, CumMin, CumSum,
+    CumulativeTimeSinceLastFalse, CumulativeTimeSinceLastTrue, DivideByFeature, DivideNumeric, DivideNumericScalar,
+    Equal, EqualScalar, ExponentialWeightedAverage, ExponentialWeightedSTD, ExponentialWeightedVariance, GreaterThan,
+    GreaterThanEqualTo, GreaterThanEqualToScalar, GreaterThanScalar, LessThan, LessThanEqualTo,
+    LessThanEqualToScalar, LessThanScalar, ModuloByFeature, ModuloNumeric, ModuloNumericScalar, MultiplyBoolean,
+    MultiplyNumeric, MultiplyNumericBoolean, MultiplyNumericScalar, NaturalLogarithm, Negate, NotEqual,
+    NotEqualScalar, Or, ScalarSubtractNumericFeature, Sine, SquareRoot, SubtractNumeric, SubtractNumericScalar,
+    Tangent, TransformPrimitive,
+)
+from dfs.synthesis.incremental import EWMState, IncrementalFeatureSet
+
+# Row-local kernels take the primitive and its input arrays and return the feature values.
+TKernel = Callable[..., np.ndarray]
+
+
+def _binary(op) -> TKernel:
+    return lambda primitive, x, y: op(x, y)
+
+
+def _scalar(op) -> TKernel:
+    return lambda primitive, x: op(x, primitive.value)
+
+
+def _scalar_left(op) -> TKernel:
+    return lambda primitive, x: op(primitive.value, x)
+
+
+def _unary(op) -> TKernel:
+    return lambda primitive, x: op(x)
+
+
+def _compare(op):
+    def compare(x, y):
+        out = op(x, y).astype(np.float64)
+        out[np.isnan(x) | np.isnan(y)] = np.nan
+        return out
+    return compare
+
+
+def _and(x, y):
+    # Kleene logic, as polars: false wins over null
+    out = np.where(np.isnan(x) | np.isnan(y), np.nan, 1.0)
+    out[(x == 0) | (y == 0)] = 0.0
+    return out
+
+
+def _or(x, y):
+    # Kleene logic, as polars: true wins over null
+    out = np.where(np.isnan(x) | np.isnan(y), np.nan, 0.0)
+    out[((x != 0) & ~np.isnan(x)) | ((y != 0) & ~np.isnan(y))] = 1.0
+    return out
+
+
+_kernels: dict[type, TKernel] = {
+    AddNumeric: _binary(np.add),
+    SubtractNumeric: _binary(np.subtract),
+    MultiplyNumeric: _binary(np.multiply),
+    DivideNumeric: _binary(np.divide),
+    ModuloNumeric: _binary(np.mod),
+    # booleans are 0.0/1.0, so the product doesn't depend on which input is the boolean one
+    MultiplyNumericBoolean: _binary(np.multiply),
+    AddNumericScalar: _scalar(np.add),
+    SubtractNumericScalar: _scalar(np.subtract),
+    MultiplyNumericScalar: _scalar(np.multiply),
+    DivideNumericScalar: _scalar(np.divide),
+    ModuloNumericScalar: _scalar(np.mod),
+    ScalarSubtractNumericFeature: _scalar_left(np.subtract),
+    DivideByFeature: _scalar_left(np.divide),
+    ModuloByFeature: _scalar_left(np.mod),
+    Equal: _binary(_compare(np.equal)),
+    NotEqual: _binary(_compare(np.not_equal)),
+    GreaterThan: _binary(_compare(np.greater)),
+    GreaterThanEqualTo: _binary(_compare(np.greater_equal)),
+    LessThan: _binary(_compare(np.less)),
+    LessThanEqualTo: _binary(_compare(np.less_equal)),
+    EqualScalar: _scalar(_compare(np.equal)),
+    NotEqualScalar: _scalar(_compare(np.not_equal)),
+    GreaterThanScalar: _scalar(_compare(np.greater)),
+    GreaterThanEqualToScalar: _scalar(_compare(np.greater_equal)),
+    LessThanScalar: _scalar(_compare(np.less)),
+    LessThanEqualToScalar: _scalar(_compare(np.less_equal)),
+    And: _binary(_and),
+    Or: _binary(_or),
+    MultiplyBoolean: _binary(_and),
+    Absolute: _unary(np.abs),
+    Cosine: _unary(np.cos),
+    Sine: _unary(np.sin),
+    Tangent: _unary(np.tan),
+    NaturalLogarithm: _unary(np.log),
+    SquareRoot: _unary(np.sqrt),
+    Negate: _unary(np.negative),
+}
+
+# Stateful kernels take the primitive, the input arrays and the state of the entity, as a
+# dict with the fields of the matching handler of :class:`.IncrementalFeatureSet`, which
+# they update in place.
+TStateKernel = Callable[[TransformPrimitive, list[np.ndarray], dict], np.ndarray]
+
+
+def _fill(value: float, fill: float = 0.0) -> float:
+    return fill if math.isnan(value) else value
+
+
+def _cum_sum(primitive, inputs, state):
+    x = inputs[0]
+    running = _fill(state["sum"]) + np.nancumsum(x)
+    state["sum"] = running[-1]
+    return np.where(np.isnan(x), np.nan, running)
+
+
+def _cum_count(primitive, inputs, state):
+    running = _fill(state["count"]) + np.arange(1, len(inputs[0]) + 1)
+    state["count"] = running[-1]
+    return running
+
+
+def _cum_extreme(name: str) -> TStateKernel:
+    accumulate = np.fmax if name == "max" else np.fmin
+
+    def kernel(primitive, inputs, state):
+        x = inputs[0]
+        running = accumulate(state[name], accumulate.accumulate(x))
+        state[name] = running[-1]
+        return np.where(np.isnan(x), np.nan, running)
+    return kernel
+
+
+def _cum_mean(primitive, inputs, state):
+    x = inputs[0]
+    total = _fill(state["sum"]) + np.nancumsum(x)
+    count = _fill(state["count"]) + np.cumsum(~np.isnan(x))
+    state["sum"], state["count"] = total[-1], count[-1]
+    with np.errstate(invalid="ignore"):
+        return np.where(np.isnan(x), np.nan, total / count)
+
+
+def _time_since_last(flag: bool) -> TStateKernel:
+    def kernel(primitive, inputs, state):
+        time, boolean = inputs
+        hit = (boolean == float(flag)) & ~np.isnan(time)
+        index = np.maximum.accumulate(np.where(hit, np.arange(len(time)), -1))
+        last = np.where(index >= 0, time[index], state["last"])
+        state["last"] = last[-1]
+        return time - last
+    return kernel
+
+
+def _ewm(primitive, inputs, state):
+    ewm: EWMState = state["ewm"]
+    out = np.empty(len(inputs[0]))
+    for i, x in enumerate(inputs[0]):
+        ewm.update(None if math.isnan(x) else x)
+        if isinstance(primitive, ExponentialWeightedAverage):
+            value = ewm.value_mean()
+        else:
+            value = ewm.value_var(primitive.bias)
+            if value is not None and isinstance(primitive, ExponentialWeightedSTD):
+                value = math.sqrt(value)
+        out[i] = np.nan if value is None else value
+    return out
+
+
+_state_kernels: dict[type, TStateKernel] = {
+    CumSum: _cum_sum,
+    CumCount: _cum_count,
+    CumMax: _cum_extreme("max"),
+    CumMin: _cum_extreme("min"),
+    CumMean: _cum_mean,
+    CumulativeTimeSinceLastTrue: _time_since_last(True),
+    CumulativeTimeSinceLastFalse: _time_since_last(False),
+    ExponentialWeightedAverage: _ewm,
+    ExponentialWeightedVariance: _ewm,
+    ExponentialWeightedSTD: _ewm,
+}
+
+
+class OnlineScorer:
+    """Computes the features of an :class:`.IncrementalFeatureSet` for a few new rows of
+    a single entity, with NumPy kernels instead of polars queries.
+
+    Every feature is compiled once to a NumPy function, and the state of every entity is
+    copied from the incremental feature set into a dict keyed by the values of its
+    `group_cols`. Scoring looks up the entity state, runs the kernels in feature order and
+    advances the state, so its cost only depends on the number of features and new rows.
+    The incremental feature set itself is not modified.
+
+    Values are float64 arrays in which NaN stands for a missing value. Booleans are 0.0 or
+    1.0, and datetimes and durations are numbers in the unit of the column dtype (as given by
+    ``Series.to_physical``). A NaN computed by a primitive, e.g. the square root of a
+    negative number, is also treated as missing, while polars keeps it as a value. Rows must
+    be passed in `sort_by` order. Features whose primitive
+    has no NumPy kernel, e.g. ``Diff`` or ``Percentile``, are not supported.
+
+    Args:
+        incremental (IncrementalFeatureSet): Features to compute, usually fitted on the
+            history with :meth:`.IncrementalFeatureSet.fit`. Entities not in its state start
+            from an empty state.
+    """
+
+    def __init__(self, incremental: IncrementalFeatureSet):
+        feature_set = incremental.feature_set
+        self.features: list[tuple[str, TransformPrimitive, list[str]]] = []
+        for definition, primitive in zip(feature_set.features, feature_set.primitives):
+            if type(primitive) not in _kernels and type(primitive) not in _state_kernels:
+                raise ValueError(f"Feature {definition['name']} can't be computed online")
+            self.features.append((definition["name"], primitive, definition["inputs"]))
+
+        self.group_cols = feature_set.group_cols
+        self.inputs = [col for col in feature_set.base_columns
+                       if any(col in inputs for _, _, inputs in self.features)]
+        self._fields = {name: [c[len(name) + 2:] for c in incremental.state_columns if c.startswith(name + "::")]
+                        for name, primitive, _ in self.features if type(primitive) in _state_kernels}
+        self.state: dict[tuple, dict[str, dict]] = {}
+        if incremental.state is not None:
+            state = incremental.state.with_columns(cs.temporal().to_physical())
+            for row in state.iter_rows(named=True):
+                key = tuple(row[col] for col in incremental.key)
+                self.state[key] = self._entity_state({
+                    name: {field: row[f"{name}::{field}"] for field in fields} for name, fields in self._fields.items()
+                })
+
+    def _entity_state(self, fields: Optional[dict[str, dict]] = None) -> dict[str, dict]:
+        state = {}
+        for name, primitive, _ in self.features:
+            if name not in self._fields:
+                continue
+            values = fields[name] if fields else {}
+            if isinstance(primitive, (ExponentialWeightedAverage, ExponentialWeightedVariance,
+                                      ExponentialWeightedSTD)):
+                state[name] = {"ewm": EWMState(primitive, **values)}
+            else:
+                state[name] = {f: np.nan if values.get(f) is None else float(values[f]) for f in self._fields[name]}
+        return state
+
+    def score(self, key: Hashable, rows: dict) -> dict[str, np.ndarray]:
+        """Computes the features of `rows`, which follow all rows seen so far for the entity
+        `key`, and advances its state.
+
+        Args:
+            key: Value of the group column of the entity, or a tuple of values if there are
+                several. Ignored if the feature set has no `group_cols`.
+            rows (dict): Array of each base column used by the features.
+
+        Returns:
+            dict[str, np.ndarray]: The values of each feature.
+        """
+        if not self.group_cols:
+            key = (0,)
+        elif not isinstance(key, tuple):
+            key = (key,)
+        state = self.state.get(key)
+        if state is None:
+            state = self.state[key] = self._entity_state()
+
+        values = {col: np.asarray(rows[col], dtype=np.float64) for col in self.inputs}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name, primitive, inputs in self.features:
+                arrays = [values[col] for col in inputs]
+                kernel = _kernels.get(type(primitive))
+                if kernel is not None:
+                    values[name] = kernel(primitive, *arrays)
+                else:
+                    values[name] = _state_kernels[type(primitive)](primitive, arrays, state[name])
+        return {name: values[name] for name, _, _ in self.features}
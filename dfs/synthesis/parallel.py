@@ -0,0 +1,113 @@
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+import polars as pl
+
+from dfs.synthesis.plan import FeaturePlan
+
+_partition = "__dfs_partition"
+_partition_row = "__dfs_partition_row"
+_hash_seed = 0x5EED
+# Partitions are exchanged through files in shared memory where available
+_shared_memory = "/dev/shm"
+
+
+def can_partition(plan: FeaturePlan) -> bool:
+    """Whether `plan` can be evaluated on partitions of the rows independently: if its
+    features are grouped by `group_cols`, which are never split, or are all row-local."""
+    return bool(plan.group_cols) or plan.is_row_local
+
+
+def process_pool(n_workers: int = None) -> concurrent.futures.ProcessPoolExecutor:
+    """Returns a pool of `n_workers` processes (default: one per CPU), each limited to its
+    share of the CPUs for the polars thread pool, to reuse across calls of
+    :meth:`.DeepFeatureSynthesis.run`::
+
+        with process_pool(8) as pool:
+            df = dfs.run(executor=pool)
+
+    Workers are spawned rather than forked, as forking a process running the polars thread
+    pool can deadlock. polars reads its thread count when imported, so the workers are
+    started immediately, with ``POLARS_MAX_THREADS`` set in their environment."""
+    cpus = os.cpu_count() or 1
+    n_workers = n_workers or cpus
+    previous = os.environ.get("POLARS_MAX_THREADS")
+    os.environ["POLARS_MAX_THREADS"] = str(max(1, cpus // n_workers))
+    try:
+        pool = concurrent.futures.ProcessPoolExecutor(n_workers, mp_context=multiprocessing.get_context("spawn"))
+        # Processes are spawned on demand, one per submitted task until there are n_workers
+        concurrent.futures.wait([pool.submit(os.getpid) for _ in range(n_workers)])
+    finally:
+        if previous is None:
+            del os.environ["POLARS_MAX_THREADS"]
+        else:
+            os.environ["POLARS_MAX_THREADS"] = previous
+    return pool
+
+
+def _evaluate_partition(plan: bytes, path: str, streaming: bool) -> str:
+    df = pl.read_ipc(path, memory_map=True, rechunk=False)
+    result = pickle.loads(plan).apply(df.lazy()).collect(streaming=streaming)
+    result.write_ipc(path + ".out", compression="uncompressed")
+    return path + ".out"
+
+
+def _partitions(df: pl.DataFrame, plan: FeaturePlan, n: int) -> list[pl.DataFrame]:
+    if not plan.group_cols:  # row-local, any slices will do
+        size = math.ceil(df.height / n)
+        return [df.slice(offset, size) for offset in range(0, df.height, size)]
+    key = pl.struct(plan.group_cols).hash(_hash_seed) % n
+    return df.with_columns(key.alias(_partition)).partition_by(_partition, maintain_order=True, include_key=False)
+
+
+def evaluate(plan: FeaturePlan, df: pl.DataFrame, executor: concurrent.futures.Executor = None,
+             n_workers: Optional[int] = None, streaming: bool = False) -> pl.DataFrame:
+    """Evaluates `plan` on `df` with a pool of processes, which must be possible (see
+    :func:`can_partition`), and returns the same frame as ``plan.apply(df)``.
+
+    The rows are split into one partition per worker: by a hash of `group_cols`, so every
+    group is evaluated whole by one worker, or into contiguous slices if the plan is row-local
+    and ungrouped. Partitions and results are exchanged as uncompressed Arrow IPC files in
+    shared memory, memory-mapped by the reader, and the results are put back in the order
+    of the rows of `df`.
+
+    Args:
+        plan (FeaturePlan): Plan to evaluate, pickled to the workers.
+        df (pl.DataFrame): Input of the plan.
+        executor (concurrent.futures.Executor, optional): Pool of processes running the
+            partitions. If None, a :func:`process_pool` of `n_workers` is started and shut
+            down.
+        n_workers (int, optional): Number of partitions. Default: the number of workers of
+            a pool started here, else one per CPU.
+        streaming (bool): Evaluate each partition with polars' streaming engine.
+    """
+    if not can_partition(plan):
+        raise ValueError("Features of the whole dataframe can't be evaluated by partitions without group_cols")
+    if df.height == 0:
+        return plan.apply(df.lazy()).collect(streaming=streaming)
+    n_workers = n_workers or os.cpu_count() or 1
+    if executor is None:
+        with process_pool(n_workers) as pool:
+            return evaluate(plan, df, pool, n_workers, streaming)
+
+    partitions = _partitions(df.with_row_index(_partition_row), plan, n_workers)
+    directory = _shared_memory if os.path.isdir(_shared_memory) else None
+    with tempfile.TemporaryDirectory(prefix="dfs-", dir=directory) as directory:
+        paths = []
+        for i, partition in enumerate(partitions):
+            paths.append(os.path.join(directory, f"partition_{i:04d}.arrow"))
+            partition.write_ipc(paths[-1], compression="uncompressed")
+        del partitions
+
+        payload = pickle.dumps(plan)
+        futures = [executor.submit(_evaluate_partition, payload, path, streaming) for path in paths]
+        results = [pl.read_ipc(future.result(), memory_map=True, rechunk=False) for future in futures]
+        # Gathering the rows copies them out of the files before they are removed
+        result = pl.concat(results, rechunk=False)
+        result = result.sort(_partition_row) if plan.group_cols else result.rechunk()
+        return result.drop(_partition_row)
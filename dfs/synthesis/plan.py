@@ -0,0 +1,181 @@
+import polars as pl
+
+_group_executions = {"over", "group_by"}
+_row_index = "__dfs_row_index"
+
+
+class FeaturePlan:
+    """Ordered collection of synthesized feature expressions.
+
+    Features are not applied to the dataframe as they are generated. Instead, every
+    feature is recorded with its inputs and depth, and the whole plan is emitted as one
+    ``with_columns`` projection per depth when it is applied. A feature of depth ``n``
+    only references base columns or features of depth ``< n``, so each projection can
+    refer to the columns materialized by the previous ones.
+
+    A feature is row-local if its value for a row only depends on that row, i.e. neither it
+    nor any feature it is stacked on uses a primitive with ``use_full_dataframe``. A plan of
+    only row-local features can be evaluated on any slice of rows independently.
+
+    Aggregation features (see :class:`.AggregationPrimitive`) reduce base columns to one
+    value per group of `group_cols`. All of them are evaluated in a single
+    ``group_by(group_cols).agg`` and joined back to the rows with a single join, before the
+    other features, which can stack on them.
+
+    Expressions are stored without their window. If `group_cols` are given, features whose
+    own primitive is not row-local are evaluated per group when the plan is applied, either with
+    ``expr.over(group_cols)`` for every feature (``"over"``), or by sorting the frame by
+    `group_cols` once and evaluating all grouped features of a depth in a single
+    ``group_by(...).agg`` (``"group_by"``). Features with a row-local primitive only read
+    columns already materialized by earlier layers, so they never need a window. Either way
+    the features are emitted after the input columns, in the order they were added.
+    """
+
+    def __init__(self, group_cols: list[str] = None, group_execution: str = "over"):
+        if group_execution not in _group_executions:
+            raise ValueError(f"Unknown group_execution {group_execution}, expected 'over' or 'group_by'")
+        self.group_cols = group_cols or []
+        self.group_execution = group_execution
+        self.exprs: dict[str, pl.Expr] = {}
+        self.inputs: dict[str, list[str]] = {}
+        self.depths: dict[str, int] = {}
+        self.row_local: dict[str, bool] = {}
+        self.windowed: dict[str, bool] = {}
+        self.aggregations: set[str] = set()
+
+    def __len__(self):
+        return len(self.exprs)
+
+    def __contains__(self, name: str):
+        return name in self.exprs
+
+    def add(self, name: str, expr: pl.Expr, inputs: list[str], row_local: bool = False,
+            aggregation: bool = False) -> int:
+        """Adds a feature to the plan and returns its depth. Inputs which are not
+        features of the plan are treated as base columns (depth 0). Aggregations must only
+        have base columns as inputs."""
+        if name in self.exprs:
+            raise ValueError(f"Feature {name} already exists in plan")
+        if aggregation and not self.group_cols:
+            raise ValueError(f"Aggregation {name} requires group_cols")
+        if aggregation and any(col in self.exprs for col in inputs):
+            raise ValueError(f"Aggregation {name} can only use base columns")
+
+        depth = 1 + max((self.depths.get(col, 0) for col in inputs), default=0)
+        self.exprs[name] = expr
+        self.inputs[name] = list(inputs)
+        self.depths[name] = depth
+        self.row_local[name] = not aggregation and row_local and all(self.row_local.get(col, True) for col in inputs)
+        self.windowed[name] = not aggregation and not row_local
+        if aggregation:
+            self.aggregations.add(name)
+        return depth
+
+    def clear(self):
+        self.exprs = {}
+        self.inputs = {}
+        self.depths = {}
+        self.row_local = {}
+        self.windowed = {}
+        self.aggregations = set()
+
+    @property
+    def is_row_local(self) -> bool:
+        return all(self.row_local.values())
+
+    def subset(self, names: list[str], materialized: set[str] = None) -> "FeaturePlan":
+        """Returns the plan restricted to `names` and the features they are stacked on.
+        Features in `materialized` are treated as base columns and are not included."""
+        materialized = materialized or set()
+        required = set()
+        stack = [name for name in names if name in self.exprs and name not in materialized]
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(col for col in self.inputs[name] if col in self.exprs and col not in materialized)
+
+        plan = FeaturePlan(self.group_cols, self.group_execution)
+        for name in self.exprs:
+            if name in required:
+                plan.exprs[name] = self.exprs[name]
+                plan.inputs[name] = self.inputs[name]
+                plan.depths[name] = self.depths[name]
+                plan.row_local[name] = self.row_local[name]
+                plan.windowed[name] = self.windowed[name]
+        plan.aggregations = self.aggregations & required
+        return plan
+
+    def reuse_stats(self) -> dict:
+        """Counts how much work referencing materialized columns saves over inlining.
+
+        If every feature inlined the expressions of its inputs, a feature would be evaluated
+        once for itself plus once per evaluation of each feature using it. Features are
+        instead computed once, so every evaluation beyond the first is avoided.
+        """
+        consumers: dict[str, list[str]] = {name: [] for name in self.exprs}
+        for name, inputs in self.inputs.items():
+            for col in inputs:
+                if col in consumers:
+                    consumers[col].append(name)
+
+        evaluations: dict[str, int] = {}
+        for name in reversed(list(self.exprs)):  # consumers are always added after their inputs
+            evaluations[name] = 1 + sum(evaluations[c] for c in consumers[name])
+
+        return {
+            "features": len(self.exprs),
+            "shared_features": sum(1 for c in consumers.values() if c),
+            "references": sum(len(c) for c in consumers.values()),
+            "recomputations_avoided": sum(n - 1 for n in evaluations.values()),
+        }
+
+    def _is_grouped(self, name: str) -> bool:
+        return bool(self.group_cols) and self.windowed[name]
+
+    def _join_aggregations(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        aggregations = [expr for name, expr in self.exprs.items() if name in self.aggregations]
+        if not aggregations:
+            return df
+        aggregated = df.group_by(self.group_cols).agg(aggregations)
+        return df.join(aggregated, on=self.group_cols, how="left", join_nulls=True, coalesce=True)
+
+    def layers(self) -> list[list[pl.Expr]]:
+        """Returns the feature expressions grouped by depth, shallowest first, with the
+        ``over(group_cols)`` window applied where needed. Aggregations are not included."""
+        layers: dict[int, list[pl.Expr]] = {}
+        for name, expr in self.exprs.items():
+            if name in self.aggregations:
+                continue
+            if self._is_grouped(name):
+                expr = expr.over(self.group_cols)
+            layers.setdefault(self.depths[name], []).append(expr)
+        return [layers[depth] for depth in sorted(layers)]
+
+    def _apply_group_by(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        columns = df.columns + list(self.exprs)  # group_by moves the group columns first
+        df = self._join_aggregations(df)
+        df = df.with_row_index(_row_index).sort(self.group_cols, maintain_order=True)
+        for depth in sorted(set(self.depths.values())):
+            names = [name for name, d in self.depths.items() if d == depth and name not in self.aggregations]
+            grouped = [self.exprs[name] for name in names if self._is_grouped(name)]
+            local = [self.exprs[name] for name in names if not self._is_grouped(name)]
+            if grouped:
+                df = (
+                    df.group_by(self.group_cols, maintain_order=True)
+                    .agg(pl.all(), *grouped)
+                    .explode(pl.exclude(self.group_cols))
+                )
+            if local:
+                df = df.with_columns(local)
+        return df.sort(_row_index).select(columns)
+
+    def apply(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        if self.group_execution == "group_by" and any(self._is_grouped(name) for name in self.exprs):
+            return self._apply_group_by(df)
+
+        columns = df.columns + list(self.exprs)
+        df = self._join_aggregations(df)
+        for layer in self.layers():
+            df = df.with_columns(layer)
+        return df.select(columns)
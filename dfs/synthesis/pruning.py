@@ -0,0 +1,75 @@
+import warnings
+
+import numpy as np
+import polars as pl
+
+from dfs.synthesis.schema import is_numeric
+
+
+def find_redundant(sample: pl.DataFrame, candidates: list[str], references: list[str] = None,
+                   threshold: float = 0.99, block_size: int = 256) -> dict[str, str]:
+    """Finds the redundant columns among `candidates` of a sample of rows.
+
+    A candidate is redundant if it is all null, constant, or if the absolute Pearson
+    correlation between it and a reference column or an earlier non-redundant candidate
+    exceeds `threshold`, e.g. ``a - b`` against ``b - a`` or ``-(-(x))`` against ``x``. NaN
+    and infinite values count as nulls, and booleans and temporal values as numbers.
+
+    Correlations are computed from the standardized columns, with nulls at the mean, by one
+    matrix multiply per block of `block_size` candidates against the columns kept before
+    them, so memory scales with `block_size` times the number of columns.
+
+    Returns:
+        dict[str, str]: The reason each redundant candidate was found redundant, in the
+        order of `candidates`.
+    """
+    candidate_set = set(candidates)
+    references = [col for col in (references or []) if col not in candidate_set]
+    redundant: dict[str, str] = {}
+    if not sample.height:
+        return redundant
+
+    schema = sample.schema
+    others = [col for col in candidates if not is_numeric(schema[col])]
+    if others:
+        stats = sample.select(
+            pl.col(others).null_count().name.suffix("::nulls"),
+            pl.col(others).drop_nulls().n_unique().name.suffix("::unique"),
+        )
+        for col in others:
+            if stats[f"{col}::nulls"][0] == sample.height:
+                redundant[col] = "all null"
+            elif stats[f"{col}::unique"][0] <= 1:
+                redundant[col] = "constant"
+
+    columns = [col for col in references + candidates if is_numeric(schema[col])]
+    values = sample.select(pl.col(columns).to_physical().cast(pl.Float64)).to_numpy()
+    values[~np.isfinite(values)] = np.nan
+    with warnings.catch_warnings():  # all null columns
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        mean, std = np.nanmean(values, axis=0), np.nanstd(values, axis=0)
+
+    first = len(columns) - sum(col in candidate_set for col in columns)
+    for j in range(first, len(columns)):
+        if np.isnan(low[j]):
+            redundant[columns[j]] = "all null"
+        elif low[j] == high[j]:
+            redundant[columns[j]] = "constant"
+
+    standardized = np.nan_to_num((values - mean) / np.where(std > 0, std, np.inf)).astype(np.float32)
+    kept = np.array([j < first or columns[j] not in redundant for j in range(len(columns))], dtype=bool)
+    for start in range(first, len(columns), block_size):
+        end = min(start + block_size, len(columns))
+        previous = np.flatnonzero(kept[:end])
+        correlation = standardized[:, start:end].T @ standardized[:, previous] / sample.height
+        for j in range(start, end):
+            if not kept[j]:
+                continue
+            row = correlation[j - start]
+            correlated = previous[(previous < j) & kept[previous] & (np.abs(row) > threshold)]
+            if len(correlated):
+                kept[j] = False
+                redundant[columns[j]] = f"correlated with {columns[correlated[0]]}"
+
+    return {col: redundant[col] for col in candidates if col in redundant}
@@ -0,0 +1,77 @@
+import polars as pl
+
+from dfs.primitives import TInputType
+from dfs.utils import instrumentation
+
+
+def is_numeric(dtype: pl.PolarsDataType) -> bool:
+    """Returns whether the values of `dtype` can be used as numbers: numeric, boolean and
+    temporal dtypes."""
+    return dtype.is_numeric() or dtype == pl.Boolean or dtype.is_temporal()
+
+
+class SchemaIndex:
+    """In-memory index of the columns available to the synthesizer.
+
+    Keeps a column name -> dtype map and, for every selector that has been looked up,
+    the list of columns it matches. Both are updated incrementally when a feature is
+    added, so drawing inputs never has to resolve the schema of the lazy plan.
+
+    Args:
+        schema (dict[str, pl.PolarsDataType]): Columns of the base dataframe.
+        exclude (list[str], optional): Columns which are tracked for their dtype but are
+            never returned as candidates, e.g. group columns.
+    """
+
+    def __init__(self, schema: dict, exclude: list[str] = None):
+        self.dtypes: dict[str, pl.PolarsDataType] = dict(schema)
+        self.exclude = set(exclude or [])
+        # Equal selectors are distinct objects on each primitive, so candidates are keyed by
+        # repr. `_keys` memoizes id(selector) -> (selector, repr), keeping the selector alive.
+        self._keys: dict[int, tuple[TInputType, str]] = {}
+        self._candidates: dict[str, tuple[TInputType, list[str]]] = {}
+
+    def __contains__(self, name: str):
+        return name in self.dtypes
+
+    def __len__(self):
+        return len(self.dtypes)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.dtypes)
+
+    @staticmethod
+    def _match(selector: TInputType, schema: dict) -> list[str]:
+        with instrumentation.span("schema", "match"):
+            return pl.DataFrame(schema=schema).select(selector).columns
+
+    def candidates(self, selector: TInputType) -> list[str]:
+        """Returns the (non-excluded) columns matching `selector`. Do not mutate the result."""
+        key = self._keys.get(id(selector))
+        if key is None:
+            key = self._keys[id(selector)] = (selector, repr(selector))
+
+        entry = self._candidates.get(key[1])
+        if entry is None:
+            schema = {col: dtype for col, dtype in self.dtypes.items() if col not in self.exclude}
+            entry = self._candidates[key[1]] = (selector, self._match(selector, schema))
+        return entry[1]
+
+    def frame(self, columns: list[str]) -> pl.DataFrame:
+        """Returns an empty dataframe with the schema of `columns`."""
+        return pl.DataFrame(schema={col: self.dtypes[col] for col in columns})
+
+    def add(self, name: str, dtype: pl.PolarsDataType, candidate: bool = True):
+        """Adds a column. If `candidate` is False, the column is tracked but never drawn."""
+        if name in self.dtypes:
+            raise ValueError(f"Column {name} already exists in schema")
+
+        self.dtypes[name] = dtype
+        if not candidate:
+            self.exclude.add(name)
+        if name in self.exclude:
+            return
+        for selector, columns in self._candidates.values():
+            if self._match(selector, {name: dtype}):
+                columns.append(name)
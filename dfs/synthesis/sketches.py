@@ -0,0 +1,238 @@
+import copy
+from typing import Optional
+
+import numpy as np
+import polars as pl
+
+from dfs.synthesis.schema import is_numeric
+
+_hash_seed = 0x5EED
+
+
+class Moments:
+    """Count, min, max, mean and sum of squared deviations of a stream of numbers, merged
+    with Chan et al.'s parallel update."""
+
+    def __init__(self):
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        if len(values):
+            other = Moments()
+            other.count, other.min, other.max = len(values), values.min(), values.max()
+            other.mean = values.mean()
+            other.m2 = ((values - other.mean) ** 2).sum()
+            self.merge(other)
+
+    def merge(self, other: "Moments"):
+        count = self.count + other.count
+        if not other.count:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance (one delta degree of freedom)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with ``2 ** precision`` registers, merged by taking the
+    maximum of each register. The relative error is about ``1.04 / sqrt(2 ** precision)``."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        """Adds the 64-bit hashes of the values."""
+        if not len(hashes):
+            return
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # Position of the leftmost 1 in the remaining bits (bits + 1 if they are all 0)
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, bits + 1, bits - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Can't merge HyperLogLog sketches of different precisions")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:  # small range correction (linear counting)
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class KLLSketch:
+    """Quantile sketch keeping at most `k` items per level, in the style of KLL.
+
+    Items of level ``h`` stand for ``2 ** h`` values. When a level is full, it is sorted
+    and every other item, starting at a random offset, is promoted to the next level.
+    Sketches are merged by concatenating their levels and compacting. The rank error
+    is about ``log2(n / k) / k``.
+    """
+
+    def __init__(self, k: int = 256, seed: Optional[int] = None):
+        self.k = k
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._random = np.random.default_rng(seed)
+
+    @property
+    def count(self) -> int:
+        return sum(len(level) << h for h, level in enumerate(self.levels))
+
+    def update(self, values: np.ndarray):
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def merge(self, other: "KLLSketch"):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compact()
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # Keep an odd leftover at this level, so the promoted items pair up exactly
+                leftover = level[-1:] if len(level) % 2 else level[:0]
+                paired = level[:len(level) - len(leftover)]
+                promoted = paired[self._random.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = leftover
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, q: list[float]) -> list[Optional[float]]:
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return [None for _ in q]
+        weights = np.concatenate([np.full(len(level), 1 << h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values)
+        values, ranks = values[order], np.cumsum(weights[order])
+        positions = np.searchsorted(ranks, np.asarray(q) * ranks[-1], side="left")
+        return [float(values[min(i, len(values) - 1)]) for i in positions]
+
+
+class ColumnSketch:
+    """Mergeable statistics of one column: null fraction, min/max, mean/variance, distinct
+    count (:class:`HyperLogLog`) and quantiles (:class:`KLLSketch`). Moments and quantiles
+    are only kept for numeric, boolean and temporal columns (as their physical values), and
+    NaN counts as null."""
+
+    def __init__(self, numeric: bool, precision: int = 12, k: int = 256):
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.moments = Moments()
+        self.distinct = HyperLogLog(precision)
+        self.quantile_sketch = KLLSketch(k)
+
+    def update(self, series: pl.Series):
+        self.rows += len(series)
+        if self.numeric:
+            series = series.to_physical().cast(pl.Float64).fill_nan(None)
+        values = series.drop_nulls()
+        self.nulls += len(series) - len(values)
+        self.distinct.update(values.hash(_hash_seed).to_numpy())
+        if self.numeric:
+            values = values.to_numpy()
+            self.moments.update(values)
+            self.quantile_sketch.update(values)
+
+    def merge(self, other: "ColumnSketch"):
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.moments.merge(other.moments)
+        self.distinct.merge(other.distinct)
+        self.quantile_sketch.merge(other.quantile_sketch)
+
+
+class FeatureProfile:
+    """Mergeable :class:`ColumnSketch` of every column of a feature matrix, updated one
+    batch of rows at a time.
+
+    Profiles of different partitions of the rows, e.g. computed by separate processes,
+    combine with :meth:`merge` into the profile of the whole matrix (up to the
+    approximation of the sketches).
+
+    Args:
+        quantiles (list[float]): Quantiles reported by :meth:`summary`.
+        precision (int): HyperLogLog precision, see :class:`HyperLogLog`.
+        k (int): Items per level of the quantile sketches, see :class:`KLLSketch`.
+    """
+
+    def __init__(self, quantiles: list[float] = (0.01, 0.25, 0.5, 0.75, 0.99), precision: int = 12, k: int = 256):
+        self.quantiles = list(quantiles)
+        self.precision = precision
+        self.k = k
+        self.columns: dict[str, ColumnSketch] = {}
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, name: str) -> ColumnSketch:
+        return self.columns[name]
+
+    def update(self, df: pl.DataFrame):
+        for series in df.get_columns():
+            sketch = self.columns.get(series.name)
+            if sketch is None:
+                sketch = self.columns[series.name] = ColumnSketch(is_numeric(series.dtype), self.precision, self.k)
+            sketch.update(series)
+
+    def merge(self, other: "FeatureProfile") -> "FeatureProfile":
+        """Merges `other` into this profile and returns it. `other` is not modified."""
+        for name, sketch in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(sketch)
+            else:
+                self.columns[name] = copy.deepcopy(sketch)
+        return self
+
+    def summary(self) -> pl.DataFrame:
+        """Returns one row of statistics per column. ``distinct`` is approximate, and so are
+        the ``q<quantile>`` columns."""
+        rows = []
+        for name, sketch in self.columns.items():
+            moments = sketch.moments
+            numeric = sketch.numeric and moments.count > 0
+            row = {
+                "column": name,
+                "rows": sketch.rows,
+                "null_fraction": sketch.nulls / sketch.rows if sketch.rows else None,
+                "min": float(moments.min) if numeric else None,
+                "max": float(moments.max) if numeric else None,
+                "mean": float(moments.mean) if numeric else None,
+                "variance": moments.variance if numeric else None,
+                "distinct": round(sketch.distinct.estimate()),
+            }
+            values = sketch.quantile_sketch.quantiles(self.quantiles)
+            row.update({f"q{q:g}": value for q, value in zip(self.quantiles, values)})
+            rows.append(row)
+
+        schema = {"column": pl.String, "rows": pl.Int64, "null_fraction": pl.Float64, "min": pl.Float64,
+                  "max": pl.Float64, "mean": pl.Float64, "variance": pl.Float64, "distinct": pl.Int64}
+        schema.update({f"q{q:g}": pl.Float64 for q in self.quantiles})
+        return pl.DataFrame(rows, schema=schema, orient="row")
@@ -0,0 +1,281 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+from typing import Callable, Optional
+
+import polars as pl
+
+# Profilers entered and not yet exited, innermost last. Hooks only record into the innermost.
+_profilers: list["Profiler"] = []
+_disabled = contextlib.nullcontext()
+
+
+def active() -> Optional["Profiler"]:
+    """Returns the innermost active :class:`Profiler`, or None."""
+    return _profilers[-1] if _profilers else None
+
+
+def span(category: str, name: str, **args):
+    """Context manager timing a block into the active profiler. Costs one list lookup when
+    no profiler is active, so hooks can stay in hot paths."""
+    if not _profilers:
+        return _disabled
+    return _profilers[-1].span(category, name, **args)
+
+
+def timed(category: str, name: str = None):
+    """Decorator recording every call of the decorated function as a span, named after the
+    function unless `name` is given."""
+
+    def decorator(fn):
+        span_name = name or fn.__name__.lstrip("_")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _profilers:
+                return fn(*args, **kwargs)
+            with _profilers[-1].span(category, span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1):
+    """Increments a counter of the active profiler, if any."""
+    if _profilers:
+        _profilers[-1].count(name, n)
+
+
+class Event:
+    """A finished span. Times are in nanoseconds of ``time.perf_counter_ns``."""
+
+    __slots__ = ("category", "name", "start", "duration", "thread", "args")
+
+    def __init__(self, category: str, name: str, start: int, duration: int, thread: int, args: dict):
+        self.category = category
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.thread = thread
+        self.args = args
+
+    def __repr__(self):
+        return f"<Event {self.category}:{self.name} {self.duration / 1e6:.3f}ms>"
+
+
+class _Span:
+    __slots__ = ("profiler", "category", "name", "args", "start")
+
+    def __init__(self, profiler: "Profiler", category: str, name: str, args: dict):
+        self.profiler = profiler
+        self.category = category
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.profiler._record(Event(self.category, self.name, self.start, end - self.start,
+                                    threading.get_ident(), self.args))
+
+
+class Profiler:
+    """Records where feature synthesis spends its time, while entered as a context manager::
+
+        with Profiler(trace_path="synthesis.trace.json") as profiler:
+            dfs.build()
+            dfs.run()
+        print(profiler.format_report())
+
+    Instrumented code records spans (see :func:`span`), aggregated per category and name:
+
+    * ``primitive``: ``get_expr``, ``_apply``, ``get_name`` and ``get_args`` (only when the
+      cached arguments are computed) of each primitive, with the primitive as argument.
+      ``PrimitiveBase.apply`` goes through ``get_expr``,
+    * ``synthesis``: ``build``, ``draw``, ``select_columns``, ``add_feature``, ``run``, ...
+    * ``schema``: ``match`` (selector resolution of the schema index) and ``resolve_dtype``
+      (polars schema resolution of a new feature),
+
+    and counters and gauges such as ``duplicate_draws`` and ``plan_depth``. If
+    `profile_queries` is True, :meth:`.DeepFeatureSynthesis.run` collects with
+    ``LazyFrame.profile()``, and the time of every node of the query is recorded and
+    attributed to the features it computes (see :meth:`add_query_profile`).
+
+    Args:
+        callbacks (list[Callable[[Event], None]], optional): Called with every finished span.
+        trace_path (str, optional): Writes a Chrome trace (see :meth:`write_chrome_trace`)
+            to this path on exit.
+        keep_events (bool): Keep every span for the trace. If False, only aggregates are kept.
+        profile_queries (bool): Profile the queries of ``run``.
+    """
+
+    def __init__(self, callbacks: list[Callable[[Event], None]] = None, trace_path: str = None,
+                 keep_events: bool = True, profile_queries: bool = True):
+        self.callbacks = list(callbacks or [])
+        self.trace_path = trace_path
+        self.keep_events = keep_events or trace_path is not None
+        self.profile_queries = profile_queries
+        self.events: list[Event] = []
+        self.spans: dict[tuple[str, str], list[int]] = {}  # -> [count, total ns, max ns]
+        self.primitives: dict[tuple[str, str], list[int]] = {}  # (primitive, phase) -> [count, total ns]
+        self.counters: dict[str, int] = {}
+        self.gauges: dict[str, float] = {}
+        self.query_nodes: list[dict] = []
+        self.feature_seconds: dict[str, float] = {}
+        self.start = self.end = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        _profilers.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _profilers.remove(self)
+        self.end = time.perf_counter_ns()
+        if self.trace_path is not None:
+            self.write_chrome_trace(self.trace_path)
+
+    def span(self, category: str, name: str, **args) -> _Span:
+        return _Span(self, category, name, args)
+
+    def _record(self, event: Event):
+        with self._lock:
+            stats = self.spans.get((event.category, event.name))
+            if stats is None:
+                stats = self.spans[(event.category, event.name)] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += event.duration
+            stats[2] = max(stats[2], event.duration)
+            if event.category == "primitive":
+                stats = self.primitives.setdefault((event.args["primitive"], event.name), [0, 0])
+                stats[0] += 1
+                stats[1] += event.duration
+            if self.keep_events:
+                self.events.append(event)
+        for callback in self.callbacks:
+            callback(event)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def add_query_profile(self, timings: pl.DataFrame, features: list[str], start: int = None):
+        """Records the node timings returned by ``LazyFrame.profile()`` for a query which
+        started at `start` (``perf_counter_ns``).
+
+        The time of every ``with_column(...)`` node is split evenly between the `features` it
+        lists, as polars evaluates them together, e.g. in parallel. Features computed by other
+        nodes, such as the group_by and join of aggregations or ``group_execution="group_by"``,
+        are only accounted for in the node list.
+        """
+        start = start if start is not None else time.perf_counter_ns()
+        feature_set, max_length = set(features), max(map(len, features), default=0)
+        for node, node_start, node_end in timings.iter_rows():
+            seconds = (node_end - node_start) / 1e6
+            names = _split_node(node, feature_set, max_length) if node.startswith("with_column(") else []
+            self.query_nodes.append({"node": node, "seconds": seconds, "features": len(names)})
+            for name in names:
+                self.feature_seconds[name] = self.feature_seconds.get(name, 0.0) + seconds / len(names)
+            if self.keep_events:
+                self.events.append(Event("query", node, start + node_start * 1000,
+                                         (node_end - node_start) * 1000, 0, {"features": len(names)}))
+
+    def report(self) -> dict:
+        """Returns the aggregated measurements, slowest first."""
+        end = self.end if self.end is not None else time.perf_counter_ns()
+        spans = [
+            {"category": category, "name": name, "count": n, "seconds": total / 1e9, "max_seconds": longest / 1e9}
+            for (category, name), (n, total, longest) in self.spans.items()
+        ]
+        primitives: dict[str, dict] = {}
+        for (primitive, phase), (n, total) in self.primitives.items():
+            primitives.setdefault(primitive, {})[phase] = {"count": n, "seconds": total / 1e9}
+        return {
+            "wall_seconds": (end - self.start) / 1e9 if self.start is not None else 0.0,
+            "spans": sorted(spans, key=lambda s: -s["seconds"]),
+            "primitives": dict(sorted(primitives.items(), key=lambda p: -sum(s["seconds"] for s in p[1].values()))),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "query_nodes": sorted(self.query_nodes, key=lambda n: -n["seconds"]),
+            "feature_seconds": dict(sorted(self.feature_seconds.items(), key=lambda f: -f[1])),
+        }
+
+    def format_report(self, top: int = 10) -> str:
+        """Returns the report as text, with the `top` slowest entries of each section."""
+        report = self.report()
+        lines = [f"wall time {report['wall_seconds']:.3f}s", "", "spans:"]
+        lines += [f"  {s['category']:>10} {s['name']:<20} {s['count']:>8} calls {s['seconds']:10.4f}s"
+                  for s in report["spans"][:top]]
+        lines += ["", "primitives:"]
+        for primitive, phases in list(report["primitives"].items())[:top]:
+            lines.append(f"  {primitive:<35} " + "  ".join(
+                f"{phase} {stats['count']}x {stats['seconds'] * 1e3:.2f}ms" for phase, stats in phases.items()
+            ))
+        if report["counters"] or report["gauges"]:
+            lines += ["", "counters:"]
+            lines += [f"  {name:<30} {value}" for name, value in {**report["counters"], **report["gauges"]}.items()]
+        if report["query_nodes"]:
+            lines += ["", "query nodes:"]
+            lines += [f"  {n['seconds'] * 1e3:10.2f}ms  {n['node'][:100]}" for n in report["query_nodes"][:top]]
+            lines += ["", "features:"]
+            lines += [f"  {seconds * 1e3:10.2f}ms  {name}" for name, seconds in
+                      list(report["feature_seconds"].items())[:top]]
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: str):
+        """Writes the recorded spans and query nodes in the Chrome trace event format, which
+        chrome://tracing and https://ui.perfetto.dev open. Query nodes are on thread 0."""
+        origin = self.start or 0
+        threads = {}
+        events = []
+        for event in self.events:
+            tid = threads.setdefault(event.thread, len(threads) + 1) if event.thread else 0
+            events.append({
+                "name": event.name if event.category != "primitive" else f"{event.args['primitive']}.{event.name}",
+                "cat": event.category,
+                "ph": "X",
+                "ts": (event.start - origin) / 1000,
+                "dur": event.duration / 1000,
+                "pid": 1,
+                "tid": tid,
+                "args": {key: str(value) for key, value in event.args.items()},
+            })
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "polars query"}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _split_node(node: str, features: set[str], max_length: int) -> list[str]:
+    """Returns the `features` listed in a ``with_column(a, b)`` node. Names may contain ", ",
+    so the longest feature name (of at most `max_length`) is matched at each position."""
+    content = node[len("with_column("):-1]
+    names, position = [], 0
+    while position < len(content):
+        match, end = None, content.find(", ", position)
+        while True:
+            stop = len(content) if end < 0 else end
+            if stop - position > max_length:
+                break
+            if content[position:stop] in features:
+                match = stop
+            if end < 0:
+                break
+            end = content.find(", ", end + 1)
+        if match is None:  # e.g. a temporary column of polars' common subexpression elimination
+            end = content.find(", ", position)
+            position = len(content) if end < 0 else end + 2
+            continue
+        names.append(content[position:match])
+        position = match + 2
+    return names
@@ -0,0 +1,32 @@
+from polars.testing import assert_frame_equal
+
+from benchmarks.suite.cases import primitive_cases, synthesis_cases
+from benchmarks.suite.data import group_col, make_frame
+
+
+def test_make_frame_is_deterministic():
+    df = make_frame(1000, cardinalities=(10,), chunk_size=300)
+    assert df.columns == ["time", "x0", "x1", "x2", "x3", "n", "b0", "b1", "group_10"]
+    assert df["time"].is_sorted()
+    assert_frame_equal(make_frame(1000, cardinalities=(10,), chunk_size=300), df)
+
+
+def test_primitive_cases():
+    df = make_frame(1000, cardinalities=(10,))
+    results = list(primitive_cases(df, [None, group_col(10)], names=["negate", "cum_sum"], repeat=1))
+    assert [(r["case"], r["group_col"]) for r in results] == [
+        ("primitive/cum_sum", None), ("primitive/cum_sum", "group_10"),
+        ("primitive/negate", None), ("primitive/negate", "group_10"),
+    ]
+    assert all("error" not in r and r["seconds"] > 0 for r in results)
+
+
+def test_synthesis_cases_record_failures_and_continue():
+    df = make_frame(1000, cardinalities=(10,))
+    results = list(synthesis_cases(df.drop("time"), [5], [None]))
+    assert [r["case"] for r in results] == ["dfs/build/5"]
+    assert results[0]["error"].startswith("ValueError")
+
+    results = list(synthesis_cases(df, [5], [None, group_col(10)]))
+    assert [r["case"] for r in results] == ["dfs/build/5", "dfs/run/5"] * 2
+    assert all("error" not in r for r in results)
@@ -0,0 +1,61 @@
+import polars as pl
+import pytest
+
+from dfs.primitives import Count, Max, Mean, Min, Mode, NumUnique, PercentTrue, Skew, Std, Sum
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture
+def df():
+    return pl.DataFrame({
+        "group": [1, 1, 1, 1, 2, 2],
+        "x": [1.0, 2.0, 3.0, 10.0, 5.0, None],
+        "n": [3, 3, 1, None, 2, 4],
+        "flag": [True, None, False, True, False, False],
+    })
+
+
+@pytest.mark.parametrize("primitive, column, expected", [
+    (Count(), "x", [4, 1]),
+    (Sum(), "x", [16.0, 5.0]),
+    (Mean(), "x", [4.0, 5.0]),
+    (Min(), "n", [1, 2]),
+    (Max(), "n", [3, 4]),
+    (Std(), "x", [pytest.approx(4.0824829), None]),
+    (Skew(), "x", [pytest.approx(1.7636326), pytest.approx(float("nan"), nan_ok=True)]),
+    (Mode(), "n", [3, 2]),
+    (NumUnique(), "n", [2, 2]),
+    (PercentTrue(), "flag", [0.5, 0.0]),
+])
+def test_aggregation(df, primitive, column, expected):
+    result = df.group_by("group", maintain_order=True).agg(primitive.get_expr(df, [column], []).alias("result"))
+    assert result["result"].to_list() == expected
+
+
+@pytest.mark.parametrize("primitive, expected", [
+    (Count(), 3),
+    (Sum(), float("nan")),
+    (Mean(), float("nan")),
+    (Std(), float("nan")),
+    (Min(), 1.0),
+    (Max(), 3.0),
+])
+def test_aggregation_with_nan(primitive, expected):
+    df = pl.DataFrame({"x": [1.0, float("nan"), 3.0, None]})
+    result = df.select(primitive.get_expr(df, ["x"], [])).item()
+    assert result == pytest.approx(expected, nan_ok=True)
+
+
+def test_aggregations_are_joined_back_to_rows(df):
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=["negate"], agg_primitives=["sum", "count"],
+                               max_depth=2, max_features=-1)
+    dfs.build(method="exhaustive")
+    assert dfs.plan.aggregations == {"SUM(x)", "SUM(n)", "COUNT(x)", "COUNT(n)", "COUNT(flag)"}
+    result = dfs.run()
+    assert result["SUM(x)"].to_list() == [16.0] * 4 + [5.0] * 2
+    assert result["-(SUM(x))"].to_list() == [-16.0] * 4 + [-5.0] * 2
+
+
+def test_agg_primitives_require_group_cols(df):
+    with pytest.raises(ValueError):
+        DeepFeatureSynthesis(df, agg_primitives=["sum"])
@@ -0,0 +1,9 @@
+import polars as pl
+
+from dfs.primitives.standard.transform.cumulative.cum_count import CumCount
+
+
+def test_cum_count_counts_every_row():
+    df = pl.DataFrame({"x": [1.0, None, 3.0, None]})
+    result = df.select(CumCount().get_expr(df, ["x"], [])).to_series()
+    assert result.to_list() == [1, 2, 3, 4]
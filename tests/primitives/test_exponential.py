@@ -0,0 +1,20 @@
+import polars as pl
+import pytest
+
+from dfs.primitives.standard.transform.exponential.exponential_weighted_average import ExponentialWeightedAverage
+
+
+def _apply(primitive, values):
+    df = pl.DataFrame({"x": values})
+    return df.select(primitive.get_expr(df, ["x"], [])).to_series().to_list()
+
+
+def test_exponential_weighted_average_default_com():
+    # com=0.5: weights 1, 1/3, 1/9, ... of the most recent values (adjust=True)
+    assert _apply(ExponentialWeightedAverage(), [1.0, 2.0, 3.0]) == pytest.approx([1.0, 1.75, 34 / 13])
+
+
+def test_exponential_weighted_average_ignores_bias():
+    # The bias correction only applies to the standard deviation and variance
+    values = [1.0, 2.0, 3.0]
+    assert _apply(ExponentialWeightedAverage(bias=True), values) == _apply(ExponentialWeightedAverage(), values)
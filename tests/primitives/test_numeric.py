@@ -0,0 +1,13 @@
+import math
+
+import polars as pl
+import pytest
+
+from dfs.primitives.standard.transform.numeric.natural_logarithm import NaturalLogarithm
+
+
+def test_natural_logarithm():
+    df = pl.DataFrame({"x": [1.0, math.e, math.e ** 2, 0.0]})
+    result = df.select(NaturalLogarithm().get_expr(df, ["x"], [])).to_series().to_list()
+    assert result[:3] == pytest.approx([0.0, 1.0, 2.0])
+    assert result[3] == -math.inf
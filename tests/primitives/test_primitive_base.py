@@ -0,0 +1,37 @@
+import polars as pl
+import pytest
+
+from dfs.primitives import AddNumeric, AddNumericScalar, ExponentialWeightedAverage, Negate
+
+
+def test_get_args_lists_non_default_arguments():
+    primitive = ExponentialWeightedAverage(span=3, adjust=True)
+    assert primitive.get_args() == ", span=3"
+    assert primitive.get_args(format_to_string=False) == [("span", 3)]
+    assert AddNumeric().get_args() == ""
+
+
+def test_get_args_is_recomputed_after_setting_an_argument():
+    primitive = AddNumericScalar(value=1)
+    assert primitive.get_args() is primitive.get_args()
+    primitive.value = 2
+    assert primitive.get_args() == ", value=2"
+    assert primitive.get_name(["x"]) == "x + 2"
+
+
+def test_get_num_inputs():
+    assert Negate.get_num_inputs() == 1
+    assert AddNumeric.get_num_inputs() == 2
+
+
+def test_get_expr_checks_inputs():
+    df = pl.DataFrame({"x": [1, 2], "-(x)": [-1, -2], "group": [1, 1]})
+    assert df.select(Negate().get_expr(df.drop("-(x)"), ["x"], [])).columns == ["-(x)"]
+    with pytest.raises(ValueError):
+        Negate().get_expr(df, ["x", "group"], [])
+    with pytest.raises(ValueError):
+        Negate().get_expr(df, ["group"], ["group"])
+    with pytest.raises(ValueError):
+        Negate().get_expr(df.drop("-(x)"), ["x"], ["missing"])
+    with pytest.raises(ValueError):
+        Negate().get_expr(df, ["x"], [])
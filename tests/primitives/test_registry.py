@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import dfs.primitives
+from dfs.primitives import registry
+from dfs.primitives._index import PRIMITIVES
+
+_IMPORT_SCRIPT = """
+import sys
+import dfs.primitives
+print(sum(name.startswith("dfs.primitives.standard.") for name in sys.modules))
+"""
+
+
+def test_index_is_up_to_date():
+    assert registry.build_index() == PRIMITIVES, "regenerate it with `python -m dfs.primitives.registry`"
+
+
+def test_import_loads_no_primitive_module():
+    output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "0"
+
+
+def test_lookups():
+    transforms = registry.LazyPrimitives("transform")
+    assert "cum_sum" in transforms and "sum" not in transforms
+    assert transforms["cum_sum"] is dfs.primitives.CumSum is registry.load("CumSum")
+    assert len(transforms) == len(registry.primitives("transform"))
+    assert set(registry.primitives()) == set(transforms) | set(registry.primitives("aggregation"))
+    assert "CumSum" in dir(dfs.primitives)
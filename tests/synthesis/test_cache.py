@@ -0,0 +1,65 @@
+import polars as pl
+import pytest
+
+from dfs.primitives import AddNumeric, Negate, SubtractNumeric
+from dfs.synthesis.cache import Feature, FeatureCache
+
+
+@pytest.fixture
+def cache():
+    return FeatureCache(["x", "y"], max_depth=2)
+
+
+def test_depths_and_inputs(cache):
+    neg = cache.add("-(x)", Negate(), ["x"], pl.lit(0))
+    total = cache.add("-(x) + y", AddNumeric(), ["-(x)", "y"], pl.lit(0))
+    assert (cache["x"].depth, neg.depth, total.depth) == (0, 1, 2)
+    assert total.inputs == [neg, cache["y"]]
+    assert cache.features == [neg, total]
+    assert len(cache) == 2
+    assert cache.can_stack("-(x)") and not cache.can_stack("-(x) + y")
+    with pytest.raises(ValueError):
+        cache.add("-(-(x) + y)", Negate(), ["-(x) + y"], pl.lit(0))
+
+
+def test_commutative_duplicates_are_refused(cache):
+    cache.add("x + y", AddNumeric(), ["x", "y"], pl.lit(0))
+    assert cache.get(AddNumeric(), ["y", "x"]).name == "x + y"
+    with pytest.raises(ValueError):
+        cache.add("y + x", AddNumeric(), ["y", "x"], pl.lit(0))
+
+    cache.add("x - y", SubtractNumeric(), ["x", "y"], pl.lit(0))
+    assert cache.get(SubtractNumeric(), ["y", "x"]) is None
+
+
+def test_ids_do_not_depend_on_names():
+    first, second = FeatureCache(["x"]), FeatureCache(["x"])
+    first.add("a", Negate(), ["x"], pl.lit(0))
+    first.add("b", Negate(), ["a"], pl.lit(0))
+    second.add("-(x)", Negate(), ["x"], pl.lit(0))
+    second.add("-(-(x))", Negate(), ["-(x)"], pl.lit(0))
+    assert first["b"].id == second["-(-(x))"].id
+    assert first["b"].key != second["-(-(x))"].key
+
+
+def test_ids_keep_the_order_of_inputs(cache):
+    first = cache.add("x + y", AddNumeric(), ["x", "y"], pl.lit(0))
+    assert first.key == Feature.make_key(AddNumeric(), ["y", "x"])
+    assert first.id == Feature.make_id(AddNumeric(), [("x",), ("y",)])
+    assert first.id != Feature.make_id(AddNumeric(), [("y",), ("x",)])
+
+    second = cache.add("y - x", SubtractNumeric(commutative=True), ["y", "x"], pl.lit(0))
+    assert second.key == Feature.make_key(SubtractNumeric(commutative=True), ["x", "y"])
+    assert second.id[2] == (("y",), ("x",))
+
+
+def test_remove(cache):
+    cache.add("-(x)", Negate(), ["x"], pl.lit(0))
+    cache.add("-(-(x))", Negate(), ["-(x)"], pl.lit(0))
+    with pytest.raises(ValueError):
+        cache.remove(["-(x)"])
+    with pytest.raises(ValueError):
+        cache.remove(["x"])
+    cache.remove(["-(x)", "-(-(x))"])
+    assert len(cache) == 0
+    assert cache.get(Negate(), ["x"]) is None
@@ -0,0 +1,119 @@
+import os
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal, assert_series_equal
+
+from dfs.primitives import SubtractNumeric
+from dfs.synthesis import column_cache
+from dfs.synthesis.column_cache import ColumnCache, MemoryColumnCache, column_key, fingerprint, shared_memory_cache
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture
+def df():
+    return pl.DataFrame({"group": [1, 2, 1, 2, 1], "x": [1.0, 2.0, None, 4.0, 5.0], "n": [5, 4, 3, 2, 1]})
+
+
+def _build(df, **kwargs):
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate", "cum_sum"], max_depth=2, max_features=-1, **kwargs)
+    dfs.build(method="exhaustive")
+    return dfs
+
+
+def test_fingerprint_depends_on_content_and_order(df):
+    assert fingerprint(df) == fingerprint(df.clone())
+    assert fingerprint(df) != fingerprint(df.reverse())
+    assert fingerprint(df) != fingerprint(df.with_columns(pl.col("n").cast(pl.Int32)))
+    assert column_key("a", ("negate",)) != column_key("b", ("negate",))
+
+
+def test_put_get_evict(tmp_path):
+    cache = ColumnCache(str(tmp_path))
+    for key in ["a", "b", "c"]:
+        cache.put(key, pl.Series(key, list(range(1000))))
+    os.utime(cache._path("a"), (0, 0))
+    os.utime(cache._path("b"), (1, 1))
+    assert_series_equal(cache.get("b"), pl.Series("b", list(range(1000))))  # now the most recently used
+
+    assert cache.evict(cache.size() * 2 // 3) == 1
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "writes": 3, "evictions": 1}
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_run_reads_cached_features(df, tmp_path):
+    cache = ColumnCache(str(tmp_path))
+    dfs = _build(df, group_cols=["group"])
+    expected = dfs.run()
+    assert_frame_equal(dfs.run(column_cache=cache), expected)
+    assert cache.stats()["writes"] == len(dfs.plan)
+
+    assert_frame_equal(dfs.run(column_cache=cache), expected)
+    assert cache.stats()["hits"] == len(dfs.plan)
+
+
+def test_run_caches_both_operand_orders(tmp_path):
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0], "y": [10.0, 20.0, 40.0]})
+    dfs = DeepFeatureSynthesis(df, trans_primitives=[SubtractNumeric(), "divide_numeric"], max_depth=1,
+                               max_features=-1)
+    dfs.build(method="exhaustive")
+    assert {"x - y", "y - x", "x / y", "y / x"} <= set(dfs.plan.exprs)
+
+    cache = ColumnCache(str(tmp_path))
+    expected = dfs.run()
+    assert_frame_equal(dfs.run(column_cache=cache), expected)
+    assert_frame_equal(dfs.run(column_cache=cache), expected)
+    assert cache.stats()["hits"] == len(dfs.plan)
+
+
+def test_grouped_features_are_cached_per_group_cols(df, tmp_path):
+    cache = ColumnCache(str(tmp_path))
+    _build(df, group_cols=["group"]).run(column_cache=cache)
+    ungrouped = _build(df)
+    assert_frame_equal(ungrouped.run(column_cache=cache), ungrouped.run())
+    # Only the row-local features, -(x), -(n) and their negations, are shared
+    assert cache.stats()["hits"] == 4
+
+
+def test_memory_cache_evicts_least_recently_used():
+    series = pl.Series(list(range(1000)))
+    cache = MemoryColumnCache(max_bytes=int(series.estimated_size() * 2.5))
+    cache.put("a", series)
+    cache.put("b", series)
+    assert cache.get("a") is series
+    cache.put("c", series)
+    assert list(cache.columns) == ["a", "c"]
+    assert cache.size() == 2 * series.estimated_size()
+    assert cache.stats()["evictions"] == 1
+    cache.clear()
+    assert len(cache) == 0 and cache.size() == 0
+
+
+def test_memory_cache_is_shared_across_synthesis(df, monkeypatch):
+    monkeypatch.setattr(column_cache, "_shared", None)
+    cache = shared_memory_cache()
+    assert shared_memory_cache() is cache and cache.max_bytes == 1 << 30
+
+    first = _build(df, group_cols=["group"])
+    first.run(column_cache=shared_memory_cache())
+    second = _build(df, group_cols=["group"])
+    assert_frame_equal(second.run(column_cache=shared_memory_cache()), first.run())
+    assert cache.stats()["hits"] == len(second.plan)
+
+    shared_memory_cache(max_bytes=0)
+    assert len(cache) == 0
+
+
+def test_memory_cache_keeps_operand_order_across_synthesis(monkeypatch):
+    monkeypatch.setattr(column_cache, "_shared", None)
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0], "y": [10.0, 20.0, 40.0]})
+    # The second synthesis reads both x - y and y - x from the columns of the first
+    for trans_primitives in [[SubtractNumeric()], ["negate", SubtractNumeric()]]:
+        dfs = DeepFeatureSynthesis(df, trans_primitives=trans_primitives, max_depth=2, max_features=-1)
+        dfs.build(method="exhaustive")
+        assert {"x - y", "y - x"} <= set(dfs.plan.exprs)
+        assert_frame_equal(dfs.run(column_cache=shared_memory_cache()), dfs.run())
+    assert shared_memory_cache().stats()["hits"] >= 2
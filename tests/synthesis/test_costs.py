@@ -0,0 +1,52 @@
+import polars as pl
+import pytest
+
+from dfs.primitives import CumSum, Negate, Percentile
+from dfs.synthesis.costs import Budget, CostModel, dtype_bytes
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture
+def df():
+    return pl.DataFrame({"group": [i % 10 for i in range(1000)], "x": [float(i) for i in range(1000)],
+                         "n": list(range(1000))})
+
+
+def test_cost_of_windowed_features():
+    model = CostModel(seconds_per_row=1e-9, window_cost=10.0)
+    assert model.cost(Negate(), grouped=True) == 1.0
+    assert model.cost(CumSum()) == 2.0
+    assert model.cost(CumSum(), grouped=True) == 12.0
+    assert model.seconds(CumSum(), 1000, grouped=True) == pytest.approx(12e-6)
+    assert CostModel({CumSum: 5.0}).cost(CumSum(), grouped=True) == 5.0
+
+
+def test_budget_charges_until_full():
+    budget = Budget(CostModel(seconds_per_row=1e-9), rows=1000, grouped=False, memory_bytes=2.5 * 8125)
+    assert dtype_bytes(pl.Float64) * 1000 == 8125
+    assert budget.charge(Negate(), pl.Float64)
+    assert budget.charge(Negate(), pl.Float64)
+    assert not budget.charge(Negate(), pl.Float64)
+    assert budget.spent_bytes == 2 * 8125
+
+
+def test_build_fits_memory_budget(df):
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate", "add_numeric"], max_depth=2, max_features=-1)
+    dfs.build(method="exhaustive", memory_budget_bytes=3 * 8125)
+    assert len(dfs.plan) == 3
+    dfs.build(memory_budget_bytes=3 * 8125)
+    assert len(dfs.plan) == 3
+
+
+def test_exhaustive_build_adds_cheapest_features_first(df):
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=["negate", "percentile"], max_depth=1,
+                               max_features=-1)
+    dfs.cost_model = CostModel(seconds_per_row=1e-9)
+    dfs.build(method="exhaustive", time_budget_s=2 * 1e-9 * 1000)
+    assert sorted(dfs.plan.exprs) == ["-(n)", "-(x)"]
+
+
+def test_calibrate_learns_costs(df):
+    model = CostModel().calibrate(df, [Negate(), Percentile()], ["group"], repeat=1)
+    assert model.seconds_per_row > 0
+    assert set(model.costs) == {Negate, Percentile}
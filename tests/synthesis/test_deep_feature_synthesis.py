@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import polars as pl
+import pytest
+
+from dfs.primitives import registry
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture
+def mixed_df():
+    return pl.DataFrame({
+        "time": pl.datetime_range(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 6), "1d", eager=True),
+        "x": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+        "n": [1, 2, 3, 4, 5, 6],
+        "flag": [True, False, True, None, False, True],
+    })
+
+
+def _primitives():
+    return [name for name in registry.primitives("transform") if name != "same_as_previous"]
+
+
+def test_build_exhaustive_with_boolean_and_datetime(mixed_df):
+    dfs = DeepFeatureSynthesis(mixed_df, trans_primitives=["equal", "not_equal", "negate"], max_depth=1,
+                               max_features=-1)
+    dfs.build(method="exhaustive")
+    names = list(dfs.plan.exprs)
+    assert "n = flag" in names
+    assert not any("flag" in name and "time" in name for name in names)
+    assert dfs.run().height == mixed_df.height
+
+
+def test_build_exhaustive_skips_comparisons_without_supertype(mixed_df):
+    df = mixed_df.with_columns(
+        pl.col("n").cast(pl.UInt8).alias("small"),
+        pl.col("time").dt.date().alias("date"),
+        pl.col("time").dt.replace_time_zone("UTC").alias("utc"),
+        pl.col("time").dt.time().alias("clock"),
+    )
+    primitives = ["equal", "not_equal", "greater_than", "less_than_equal_to"]
+    dfs = DeepFeatureSynthesis(df, trans_primitives=primitives, max_depth=1, max_features=-1)
+    dfs.build(method="exhaustive")
+    names = list(dfs.plan.exprs)
+    assert {"time = date", "time > date", "n = clock", "n = small"} <= set(names)
+    skipped = [("small", "time"), ("small", "date"), ("small", "utc"), ("small", "clock"), ("utc", "time"),
+               ("clock", "time"), ("clock", "date"), ("flag", "clock")]
+    assert not any(a in name and b in name for name in names for a, b in skipped)
+    assert dfs.run().height == df.height
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_build_random_with_boolean_and_datetime(mixed_df, seed):
+    random.seed(seed)
+    dfs = DeepFeatureSynthesis(mixed_df, trans_primitives=_primitives(), max_features=200, sort_by="time")
+    dfs.build()
+    assert dfs.run().width == mixed_df.width + len(dfs.plan)
+
+
+def test_build_exhaustive_enumerates_every_feature_once():
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0], "y": [4, 5, 6]})
+    random.seed(0)
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate", "add_numeric"], max_depth=1, max_features=-1)
+    dfs.build(method="exhaustive")
+    assert sorted(dfs.plan.exprs) == ["-(x)", "-(y)", "x + y"]
+
+    names = list(dfs.plan.exprs)
+    random.seed(1)
+    dfs.build(method="exhaustive")
+    assert list(dfs.plan.exprs) == names
+
+
+def test_build_exhaustive_stops_at_max_features():
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0], "y": [4, 5, 6]})
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate", "add_numeric"], max_depth=2, max_features=4)
+    dfs.build(method="exhaustive")
+    assert len(dfs.plan) == 4
+    assert max(dfs.plan.depths.values()) == 2
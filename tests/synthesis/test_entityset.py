@@ -0,0 +1,53 @@
+import polars as pl
+import pytest
+from polars.testing import assert_series_equal
+
+from dfs.primitives import Sum
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.entityset import EntitySet
+
+
+@pytest.fixture
+def entityset():
+    customers = pl.DataFrame({"cid": [1, 2, 3], "age": [30, 40, 50]})
+    orders = pl.DataFrame({"oid": [10, 11, 12, 13], "cid": [1, 1, 2, 2], "amount": [1.0, 2.0, 3.0, 4.0]})
+    items = pl.DataFrame({"iid": [0, 1, 2, 3, 4], "oid": [10, 10, 11, 12, 13], "price": [1, 2, 3, 4, 5]})
+    return EntitySet(
+        {"customers": (customers, "cid"), "orders": (orders, "oid"), "items": (items, "iid")},
+        [("customers", "cid", "orders", "cid"), ("orders", "oid", "items", "oid")],
+    )
+
+
+def test_features_of_children_and_parents(entityset):
+    customers = entityset.features("customers", [Sum()], max_depth=2)
+    assert_series_equal(customers["SUM(orders.amount)"], pl.Series("SUM(orders.amount)", [3.0, 7.0, 0.0]))
+    assert_series_equal(customers["SUM(orders.SUM(items.price))"],
+                        pl.Series("SUM(orders.SUM(items.price))", [6, 9, 0]))
+    assert "SUM(orders.oid)" not in customers.columns
+
+    items = entityset.features("items", [], max_depth=2)
+    assert_series_equal(items["orders.customers.age"], pl.Series("orders.customers.age", [30, 30, 30, 40, 40]))
+    assert "orders.cid" not in items.columns
+
+
+def test_features_never_use_keys(entityset):
+    dfs = DeepFeatureSynthesis(entityset, target_dataframe_name="orders", agg_primitives=["sum"],
+                               trans_primitives=["negate", "add_numeric"], max_depth=2, max_features=-1)
+    dfs.build(method="exhaustive")
+    assert dfs.plan.exprs
+    for name in dfs.plan.exprs:
+        assert "oid" not in name and "cid" not in name
+
+    df = dfs.run()
+    assert {"oid", "cid"} <= set(df.columns)
+
+
+def test_relationship_depth_is_independent_of_max_depth(entityset):
+    dfs = DeepFeatureSynthesis(entityset, target_dataframe_name="customers", agg_primitives=["sum"],
+                               trans_primitives=["negate"], max_depth=1, relationship_depth=2)
+    assert "SUM(orders.SUM(items.price))" in dfs.dataframe.columns
+
+    dfs = DeepFeatureSynthesis(entityset, target_dataframe_name="customers", agg_primitives=["sum"],
+                               trans_primitives=["negate"], max_depth=2, relationship_depth=1)
+    assert "SUM(orders.amount)" in dfs.dataframe.columns
+    assert "SUM(orders.SUM(items.price))" not in dfs.dataframe.columns
@@ -0,0 +1,52 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.feature_set import FeatureSet
+
+DTYPES = {
+    "list": pl.List(pl.Int8),
+    "array": pl.Array(pl.Float32, 3),
+    "struct": pl.Struct({"a": pl.Int64, "b": pl.List(pl.String)}),
+    "decimal": pl.Decimal(10, 2),
+    "datetime": pl.Datetime("ms", "UTC"),
+    "duration": pl.Duration("ns"),
+    "enum": pl.Enum(["a", "b"]),
+    "int": pl.Int64,
+}
+
+
+def test_dtypes_round_trip(tmp_path):
+    path = str(tmp_path / "features.json")
+    FeatureSet([], list(DTYPES), dtypes=DTYPES).save(path)
+    dtypes = FeatureSet.load(path).dtypes
+    assert {col: repr(dtype) for col, dtype in dtypes.items()} == {col: repr(dtype) for col, dtype in DTYPES.items()}
+
+
+@pytest.mark.parametrize("group_execution", ["over", "group_by"])
+def test_transform_after_load_matches_run(tmp_path, group_execution):
+    df = pl.DataFrame({
+        "group": [1, 1, 2, 2, 2],
+        "a_flag": [True, False, None, True, True],
+        "x": [1.5, 2.0, 3.0, None, 5.0],
+        "n": [1, 2, 3, 4, 5],
+    })
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], group_execution=group_execution, max_depth=2,
+                               max_features=-1, trans_primitives=["multiply_numeric_boolean", "cum_sum", "negate"])
+    dfs.build(method="exhaustive")
+
+    path = str(tmp_path / "features.json")
+    dfs.feature_set().save(path)
+    assert_frame_equal(FeatureSet.load(path).transform(df), dfs.run())
+
+
+def test_dtypes_pick_the_expression_of_the_primitive():
+    definition = {"name": "a_flag * x", "primitive": "MultiplyNumericBoolean",
+                  "module": "dfs.primitives.standard.transform.binary.multiply_numeric_boolean",
+                  "args": {}, "inputs": ["a_flag", "x"]}
+    feature_set = FeatureSet.from_dict(
+        FeatureSet([definition], ["a_flag", "x"], dtypes={"a_flag": pl.Boolean, "x": pl.Float64}).to_dict()
+    )
+    df = pl.DataFrame({"a_flag": [True, False, None], "x": [1.5, 2.0, 3.0]})
+    assert feature_set.transform(df)["a_flag * x"].to_list() == [1.5, 0.0, None]
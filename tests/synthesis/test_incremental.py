@@ -0,0 +1,64 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from dfs.primitives import (
+    CumCount, CumMean, CumSum, ExponentialWeightedAverage, ExponentialWeightedSTD, ExponentialWeightedVariance,
+)
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.incremental import IncrementalFeatureSet
+
+PRIMITIVES = [CumSum, CumCount, CumMean, ExponentialWeightedAverage, ExponentialWeightedSTD]
+
+
+def _build(df: pl.DataFrame, max_depth: int = 1) -> DeepFeatureSynthesis:
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=PRIMITIVES, max_features=-1,
+                               max_depth=max_depth, sort_by="t")
+    dfs.build(method="exhaustive")
+    return dfs
+
+
+def _update_in_chunks(dfs: DeepFeatureSynthesis, df: pl.DataFrame, size: int) -> pl.DataFrame:
+    incremental = IncrementalFeatureSet(dfs.feature_set())
+    parts = [incremental.fit(df.head(size))]
+    parts += [incremental.update(df.slice(offset, size)) for offset in range(size, df.height, size)]
+    return pl.concat(parts)
+
+
+def test_update_matches_run_with_null_keys():
+    df = pl.DataFrame({
+        "t": list(range(12)),
+        "x": [1.0, 2.0, None, 4.0, 5.0, 6.0, 7.0, None, 9.0, 10.0, 11.0, 12.0],
+        "group": [1, None, 2, None, 1, 2, None, 1, None, 2, 1, None],
+    })
+    dfs = _build(df)
+    assert_frame_equal(_update_in_chunks(dfs, df, 4), dfs.run(), check_exact=False)
+
+
+def test_ewm_state_overflows_to_inf_like_polars():
+    df = pl.DataFrame({
+        "t": list(range(6)),
+        "x": [1e200, -1e200, 1e200, 1.0, -1e200, 2.0],
+        "group": [1, 1, 1, 2, 2, 2],
+    })
+    dfs = _build(df, max_depth=2)
+    assert_frame_equal(_update_in_chunks(dfs, df, 3), dfs.run(), check_exact=False)
+
+
+def test_update_matches_run_with_ewm_options():
+    df = pl.DataFrame({
+        "t": list(range(14)),
+        "x": [None, 1.0, None, None, 4.0, 5.0, None, 7.0, 8.0, None, None, 11.0, 12.0, None],
+        "group": [1, 1, 2, 1, 2, 1, 2, 2, 1, 1, 2, 1, 2, 2],
+    })
+    primitives = [
+        ExponentialWeightedAverage(com=0.5, ignore_nulls=False),
+        ExponentialWeightedAverage(alpha=0.3, adjust=False, ignore_nulls=False),
+        ExponentialWeightedVariance(span=3, adjust=False, min_periods=2, ignore_nulls=True),
+        ExponentialWeightedSTD(half_life=2, bias=True, ignore_nulls=False),
+        ExponentialWeightedSTD(alpha=0.6, ignore_nulls=False),
+    ]
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=primitives, max_features=-1,
+                               max_depth=1, sort_by="t")
+    dfs.build(method="exhaustive")
+    for size in [1, 3, 5]:
+        assert_frame_equal(_update_in_chunks(dfs, df, size), dfs.run(), check_exact=False)
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import polars as pl
+import pytest
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.incremental import IncrementalFeatureSet
+from dfs.synthesis.online import OnlineScorer
+
+PRIMITIVES = ["cum_sum", "cum_mean", "cum_max", "exponential_weighted_average", "add_numeric", "negate",
+              "greater_than", "multiply_numeric_boolean", "and"]
+
+
+@pytest.fixture
+def df():
+    rng = random.Random(0)
+    return pl.DataFrame({
+        "t": list(range(60)),
+        "group": [rng.randrange(3) for _ in range(60)],
+        "x": [None if rng.random() < 0.1 else rng.random() for _ in range(60)],
+        "y": [rng.randrange(10) for _ in range(60)],
+        "flag": [None if rng.random() < 0.1 else rng.random() < 0.5 for _ in range(60)],
+    })
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_score_matches_run(df, seed):
+    random.seed(seed)
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=PRIMITIVES, max_features=30,
+                               max_depth=2, sort_by="t")
+    dfs.build()
+    expected = dfs.run().slice(40).select(pl.col(list(dfs.plan.exprs)).cast(pl.Float64))
+
+    incremental = IncrementalFeatureSet(dfs.feature_set())
+    incremental.fit(df.head(40))
+    scorer = OnlineScorer(incremental)
+    scores = {name: [] for name in dfs.plan.exprs}
+    for row in df.slice(40).iter_rows(named=True):
+        rows = {col: [np.nan if row[col] is None else row[col]] for col in scorer.inputs}
+        for name, values in scorer.score(row["group"], rows).items():
+            scores[name].extend(values)
+
+    for name in dfs.plan.exprs:
+        np.testing.assert_allclose(scores[name], expected[name].to_numpy(), rtol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_score_does_not_modify_incremental_state(df):
+    dfs = DeepFeatureSynthesis(df, group_cols=["group"], trans_primitives=["cum_sum"], max_features=-1,
+                               max_depth=1, sort_by="t")
+    dfs.build(method="exhaustive")
+    incremental = IncrementalFeatureSet(dfs.feature_set())
+    incremental.fit(df)
+    state = incremental.state.clone()
+    OnlineScorer(incremental).score(0, {col: [1.0] for col in ["x", "y", "t"]})
+    assert incremental.state.equals(state)
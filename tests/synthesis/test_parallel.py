@@ -0,0 +1,52 @@
+import random
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from dfs.synthesis import parallel
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with parallel.process_pool(2) as pool:
+        yield pool
+
+
+@pytest.fixture
+def df():
+    rng = random.Random(0)
+    return pl.DataFrame({
+        "group": [None if i % 17 == 0 else rng.randrange(7) for i in range(500)],
+        "x": [rng.random() for _ in range(500)],
+        "n": [rng.randrange(100) for _ in range(500)],
+    })
+
+
+def _build(df, trans_primitives, **kwargs):
+    dfs = DeepFeatureSynthesis(df, trans_primitives=trans_primitives, max_depth=2, max_features=-1, **kwargs)
+    dfs.build(method="exhaustive")
+    return dfs
+
+
+@pytest.mark.parametrize("group_execution", ["over", "group_by"])
+def test_grouped_run_matches_single_process(df, pool, group_execution):
+    dfs = _build(df, ["negate", "cum_sum", "diff"], group_cols=["group"], group_execution=group_execution)
+    assert parallel.can_partition(dfs.plan)
+    assert_frame_equal(dfs.run(executor=pool, n_workers=3), dfs.run())
+
+
+def test_row_local_run_matches_single_process(df, pool):
+    dfs = _build(df, ["negate", "add_numeric"])
+    assert parallel.can_partition(dfs.plan)
+    assert_frame_equal(dfs.run(executor=pool), dfs.run())
+
+
+def test_whole_dataframe_features_run_in_process(df, pool):
+    dfs = _build(df, ["cum_sum"])
+    assert not parallel.can_partition(dfs.plan)
+    with pytest.warns(UserWarning):
+        assert_frame_equal(dfs.run(executor=pool), dfs.run())
+    with pytest.raises(ValueError):
+        parallel.evaluate(dfs.plan, df, pool)
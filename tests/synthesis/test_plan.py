@@ -0,0 +1,60 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from dfs.synthesis.plan import FeaturePlan
+
+
+@pytest.fixture
+def df():
+    return pl.DataFrame({"group": [1, 2, 1, 2], "x": [1, 2, 3, 4]})
+
+
+def _stacked_plan(group_cols=None, group_execution="over"):
+    plan = FeaturePlan(group_cols, group_execution)
+    plan.add("a", (pl.col("x") * 2).alias("a"), ["x"], row_local=True)
+    plan.add("b", pl.col("x").cum_sum().alias("b"), ["x"])
+    plan.add("c", (pl.col("a") + pl.col("b")).alias("c"), ["a", "b"], row_local=True)
+    plan.add("d", (-pl.col("x")).alias("d"), ["x"], row_local=True)
+    return plan
+
+
+def test_features_are_layered_by_depth():
+    plan = _stacked_plan()
+    assert plan.depths == {"a": 1, "b": 1, "c": 2, "d": 1}
+    assert [len(layer) for layer in plan.layers()] == [3, 1]
+    assert plan.row_local == {"a": True, "b": False, "c": False, "d": True}
+    assert not plan.is_row_local
+
+
+def test_apply_emits_features_in_order(df):
+    result = _stacked_plan().apply(df.lazy()).collect()
+    expected = df.with_columns(
+        a=pl.Series([2, 4, 6, 8]), b=pl.Series([1, 3, 6, 10]), c=pl.Series([3, 7, 12, 18]), d=pl.Series([-1, -2, -3, -4])
+    )
+    assert_frame_equal(result, expected)
+
+
+def test_apply_windows_grouped_features(df):
+    result = _stacked_plan(["group"]).apply(df.lazy()).collect()
+    assert result["b"].to_list() == [1, 2, 4, 6]
+    assert result["c"].to_list() == [3, 6, 10, 14]
+
+
+def test_subset_keeps_inputs(df):
+    plan = _stacked_plan()
+    subset = plan.subset(["c"])
+    assert list(subset.exprs) == ["a", "b", "c"]
+    assert list(plan.subset(["c"], materialized={"a"}).exprs) == ["b", "c"]
+    assert_frame_equal(subset.apply(df.lazy()).collect(), plan.apply(df.lazy()).collect().drop("d"))
+
+
+def test_add_rejects_duplicates():
+    plan = _stacked_plan()
+    with pytest.raises(ValueError):
+        plan.add("a", pl.col("x"), ["x"])
+
+
+def test_reuse_stats():
+    stats = _stacked_plan().reuse_stats()
+    assert stats == {"features": 4, "shared_features": 2, "references": 2, "recomputations_avoided": 2}
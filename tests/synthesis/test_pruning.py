@@ -0,0 +1,42 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.pruning import find_redundant
+
+
+def test_find_redundant():
+    sample = pl.DataFrame({
+        "x": [1.0, 2.0, 3.0, 5.0],
+        "y": [4.0, 1.0, 3.0, 2.0],
+        "-(x)": [-1.0, -2.0, -3.0, -5.0],
+        "nulls": pl.Series([None, None, None, None], dtype=pl.Float64),
+        "constant": [1, 1, 1, 1],
+        "x + y": [5.0, 3.0, 6.0, 7.0],
+        "y - x": [3.0, -1.0, 0.0, -3.0],
+        "x - y": [-3.0, 1.0, 0.0, 3.0],
+        "text": ["a", "a", None, "a"],
+    })
+    redundant = find_redundant(sample, sample.columns[2:], ["x", "y"], block_size=2)
+    assert redundant == {
+        "-(x)": "correlated with x",
+        "nulls": "all null",
+        "constant": "constant",
+        "x - y": "correlated with y - x",
+        "text": "constant",
+    }
+
+
+def test_prune_keeps_features_other_features_use():
+    df = pl.DataFrame({"x": [float(i % 7) for i in range(50)], "y": [float(i % 5) for i in range(50)]})
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate", "absolute", "add_numeric"], max_depth=2,
+                               max_features=-1)
+    dfs.build(method="exhaustive")
+    full = dfs.run()
+    redundant = dfs.prune(sample_size=20)
+
+    assert "-(x)" in redundant and "-(-(x))" in redundant
+    assert not set(redundant) & set(dfs.plan.exprs)
+    for name in dfs.plan.exprs:
+        assert all(col in dfs.plan.exprs or col in df.columns for col in dfs.plan.inputs[name])
+    assert_frame_equal(dfs.run(), full.drop(list(redundant)))
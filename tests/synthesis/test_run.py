@@ -0,0 +1,101 @@
+import random
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+
+
+@pytest.fixture
+def df():
+    rng = random.Random(0)
+    return pl.DataFrame({
+        "group": [rng.randrange(5) for _ in range(200)],
+        "x": [rng.random() for _ in range(200)],
+        "n": [rng.randrange(100) for _ in range(200)],
+    })
+
+
+def _build(df, trans_primitives, **kwargs):
+    dfs = DeepFeatureSynthesis(df, trans_primitives=trans_primitives, max_depth=2, max_features=-1, **kwargs)
+    dfs.build(method="exhaustive")
+    return dfs
+
+
+@pytest.mark.parametrize("primitives", [["negate", "add_numeric"], ["negate", "cum_sum"]])
+def test_streaming_matches_run(df, primitives):
+    dfs = _build(df, primitives)
+    assert_frame_equal(dfs.run(streaming=True), dfs.run())
+
+
+@pytest.mark.parametrize("primitives", [["negate", "add_numeric"], ["negate", "cum_sum"]])
+def test_iter_batches_matches_run(df, primitives):
+    dfs = _build(df, primitives)
+    batches = list(dfs.iter_batches(batch_size=64))
+    assert [batch.height for batch in batches] == [64, 64, 64, 8]
+    assert_frame_equal(pl.concat(batches), dfs.run())
+
+
+@pytest.mark.parametrize("format", ["parquet", "ipc"])
+@pytest.mark.parametrize("primitives", [["negate", "add_numeric"], ["negate", "cum_sum"]])
+def test_run_to_matches_run(df, tmp_path, format, primitives):
+    dfs = _build(df, primitives, group_cols=["group"])
+    path = str(tmp_path / f"features.{format}")
+    dfs.run_to(path, format=format)
+    read = pl.read_parquet if format == "parquet" else pl.read_ipc
+    assert_frame_equal(read(path), dfs.run())
+
+
+@pytest.mark.parametrize("split_by", ["primitive", "depth", "batch"])
+def test_run_to_split_matches_run(df, tmp_path, split_by):
+    dfs = _build(df, ["negate", "cum_sum"])
+    manifest = dfs.run_to(str(tmp_path), split_by=split_by, column_batch_size=3)
+    files = [pl.read_parquet(tmp_path / file["path"]) for file in manifest["files"]]
+    assert [file.columns for file in files] == [file["columns"] for file in manifest["files"]]
+    expected = dfs.run()
+    assert_frame_equal(pl.concat(files, how="horizontal").select(expected.columns), expected)
+
+
+@pytest.mark.parametrize("primitives", [["negate", "add_numeric"], ["negate", "cum_sum"]])
+def test_iter_column_batches_matches_run(df, primitives):
+    dfs = _build(df, primitives, group_cols=["group"])
+    batches = list(dfs.iter_column_batches(batch_size=2))
+    assert all(batch.width <= 2 for batch in batches)
+    assert_frame_equal(pl.concat(batches, how="horizontal"), dfs.run().select(list(dfs.plan.exprs)))
+
+
+def test_column_batches_reuse_shared_features(df):
+    dfs = _build(df, ["negate", "cum_sum"])
+    list(dfs.iter_column_batches(batch_size=1))
+    # Every feature of depth 2 reads its input from an earlier batch
+    depth_2 = sum(1 for depth in dfs.plan.depths.values() if depth == 2)
+    assert dfs.reuse_stats()["batch_recomputations_avoided"] == depth_2 > 0
+
+
+@pytest.mark.parametrize("primitives", [
+    ["negate", "add_numeric", "cum_sum"],
+    ["cum_mean", "diff", "exponential_weighted_average"],
+])
+def test_group_by_execution_matches_over(df, primitives):
+    df = df.with_columns(pl.when(pl.col("n") < 10).then(None).otherwise(pl.col("group")).alias("group"))
+    over = _build(df, primitives, group_cols=["group"])
+    group_by = _build(df, primitives, group_cols=["group"], group_execution="group_by")
+    assert list(group_by.plan.exprs) == list(over.plan.exprs)
+    assert_frame_equal(group_by.run(), over.run())
+
+
+def test_sort_by_orders_cumulative_features(df):
+    df = df.with_row_index("t")
+    shuffled = df.sample(fraction=1.0, shuffle=True, seed=0)
+    expected = _build(df, ["cum_sum", "diff"], group_cols=["group"]).run()
+    assert_frame_equal(_build(shuffled, ["cum_sum", "diff"], group_cols=["group"], sort_by="t").run(), expected)
+    assert_frame_equal(_build(df, ["cum_sum", "diff"], group_cols=["group"], sort_by="t", assume_sorted=True).run(),
+                       expected)
+
+
+def test_sort_by_must_exist(df):
+    with pytest.raises(ValueError):
+        DeepFeatureSynthesis(df, sort_by="t")
+    with pytest.raises(ValueError):
+        DeepFeatureSynthesis(df, assume_sorted=True)
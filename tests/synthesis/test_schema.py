@@ -0,0 +1,32 @@
+import polars as pl
+import polars.selectors as cs
+import pytest
+
+from dfs.synthesis.schema import SchemaIndex
+
+
+@pytest.fixture
+def schema():
+    return SchemaIndex({"group": pl.Int64, "x": pl.Float64, "n": pl.Int32, "flag": pl.Boolean}, exclude=["group"])
+
+
+def test_candidates_match_selector(schema):
+    assert schema.candidates(cs.numeric()) == ["x", "n"]
+    assert schema.candidates(cs.boolean()) == ["flag"]
+    assert schema.candidates(cs.temporal()) == []
+
+
+def test_candidates_are_cached_by_repr(schema):
+    assert schema.candidates(cs.numeric()) is schema.candidates(cs.numeric())
+
+
+def test_add_updates_cached_candidates(schema):
+    numeric = schema.candidates(cs.numeric())
+    schema.add("-x", pl.Float64)
+    schema.add("hidden", pl.Float64, candidate=False)
+    assert numeric == ["x", "n", "-x"]
+    assert schema.candidates(cs.numeric()) == ["x", "n", "-x"]
+    assert "hidden" in schema
+    assert schema.frame(["flag", "hidden"]).schema == {"flag": pl.Boolean, "hidden": pl.Float64}
+    with pytest.raises(ValueError):
+        schema.add("x", pl.Float64)
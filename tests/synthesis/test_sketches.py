@@ -0,0 +1,76 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.synthesis.sketches import FeatureProfile, HyperLogLog, KLLSketch, Moments
+
+
+def test_merged_moments_match_numpy():
+    values = np.random.default_rng(0).normal(size=1000)
+    moments, other = Moments(), Moments()
+    moments.update(values[:300])
+    other.update(values[300:])
+    moments.merge(other)
+    assert moments.count == 1000
+    assert (moments.min, moments.max) == (values.min(), values.max())
+    assert moments.mean == pytest.approx(values.mean())
+    assert moments.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_hyperloglog_estimate():
+    hashes = pl.Series(np.arange(20_000)).hash(0).to_numpy()
+    sketch, other = HyperLogLog(), HyperLogLog()
+    sketch.update(hashes[:15_000])
+    other.update(hashes[5_000:])
+    sketch.merge(other)
+    assert sketch.estimate() == pytest.approx(20_000, rel=0.05)
+
+
+def test_kll_quantiles():
+    values = np.random.default_rng(0).permutation(100_000).astype(np.float64)
+    sketch, other = KLLSketch(seed=0), KLLSketch(seed=1)
+    for chunk in np.array_split(values[:50_000], 10):
+        sketch.update(chunk)
+    other.update(values[50_000:])
+    sketch.merge(other)
+    assert sketch.count == 100_000
+    for q, value in zip([0.1, 0.5, 0.9], sketch.quantiles([0.1, 0.5, 0.9])):
+        assert value == pytest.approx(q * 100_000, abs=2_000)
+
+
+def test_profile_features_matches_exact_statistics():
+    rng = np.random.default_rng(0)
+    df = pl.DataFrame({"x": rng.normal(size=5000), "flag": rng.random(5000) < 0.3}).with_columns(
+        pl.when(pl.col("x") > 1.5).then(None).otherwise(pl.col("x")).alias("x")
+    )
+    dfs = DeepFeatureSynthesis(df, trans_primitives=["negate"], max_depth=1, max_features=-1)
+    dfs.build(method="exhaustive")
+    profile = dfs.profile_features(batch_size=700, profile=FeatureProfile(quantiles=[0.5]))
+    summary = profile.summary()
+    assert summary["column"].to_list() == ["x", "flag", "-(x)"]
+
+    x = summary.row(2, named=True)
+    values = -df["x"].drop_nulls()
+    assert x["rows"] == 5000
+    assert x["null_fraction"] == pytest.approx(df["x"].null_count() / 5000)
+    assert (x["min"], x["max"]) == (values.min(), values.max())
+    assert x["mean"] == pytest.approx(values.mean())
+    assert x["variance"] == pytest.approx(values.var())
+    assert x["distinct"] == pytest.approx(values.n_unique(), rel=0.05)
+    assert x["q0.5"] == pytest.approx(values.median(), abs=0.05)
+
+    flag = summary.row(1, named=True)
+    assert flag["mean"] == pytest.approx(df["flag"].mean())
+    assert flag["distinct"] == 2
+
+
+def test_profile_merge_copies_sketches():
+    profile, other = FeatureProfile(), FeatureProfile()
+    other.update(pl.DataFrame({"x": [1.0, 2.0, 3.0]}))
+    profile.merge(other)
+    profile.update(pl.DataFrame({"x": [10.0, None]}))
+
+    assert profile.summary()["rows"].to_list() == [5]
+    x = other.summary().row(0, named=True)
+    assert (x["rows"], x["null_fraction"], x["max"], x["distinct"]) == (3, 0.0, 3.0, 3)
@@ -0,0 +1,53 @@
+import json
+
+import polars as pl
+
+from dfs.synthesis.deep_feature_synthesis import DeepFeatureSynthesis
+from dfs.utils import instrumentation
+from dfs.utils.instrumentation import Profiler
+
+
+def _dfs():
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0], "n": [1, 2, 3]})
+    return DeepFeatureSynthesis(df, trans_primitives=["negate", "add_numeric"], max_depth=1, max_features=-1)
+
+
+def test_hooks_are_disabled_without_profiler():
+    assert instrumentation.active() is None
+    with instrumentation.span("synthesis", "test"):
+        instrumentation.count("test")
+
+
+def test_profiler_records_synthesis_and_primitives(tmp_path):
+    events = []
+    dfs = _dfs()
+    path = str(tmp_path / "trace.json")
+    with Profiler(callbacks=[events.append], trace_path=path) as profiler:
+        dfs.build(method="exhaustive")
+        dfs.run()
+
+    report = profiler.report()
+    spans = {(s["category"], s["name"]): s["count"] for s in report["spans"]}
+    assert spans[("synthesis", "build")] == 1
+    assert spans[("synthesis", "run")] == 1
+    assert ("primitive", "get_expr") in spans
+    assert set(report["primitives"]) == {"negate", "add_numeric"}
+    assert report["gauges"] == {"features": 3, "plan_depth": 1}
+    assert set(report["feature_seconds"]) <= set(dfs.plan.exprs)
+    assert len(events) == sum(spans.values())
+
+    with open(path) as f:
+        trace = json.load(f)["traceEvents"]
+    assert {"synthesis", "primitive"} <= {event.get("cat") for event in trace}
+    assert "wall time" in profiler.format_report()
+
+
+def test_nested_profilers_record_into_innermost():
+    with Profiler() as outer:
+        with Profiler() as inner:
+            assert instrumentation.active() is inner
+            instrumentation.count("draws", 2)
+        instrumentation.count("draws")
+    assert inner.counters == {"draws": 2}
+    assert outer.counters == {"draws": 1}
+    assert instrumentation.active() is None